@@ -0,0 +1,71 @@
+# config_cache.py - .env / .env_프로필 파일 파싱 캐시 (수정 시각이 바뀐 경우에만 다시 읽음)
+import os
+import threading
+
+_cache = {}   # 경로 → (mtime_ns, size, 원문, 파싱 결과)
+_lock = threading.Lock()
+
+
+def parse_env_text(text):
+    """KEY=VALUE 형식 문자열 파싱 (주석/빈 줄/export 무시, 따옴표 제거)"""
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        if line.startswith('export '):
+            line = line[len('export '):]
+        key, value = line.split('=', 1)
+        key, value = key.strip(), value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+            value = value[1:-1]
+        elif ' #' in value:
+            value = value.split(' #', 1)[0].rstrip()
+        values[key] = value
+    return values
+
+
+def _load(path):
+    """캐시 항목 반환 (파일이 없으면 None)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        with _lock:
+            _cache.pop(path, None)
+        return None
+
+    with _lock:
+        entry = _cache.get(path)
+    if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        return entry
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return None
+    entry = (stat.st_mtime_ns, stat.st_size, text, parse_env_text(text))
+    with _lock:
+        _cache[path] = entry
+    return entry
+
+
+def read_env(path):
+    """설정 파일 내용 (dict 복사본, 파일이 없으면 None)"""
+    entry = _load(path)
+    return dict(entry[3]) if entry else None
+
+
+def read_env_text(path):
+    """설정 파일 원문 (파일이 없으면 None)"""
+    entry = _load(path)
+    return entry[2] if entry else None
+
+
+def invalidate(path=None):
+    """캐시 삭제 (path가 없으면 전체)"""
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
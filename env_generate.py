@@ -1,13 +1,15 @@
 # env_generate.py - 2단계: 프로필 기능 추가된 완전 버전
 import os
 import re
-import requests
 import json  # 🔧 2단계 추가
 from datetime import datetime
+import config_cache
+from github_client import GITHUB_API_URL
 
 class EnvGenerator:
-    def __init__(self):
+    def __init__(self, api_url=None):
         self.project_root = os.getcwd()
+        self.api_url = (api_url or GITHUB_API_URL).rstrip('/')  # 검증 요청 주소 (로컬 테스트 서버 등)
         self.env_path = os.path.join(self.project_root, '.env')
         self.profiles_file = os.path.join(self.project_root, 'profiles.json')  # 🔧 2단계 추가
         self.ensure_profiles_file()  # 🔧 2단계 추가
@@ -63,9 +65,10 @@ class EnvGenerator:
         if len(token) < 20:
             return False, "토큰이 너무 짧습니다."
         
+        import requests  # 검증할 때만 로드 (GUI 시작 속도)
         try:
             headers = {"Authorization": f"token {token}"}
-            response = requests.get("https://api.github.com/user", headers=headers, timeout=10)
+            response = requests.get(f"{self.api_url}/user", headers=headers, timeout=10)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -127,9 +130,10 @@ class EnvGenerator:
     
     def validate_repository(self, token, username, repo_name):
         """저장소 존재 및 접근 권한 확인"""
+        import requests
         try:
             headers = {"Authorization": f"token {token}"}
-            url = f"https://api.github.com/repos/{username}/{repo_name}"
+            url = f"{self.api_url}/repos/{username}/{repo_name}"
             response = requests.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
@@ -337,19 +341,20 @@ PROFILE_NAME={profile_name}
             source_file = os.path.join(self.project_root, f".env_{profile_name}")
             target_file = self.env_path
             
-            if not os.path.exists(source_file):
+            # 내용 복사 (수정되지 않았으면 캐시 사용)
+            content = config_cache.read_env_text(source_file)
+            if content is None:
                 return False, f"프로필 파일 '{source_file}'을 찾을 수 없습니다."
             
-            # 내용 복사 (PROFILE_NAME 라인 제거)
-            with open(source_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # PROFILE_NAME 라인 제거 후 .env에 저장
+            # PROFILE_NAME 라인 제거 후 .env에 저장 (내용이 같으면 다시 쓰지 않음)
             lines = content.split('\n')
             filtered_lines = [line for line in lines if not line.startswith('PROFILE_NAME=')]
+            new_content = '\n'.join(filtered_lines)
             
-            with open(target_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(filtered_lines))
+            if config_cache.read_env_text(target_file) != new_content:
+                with open(target_file, 'w', encoding='utf-8') as f:
+                    f.write(new_content)
+                config_cache.invalidate(target_file)
             
             return True, f"'{profile_name}' 프로필이 현재 활성화되었습니다."
             
@@ -361,17 +366,7 @@ PROFILE_NAME={profile_name}
         """특정 프로필의 설정 정보 가져오기"""
         try:
             env_file = os.path.join(self.project_root, f".env_{profile_name}")
-            if not os.path.exists(env_file):
-                return None
-            
-            info = {}
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if '=' in line and not line.startswith('#'):
-                        key, value = line.strip().split('=', 1)
-                        info[key] = value
-            
-            return info
+            return config_cache.read_env(env_file)
             
         except Exception as e:
             print(f"프로필 정보 로드 실패: {e}")
@@ -529,6 +524,16 @@ COMMIT_MESSAGE_PREFIX=Auto-upload:
 # Profile Management
 profiles.json
 
+# Upload History
+upload_history.db*
+
+# Package Check Cache
+.package_cache.json
+
+# Uploader runtime state
+.upload_instances/
+.sync_state/
+
 # Security
 token.txt
 secrets/
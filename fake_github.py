@@ -0,0 +1,597 @@
+# fake_github.py - 테스트/벤치마크용 로컬 GitHub API 서버 (api.github.com 대신 사용)
+#
+#   python fake_github.py [--port 8765] [--latency 0.05] [--repo 사용자/저장소]
+#   → .env 또는 환경변수에 GITHUB_API_URL=http://127.0.0.1:8765 를 넣으면 업로더/설정 검증이 이 서버를 사용
+#
+# contents GET/PUT/DELETE, 저장소/사용자 정보, git trees/blobs/commits/refs, 커밋 조회를 지원하고
+# 응답 지연, 호출 한도 헤더, 보조 한도 403, 409 충돌, 트리 잘림(truncated)을 흉내 냅니다.
+import re
+import sys
+import json
+import time
+import base64
+import random
+import socket
+import hashlib
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from file_hasher import git_tree_sha
+
+DEFAULT_LOGIN = "octocat"
+DEFAULT_RATE_LIMIT = 5000           # 토큰별 시간당 호출 수
+SECONDARY_WRITES_PER_MINUTE = 80    # 분당 쓰기 요청 수 (넘으면 보조 한도 403)
+TREE_ENTRY_LIMIT = 100000           # 트리 조회 항목 수 (넘으면 잘라서 truncated)
+MODE_FILE = "100644"
+MODE_DIR = "040000"
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+def blob_sha(data):
+    """bytes → git blob SHA-1"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class FakeRepo:
+    """git 객체(blob/tree/commit)와 브랜치 참조를 메모리에 보관하는 저장소"""
+    def __init__(self, owner, name, default_branch="main", push=True):
+        self.owner = owner
+        self.name = name
+        self.default_branch = default_branch
+        self.push = push
+        self.blobs = {}    # sha → bytes
+        self.trees = {}    # sha → {이름: (mode, sha)}
+        self.commits = {}  # sha → {"tree", "parents", "message"}
+        self.refs = {}     # 브랜치 → 커밋 sha
+
+    def put_blob(self, data):
+        sha = blob_sha(data)
+        self.blobs[sha] = data
+        return sha
+
+    def put_tree(self, entries):
+        sha = git_tree_sha(entries)
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def write_flat(self, files):
+        """{경로: (mode, sha)} → 폴더별 트리를 만들고 루트 트리 SHA 반환"""
+        children = {}
+        entries = {}
+        for path, entry in files.items():
+            head, _, rest = path.partition("/")
+            if rest:
+                children.setdefault(head, {})[rest] = entry
+            else:
+                entries[path] = entry
+        for name, sub_files in children.items():
+            entries[name] = (MODE_DIR, self.write_flat(sub_files))
+        return self.put_tree(entries)
+
+    def flatten(self, tree_sha, prefix=""):
+        """루트 트리 → {경로: (mode, sha)} (파일만)"""
+        files = {}
+        for name, (mode, sha) in self.trees.get(tree_sha, {}).items():
+            if mode == MODE_DIR:
+                files.update(self.flatten(sha, f"{prefix}{name}/"))
+            else:
+                files[prefix + name] = (mode, sha)
+        return files
+
+    def walk(self, tree_sha, recursive, prefix=""):
+        """트리 조회 응답 항목 목록"""
+        items = []
+        for name, (mode, sha) in sorted(self.trees.get(tree_sha, {}).items()):
+            is_dir = mode == MODE_DIR
+            item = {"path": prefix + name, "mode": mode, "type": "tree" if is_dir else "blob", "sha": sha}
+            if not is_dir:
+                item["size"] = len(self.blobs.get(sha, b""))
+            items.append(item)
+            if is_dir and recursive:
+                items.extend(self.walk(sha, recursive, f"{prefix}{name}/"))
+        return items
+
+    def put_commit(self, tree_sha, parents, message):
+        body = f"tree {tree_sha}\n"
+        body += "".join(f"parent {parent}\n" for parent in parents)
+        stamp = f"Fake GitHub <fake@example.com> {int(time.time())} +0000"
+        body += f"author {stamp}\ncommitter {stamp}\n\n{message}\n"
+        data = body.encode("utf-8")
+        sha = hashlib.sha1(b"commit %d\0" % len(data) + data).hexdigest()
+        self.commits[sha] = {"tree": tree_sha, "parents": list(parents), "message": message}
+        return sha
+
+    def resolve(self, ref):
+        """브랜치 이름/HEAD/커밋 SHA → 커밋 SHA (없으면 None)"""
+        if ref in (None, "", "HEAD"):
+            ref = self.default_branch
+        if ref.startswith("heads/"):
+            ref = ref[len("heads/"):]
+        if ref in self.refs:
+            return self.refs[ref]
+        return ref if ref in self.commits else None
+
+    def head_files(self, branch):
+        commit_sha = self.resolve(branch)
+        return self.flatten(self.commits[commit_sha]["tree"]) if commit_sha else {}
+
+    def commit_files(self, branch, files, message):
+        """브랜치에 파일 목록 전체를 커밋 (브랜치가 없으면 새로 만듦)"""
+        branch = branch or self.default_branch
+        parent = self.refs.get(branch)
+        tree_sha = self.write_flat(files)
+        commit_sha = self.put_commit(tree_sha, [parent] if parent else [], message)
+        self.refs[branch] = commit_sha
+        return commit_sha
+
+
+class FakeGitHub:
+    """로컬 GitHub API 서버
+
+    latency/jitter: 요청마다 추가할 지연(초), rate_limit: 토큰별 시간당 호출 수,
+    secondary_writes_per_minute: 분당 쓰기 한도(None이면 끔), tree_limit: 트리 조회 항목 수 한도,
+    tokens: {토큰: 로그인} (None이면 아무 토큰이나 허용), auto_create: 처음 접근한 저장소 자동 생성
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, rate_limit=DEFAULT_RATE_LIMIT,
+                 secondary_writes_per_minute=SECONDARY_WRITES_PER_MINUTE, tree_limit=TREE_ENTRY_LIMIT,
+                 tokens=None, auto_create=True):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.secondary_writes_per_minute = secondary_writes_per_minute
+        self.tree_limit = tree_limit
+        self.tokens = tokens
+        self.auto_create = auto_create
+        self.repos = {}         # (소유자, 이름) → FakeRepo
+        self.requests = []      # (method, path, status) - 벤치마크 집계용
+        self._usage = {}        # 토큰 → [사용 횟수, 초기화 시각]
+        self._writes = deque()  # 최근 쓰기 요청 시각 (보조 한도)
+        self._faults = []       # [method, 경로 정규식, 상태 코드, 메시지, 남은 횟수]
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """백그라운드 쓰레드에서 서버 시작 → 기본 주소 반환"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def create_repo(self, owner, name, files=None, default_branch="main", push=True):
+        """저장소 생성 (files: {경로: bytes 또는 str}이면 첫 커밋 생성)"""
+        with self._lock:
+            repo = FakeRepo(owner, name, default_branch=default_branch, push=push)
+            self.repos[(owner, name)] = repo
+            if files:
+                entries = {}
+                for path, data in files.items():
+                    if isinstance(data, str):
+                        data = data.encode("utf-8")
+                    entries[path] = (MODE_FILE, repo.put_blob(data))
+                repo.commit_files(default_branch, entries, "Initial commit")
+            return repo
+
+    def files(self, owner, name, branch=None):
+        """브랜치의 {경로: blob sha}"""
+        with self._lock:
+            repo = self.repos.get((owner, name))
+            if repo is None:
+                return {}
+            return {path: sha for path, (_, sha) in repo.head_files(branch).items()}
+
+    def inject(self, status, method=None, path=None, count=1, message=None):
+        """다음 요청 count개에 오류 응답 (method/path 정규식으로 대상 제한)"""
+        with self._lock:
+            self._faults.append([method, re.compile(path) if path else None, status,
+                                 message or f"Injected error {status}", count])
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = []
+
+    def stats(self):
+        """요청 집계 {"total", "by_method", "by_status"} (/rate_limit 제외)"""
+        with self._lock:
+            by_method, by_status = {}, {}
+            for method, _, status in self.requests:
+                by_method[method] = by_method.get(method, 0) + 1
+                by_status[status] = by_status.get(status, 0) + 1
+            return {"total": len(self.requests), "by_method": by_method, "by_status": by_status}
+
+    # 요청 처리 (_Handler에서 호출, 응답: (상태 코드, 본문, 추가 헤더))
+    def handle(self, method, raw_path, headers, body):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        parts = urlsplit(raw_path)
+        path = unquote(parts.path).rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        token = (headers.get("Authorization") or "").split(" ", 1)[-1].strip()
+        with self._lock:
+            if path == "/rate_limit":
+                return 200, {"resources": {"core": self._core_limit(token)}}, self._limit_headers(token)
+            status, payload, extra = self._handle_limited(method, path, query, token, body)
+            self.requests.append((method, path, status))
+            extra.update(self._limit_headers(token))
+            return status, payload, extra
+
+    def _core_limit(self, token):
+        used, reset_at = self._usage.get(token, (0, int(time.time()) + 3600))
+        return {"limit": self.rate_limit, "remaining": max(self.rate_limit - used, 0),
+                "reset": reset_at, "used": used}
+
+    def _limit_headers(self, token):
+        core = self._core_limit(token)
+        return {"X-RateLimit-Limit": core["limit"], "X-RateLimit-Remaining": core["remaining"],
+                "X-RateLimit-Reset": core["reset"], "X-RateLimit-Used": core["used"],
+                "X-RateLimit-Resource": "core"}
+
+    def _handle_limited(self, method, path, query, token, body):
+        if not token or (self.tokens is not None and token not in self.tokens):
+            return 401, {"message": "Bad credentials"}, {}
+
+        # 기본 한도 (토큰별 시간당)
+        now = time.time()
+        usage = self._usage.get(token)
+        if usage is None or usage[1] <= now:
+            usage = self._usage[token] = [0, int(now) + 3600]
+        if usage[0] >= self.rate_limit:
+            return 403, {"message": f"API rate limit exceeded for {self._login(token)}."}, {}
+        usage[0] += 1
+
+        # 보조 한도 (분당 쓰기 요청)
+        if method in WRITE_METHODS and self.secondary_writes_per_minute:
+            while self._writes and self._writes[0] <= now - 60:
+                self._writes.popleft()
+            if len(self._writes) >= self.secondary_writes_per_minute:
+                retry_after = int(self._writes[0] + 60 - now) + 1
+                return 403, {"message": "You have exceeded a secondary rate limit. "
+                                        "Please wait a few minutes before you try again."}, \
+                    {"Retry-After": retry_after}
+            self._writes.append(now)
+
+        for fault in self._faults:
+            fault_method, fault_path, status, message, _ = fault
+            if (fault_method is None or fault_method == method) and (fault_path is None or fault_path.search(path)):
+                fault[4] -= 1
+                if fault[4] <= 0:
+                    self._faults.remove(fault)
+                return status, {"message": message}, {}
+
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"message": "Problems parsing JSON"}, {}
+        return self._route(method, path, query, token, data) + ({},)
+
+    def _login(self, token):
+        return (self.tokens or {}).get(token, DEFAULT_LOGIN)
+
+    def _repo(self, owner, name):
+        repo = self.repos.get((owner, name))
+        if repo is None and self.auto_create:
+            repo = self.create_repo(owner, name)
+        return repo
+
+    def _route(self, method, path, query, token, data):
+        if path == "/user" and method == "GET":
+            return 200, {"login": self._login(token), "type": "User"}
+
+        match = re.match(r"^/repos/([^/]+)/([^/]+)(?:/(.*))?$", path)
+        if not match:
+            return 404, {"message": "Not Found"}
+        repo = self._repo(match.group(1), match.group(2))
+        if repo is None:
+            return 404, {"message": "Not Found"}
+        rest = match.group(3) or ""
+
+        if rest == "":
+            return 200, self._repo_info(repo)
+        if rest == "contents" or rest.startswith("contents/"):
+            file_path = rest[len("contents/"):] if rest != "contents" else ""
+            handler = {"GET": self._get_contents, "PUT": self._put_contents,
+                       "DELETE": self._delete_contents}.get(method)
+            if handler is None:
+                return 404, {"message": "Not Found"}
+            return handler(repo, file_path, query, data)
+        if rest.startswith("commits/") and method == "GET":
+            return self._get_commit_summary(repo, rest[len("commits/"):])
+        if rest.startswith("git/"):
+            return self._route_git(repo, method, rest[len("git/"):], query, data)
+        return 404, {"message": "Not Found"}
+
+    def _repo_info(self, repo):
+        return {
+            "name": repo.name, "full_name": f"{repo.owner}/{repo.name}", "private": False,
+            "owner": {"login": repo.owner}, "default_branch": repo.default_branch,
+            "permissions": {"admin": repo.push, "push": repo.push, "pull": True},
+        }
+
+    def _commit_json(self, repo, commit_sha):
+        commit = repo.commits[commit_sha]
+        return {"sha": commit_sha, "message": commit["message"], "tree": {"sha": commit["tree"]},
+                "parents": [{"sha": parent} for parent in commit["parents"]]}
+
+    # contents API
+    def _get_contents(self, repo, file_path, query, data):
+        commit_sha = repo.resolve(query.get("ref"))
+        if commit_sha is None:
+            return 404, {"message": "This repository is empty." if not repo.refs else "No commit found for the ref"}
+        files = repo.flatten(repo.commits[commit_sha]["tree"])
+        if file_path in files:
+            mode, sha = files[file_path]
+            content = repo.blobs[sha]
+            return 200, {"type": "file", "name": file_path.rsplit("/", 1)[-1], "path": file_path, "sha": sha,
+                         "size": len(content), "encoding": "base64",
+                         "content": base64.b64encode(content).decode("ascii")}
+
+        prefix = f"{file_path}/" if file_path else ""
+        listing = {}
+        for path, (mode, sha) in files.items():
+            if not path.startswith(prefix):
+                continue
+            name, _, below = path[len(prefix):].partition("/")
+            if below:
+                listing.setdefault(name, {"type": "dir", "name": name, "path": prefix + name, "sha": None})
+            else:
+                listing[name] = {"type": "file", "name": name, "path": prefix + name, "sha": sha,
+                                 "size": len(repo.blobs.get(sha, b""))}
+        if not listing:
+            return 404, {"message": "Not Found"}
+        for item in listing.values():
+            if item["type"] == "dir":
+                item["sha"] = repo.write_flat({path[len(item["path"]) + 1:]: entry for path, entry in files.items()
+                                               if path.startswith(item["path"] + "/")})
+        return 200, [listing[name] for name in sorted(listing)]
+
+    def _put_contents(self, repo, file_path, query, data):
+        if not repo.push:
+            return 403, {"message": "Resource not accessible by integration"}
+        if not file_path or "content" not in data or "message" not in data:
+            return 422, {"message": "Invalid request."}
+        try:
+            content = base64.b64decode(data["content"], validate=True)
+        except ValueError:
+            return 422, {"message": "content is not valid Base64"}
+
+        branch = data.get("branch") or repo.default_branch
+        files = repo.head_files(branch)
+        existing = files.get(file_path)
+        if existing is not None:
+            if not data.get("sha"):
+                return 422, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."}
+            if data["sha"] != existing[1]:
+                return 409, {"message": f"{file_path} does not match {data['sha']}"}
+
+        sha = repo.put_blob(content)
+        files[file_path] = (existing[0] if existing else MODE_FILE, sha)  # 기존 파일의 mode(실행 권한 등)는 유지
+        commit_sha = repo.commit_files(branch, files, data["message"])
+        return (200 if existing else 201), {
+            "content": {"type": "file", "name": file_path.rsplit("/", 1)[-1], "path": file_path,
+                        "sha": sha, "size": len(content)},
+            "commit": self._commit_json(repo, commit_sha),
+        }
+
+    def _delete_contents(self, repo, file_path, query, data):
+        if not repo.push:
+            return 403, {"message": "Resource not accessible by integration"}
+        branch = data.get("branch") or repo.default_branch
+        files = repo.head_files(branch)
+        existing = files.get(file_path)
+        if existing is None:
+            return 404, {"message": "Not Found"}
+        if not data.get("sha"):
+            return 422, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."}
+        if data["sha"] != existing[1]:
+            return 409, {"message": f"{file_path} does not match {data['sha']}"}
+        del files[file_path]
+        commit_sha = repo.commit_files(branch, files, data.get("message") or f"Delete {file_path}")
+        return 200, {"content": None, "commit": self._commit_json(repo, commit_sha)}
+
+    def _get_commit_summary(self, repo, ref):
+        if not repo.refs:
+            return 409, {"message": "Git Repository is empty."}
+        commit_sha = repo.resolve(ref)
+        if commit_sha is None:
+            return 422, {"message": f"No commit found for SHA: {ref}"}
+        commit = repo.commits[commit_sha]
+        return 200, {"sha": commit_sha,
+                     "commit": {"message": commit["message"], "tree": {"sha": commit["tree"]}},
+                     "parents": [{"sha": parent} for parent in commit["parents"]]}
+
+    # git data API
+    def _route_git(self, repo, method, rest, query, data):
+        if not repo.refs and not (method == "POST" and rest in ("blobs", "trees", "commits")):
+            return 409, {"message": "Git Repository is empty."}
+
+        if rest.startswith("trees/") and method == "GET":
+            tree_sha = rest[len("trees/"):]
+            commit_sha = repo.resolve(tree_sha)
+            if commit_sha is not None:
+                tree_sha = repo.commits[commit_sha]["tree"]
+            if tree_sha not in repo.trees:
+                return 404, {"message": "Not Found"}
+            items = repo.walk(tree_sha, recursive=query.get("recursive") not in (None, "", "0", "false"))
+            truncated = len(items) > self.tree_limit
+            return 200, {"sha": tree_sha, "tree": items[:self.tree_limit], "truncated": truncated}
+        if rest == "trees" and method == "POST":
+            return self._post_tree(repo, data)
+        if rest.startswith("blobs/") and method == "GET":
+            sha = rest[len("blobs/"):]
+            if sha not in repo.blobs:
+                return 404, {"message": "Not Found"}
+            return 200, {"sha": sha, "size": len(repo.blobs[sha]), "encoding": "base64",
+                         "content": base64.b64encode(repo.blobs[sha]).decode("ascii")}
+        if rest == "blobs" and method == "POST":
+            content = data.get("content", "")
+            if data.get("encoding") == "base64":
+                raw = base64.b64decode(content)
+            else:
+                raw = content.encode("utf-8")
+            return 201, {"sha": repo.put_blob(raw)}
+        if rest.startswith("commits/") and method == "GET":
+            commit_sha = rest[len("commits/"):]
+            if commit_sha not in repo.commits:
+                return 404, {"message": "Not Found"}
+            return 200, self._commit_json(repo, commit_sha)
+        if rest == "commits" and method == "POST":
+            if data.get("tree") not in repo.trees:
+                return 422, {"message": "Tree SHA does not exist"}
+            parents = data.get("parents", [])
+            if any(parent not in repo.commits for parent in parents):
+                return 422, {"message": "Parent SHA does not exist or is not a commit object"}
+            commit_sha = repo.put_commit(data["tree"], parents, data.get("message", ""))
+            return 201, self._commit_json(repo, commit_sha)
+        if rest.startswith(("ref/heads/", "refs/heads/")):
+            branch = rest.split("heads/", 1)[1]
+            if method == "GET":
+                if branch not in repo.refs:
+                    return 404, {"message": "Not Found"}
+                return 200, self._ref_json(branch, repo.refs[branch])
+            if method == "PATCH":
+                return self._update_ref(repo, branch, data)
+            if method == "DELETE":
+                if repo.refs.pop(branch, None) is None:
+                    return 422, {"message": "Reference does not exist"}
+                return 204, None
+        if rest == "refs" and method == "POST":
+            ref = data.get("ref", "")
+            if not ref.startswith("refs/heads/") or data.get("sha") not in repo.commits:
+                return 422, {"message": "Invalid request."}
+            branch = ref[len("refs/heads/"):]
+            if branch in repo.refs:
+                return 422, {"message": "Reference already exists"}
+            repo.refs[branch] = data["sha"]
+            return 201, self._ref_json(branch, data["sha"])
+        return 404, {"message": "Not Found"}
+
+    def _post_tree(self, repo, data):
+        files = {}
+        base_tree = data.get("base_tree")
+        if base_tree:
+            if base_tree not in repo.trees:
+                return 422, {"message": "base_tree is not a valid tree oid"}
+            files = repo.flatten(base_tree)
+        for item in data.get("tree", []):
+            path = item.get("path")
+            if not path:
+                return 422, {"message": "Invalid tree info"}
+            if "content" in item:
+                files[path] = (item.get("mode", MODE_FILE), repo.put_blob(item["content"].encode("utf-8")))
+            elif item.get("sha") is None:
+                files.pop(path, None)
+            elif item["sha"] not in repo.blobs:
+                return 422, {"message": "Invalid tree info"}
+            else:
+                files[path] = (item.get("mode", MODE_FILE), item["sha"])
+        tree_sha = repo.write_flat(files)
+        return 201, {"sha": tree_sha, "tree": repo.walk(tree_sha, recursive=False), "truncated": False}
+
+    def _ref_json(self, branch, commit_sha):
+        return {"ref": f"refs/heads/{branch}", "object": {"sha": commit_sha, "type": "commit"}}
+
+    def _update_ref(self, repo, branch, data):
+        new_sha = data.get("sha")
+        if branch not in repo.refs:
+            return 422, {"message": "Reference does not exist"}
+        if new_sha not in repo.commits:
+            return 422, {"message": "Object does not exist"}
+        if not data.get("force") and not self._is_ancestor(repo, repo.refs[branch], new_sha):
+            return 422, {"message": "Update is not a fast forward"}
+        repo.refs[branch] = new_sha
+        return 200, self._ref_json(branch, new_sha)
+
+    def _is_ancestor(self, repo, ancestor, commit_sha):
+        pending = [commit_sha]
+        seen = set()
+        while pending:
+            sha = pending.pop()
+            if sha == ancestor:
+                return True
+            if sha in seen or sha not in repo.commits:
+                continue
+            seen.add(sha)
+            pending.extend(repo.commits[sha]["parents"])
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용 (requests 세션과 같은 조건)
+
+    def setup(self):
+        super().setup()
+        # 헤더와 본문을 나눠 쓰므로 Nagle 알고리즘을 끄지 않으면 응답마다 지연 ACK(약 40ms)만큼 늦어짐
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, extra = self.server.fake.handle(self.command, self.path, self.headers, body)
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in extra.items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_POST = do_PATCH = do_DELETE = _dispatch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 GitHub API 서버 (테스트/벤치마크용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 추가할 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 최대값 (초)")
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT, help="토큰별 시간당 호출 수")
+    parser.add_argument("--secondary-limit", type=int, default=SECONDARY_WRITES_PER_MINUTE,
+                        help="분당 쓰기 요청 수 (0이면 끔)")
+    parser.add_argument("--tree-limit", type=int, default=TREE_ENTRY_LIMIT, help="트리 조회 항목 수 한도")
+    parser.add_argument("--repo", action="append", default=[], help="미리 만들 저장소 (소유자/이름)")
+    parser.add_argument("--strict", action="store_true", help="미리 만들지 않은 저장소는 404")
+    args = parser.parse_args(argv)
+
+    fake = FakeGitHub(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                      rate_limit=args.rate_limit, secondary_writes_per_minute=args.secondary_limit or None,
+                      tree_limit=args.tree_limit, auto_create=not args.strict)
+    for full_name in args.repo:
+        owner, _, name = full_name.partition("/")
+        fake.create_repo(owner, name)
+    url = fake.start()
+    print(f"🧪 로컬 GitHub API 서버: {url}")
+    print(f"   GITHUB_API_URL={url} 로 설정하면 업로더가 이 서버를 사용합니다. (Ctrl+C를 눌러서 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
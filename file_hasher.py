@@ -0,0 +1,106 @@
+# file_hasher.py - 초기 스캔용 병렬 파일 해시 (git blob SHA-1)
+import os
+import mmap
+import hashlib
+
+IN_PROCESS_LIMIT = 1024 * 1024        # 1MB 이하 파일은 현재 프로세스에서 해시
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024  # 큰 파일 합계가 이보다 작으면 프로세스 풀 생략
+CHUNKS_PER_WORKER = 4                 # 작업자당 청크 수 (부하 분산용)
+READ_BLOCK = 4 * 1024 * 1024
+
+
+def git_blob_sha(file_path):
+    """GitHub contents API의 sha와 같은 git blob SHA-1 계산"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(b"blob %d\0" % size)
+    if size == 0:
+        return digest.hexdigest()
+    with open(file_path, "rb") as f:
+        if size <= IN_PROCESS_LIMIT:
+            digest.update(f.read())
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, READ_BLOCK):
+                    digest.update(mapped[offset:offset + READ_BLOCK])
+    return digest.hexdigest()
+
+
+def git_tree_sha(entries):
+    """git tree SHA-1 계산 (파일 내용은 읽지 않고 항목들의 SHA만 사용)
+
+    entries: {이름: (mode, sha)} - mode는 '100644'(파일), '40000'(폴더) 등
+    """
+    def sort_key(name):
+        # git은 폴더 이름 뒤에 '/'를 붙여서 정렬
+        mode = entries[name][0].lstrip("0")
+        return name + "/" if mode == "40000" else name
+
+    body = b"".join(
+        b"%s %s\0" % (entries[name][0].lstrip("0").encode(), name.encode("utf-8")) + bytes.fromhex(entries[name][1])
+        for name in sorted(entries, key=lambda name: sort_key(name).encode("utf-8"))
+    )
+    return hashlib.sha1(b"tree %d\0" % len(body) + body).hexdigest()
+
+
+def _hash_chunk(file_paths):
+    """프로세스 풀 작업자: 청크 안의 파일들 해시"""
+    results = {}
+    for file_path in file_paths:
+        try:
+            results[file_path] = git_blob_sha(file_path)
+        except OSError:
+            results[file_path] = None
+    return results
+
+
+def split_by_size(sized_files, chunk_count):
+    """파일들을 크기 합이 비슷한 청크로 나누기 (큰 파일부터 가장 가벼운 청크에 배치)"""
+    chunks = [[] for _ in range(max(1, chunk_count))]
+    loads = [0] * len(chunks)
+    for file_path, size in sorted(sized_files, key=lambda item: item[1], reverse=True):
+        lightest = loads.index(min(loads))
+        chunks[lightest].append(file_path)
+        loads[lightest] += size
+    return [chunk for chunk in chunks if chunk]
+
+
+def hash_files(file_paths, max_workers=None):
+    """여러 파일의 blob SHA 계산 ({경로: sha}, 읽기 실패 시 None)
+
+    작은 파일은 현재 프로세스에서, 큰 파일은 크기가 균등한 청크로 나눠
+    프로세스 풀에서 병렬로 해시합니다.
+    """
+    small, large = [], []
+    for file_path in file_paths:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            small.append(file_path)
+            continue
+        if size <= IN_PROCESS_LIMIT:
+            small.append(file_path)
+        else:
+            large.append((file_path, size))
+
+    results = _hash_chunk(small)
+    if not large:
+        return results
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or sum(size for _, size in large) < PARALLEL_MIN_BYTES:
+        results.update(_hash_chunk([path for path, _ in large]))
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor  # 필요할 때만 로드 (시작 속도)
+    chunks = split_by_size(large, workers * CHUNKS_PER_WORKER)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for chunk_result in pool.map(_hash_chunk, chunks):
+                results.update(chunk_result)
+    except (OSError, RuntimeError) as e:
+        # 프로세스 생성이 불가능한 환경이면 현재 프로세스에서 처리
+        # 작업 프로세스에서 로그 출력 쓰레드가 생기지 않도록 여기서만 로거 사용
+        import upload_log
+        upload_log.get_logger(__name__).warning(f"⚠️ 병렬 해시 실패, 단일 프로세스로 계속합니다: {e}")
+        results.update(_hash_chunk([path for path, _ in large]))
+    return results
@@ -0,0 +1,190 @@
+# github_client.py - 타임아웃 + 서킷 브레이커를 적용한 GitHub API 호출
+import os
+import time
+import threading
+import upload_log
+from upload_throttle import UploadCancelled
+
+log = upload_log.get_logger("client")
+
+# API 기본 주소 (환경변수 GITHUB_API_URL로 로컬 서버 등 다른 주소 사용 가능, 프로필 .env 값이 우선)
+DEFAULT_API_URL = "https://api.github.com"
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", DEFAULT_API_URL).rstrip("/")
+
+CONNECT_TIMEOUT = 5         # 연결 대기 (초)
+READ_TIMEOUT = 30           # 응답 대기 (초)
+UPLOAD_READ_TIMEOUT = 120   # 큰 파일 업로드(PUT) 응답 대기
+
+FAILURE_THRESHOLD = 2       # 연속 실패 N번이면 차단 (업로드 1건 = 조회 + 업로드)
+RETRY_SECONDS = 2           # 차단 후 첫 확인까지 대기 (확인 실패할 때마다 2배)
+MAX_RETRY_SECONDS = 30
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+MAX_RETRY_AFTER = 3600      # Retry-After / 한도 초기화 시각을 믿을 최대 대기 (초)
+WRITE_LIMIT_REASONS = ("429 요청이 너무 많음", "403 2차 요청 제한", "403 남용 감지")  # 요청 횟수 때문에 막힌 응답
+
+CIRCUIT_CLOSED = "closed"        # 정상
+CIRCUIT_OPEN = "open"            # 차단 (요청을 보내지 않고 바로 실패)
+CIRCUIT_HALF_OPEN = "half_open"  # 확인 요청 1개만 허용
+
+
+class CircuitBreaker:
+    """연결 실패가 이어지면 GitHub 요청을 잠시 막고, 시간이 지나면 요청 1개로 복구 확인
+
+    네트워크가 끊긴 동안 파일마다 타임아웃까지 기다리지 않도록 합니다.
+    """
+    def __init__(self, threshold=FAILURE_THRESHOLD, retry_seconds=RETRY_SECONDS,
+                 max_retry_seconds=MAX_RETRY_SECONDS):
+        self.threshold = threshold
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self._delay = retry_seconds
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.state != CIRCUIT_CLOSED
+
+    def allow(self):
+        """요청을 보내도 되는지 (차단 시간이 지났으면 확인 요청 1개 허용)"""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN and time.monotonic() >= self._retry_at:
+                self.state = CIRCUIT_HALF_OPEN
+                return True
+            return False
+
+    def retry_in(self):
+        """다음 확인까지 남은 시간 (초)"""
+        with self._lock:
+            return max(self._retry_at - time.monotonic(), 0)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CIRCUIT_CLOSED:
+                log.info("🌐 GitHub 연결이 복구되었습니다.")
+            self.state = CIRCUIT_CLOSED
+            self.failures = 0
+            self._delay = self.retry_seconds
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CIRCUIT_HALF_OPEN:
+                self._delay = min(self._delay * 2, self.max_retry_seconds)
+            elif self.state == CIRCUIT_OPEN or self.failures < self.threshold:
+                return
+            else:
+                log.warning(f"📴 GitHub 연결 실패 {self.failures}회 - 연결될 때까지 요청을 멈춥니다.")
+            self.state = CIRCUIT_OPEN
+            self._retry_at = time.monotonic() + self._delay
+
+    def record_cancelled(self):
+        """요청을 중간에 취소함 (실패로 세지 않고, 확인 요청이었으면 다음 요청이 다시 확인하도록 반환)"""
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                self.state = CIRCUIT_OPEN
+
+
+def throttle_reason(method, response):
+    """요청 제한(혼잡) 응답이면 이유 문자열, 아니면 None
+
+    429, 2차 요청 제한/남용 감지 403, 한도 소진 403, 동시 쓰기 충돌 409를 혼잡 신호로 봅니다.
+    """
+    status = response.status_code
+    if status == 429:
+        return "429 요청이 너무 많음"
+    if status == 403:
+        try:
+            message = str((response.json() or {}).get("message", "")).lower()
+        except ValueError:
+            message = ""
+        if "secondary rate limit" in message:
+            return "403 2차 요청 제한"
+        if "abuse" in message:
+            return "403 남용 감지"
+        if response.headers.get("X-RateLimit-Remaining") == "0" or "api rate limit exceeded" in message:
+            return "403 API 호출 한도 소진"
+        if "Retry-After" in response.headers:
+            return "403 Retry-After"
+    if status == 409 and method in WRITE_METHODS:
+        return "409 동시 쓰기 충돌"
+    return None
+
+
+def is_cancelled(error):
+    """엔진 중지로 업로드 본문 전송을 멈춘 오류인지 (requests가 ConnectionError로 감싸도 확인)"""
+    seen = set()
+    pending = [error]
+    while pending:
+        error = pending.pop()
+        if not isinstance(error, BaseException) or id(error) in seen:
+            continue
+        if isinstance(error, UploadCancelled):
+            return True
+        seen.add(id(error))
+        pending.extend(error.args)
+        pending.extend((error.__cause__, error.__context__))
+    return False
+
+
+def retry_after_seconds(response):
+    """Retry-After 또는 한도 초기화 시각까지 남은 초 (없으면 None)"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.strip().isdigit():
+        return min(int(retry_after), MAX_RETRY_AFTER)
+    reset = response.headers.get("X-RateLimit-Reset")
+    if response.headers.get("X-RateLimit-Remaining") == "0" and reset and reset.isdigit():
+        return min(max(int(reset) - time.time(), 0), MAX_RETRY_AFTER)
+    return None
+
+
+class GitHubClient:
+    """requests 세션 래퍼: 모든 호출에 타임아웃 적용 + 결과를 서킷 브레이커에 기록
+
+    연결 오류/타임아웃/5xx만 실패로 셉니다 (4xx는 서버에 닿았으므로 성공).
+    차단 중에는 네트워크를 쓰지 않고 바로 ConnectionError를 냅니다.
+    """
+    def __init__(self, session, breaker, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), observer=None):
+        self.session = session
+        self.breaker = breaker
+        self.timeout = timeout
+        self.observer = observer  # observer(method, response 또는 None, 소요 시간) - 지표 기록용
+
+    def request(self, method, url, **kwargs):
+        import requests
+        if not self.breaker.allow():
+            raise requests.exceptions.ConnectionError(
+                f"GitHub 연결 차단 중 ({self.breaker.retry_in():.0f}초 후 다시 확인)")
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            if is_cancelled(e):  # 엔진 중지로 끊은 요청은 GitHub 장애가 아님
+                self.breaker.record_cancelled()
+            else:
+                self.breaker.record_failure()
+            if self.observer:
+                self.observer(method, None, time.monotonic() - started)
+            raise
+        if self.observer:
+            self.observer(method, response, time.monotonic() - started)
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
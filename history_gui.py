@@ -0,0 +1,189 @@
+# history_gui.py - 업로드 기록 창 (SQLite 기록을 필요한 만큼만 불러오는 가상화 목록)
+import time
+import tkinter as tk
+from tkinter import ttk
+from upload_history import HistoryReader, PAGE_SIZE, STATUS_SUCCESS, STATUS_FAILED
+
+MAX_LOADED_ROWS = PAGE_SIZE * 3  # 트리뷰에 동시에 올려두는 최대 행 수
+EDGE_THRESHOLD = 0.1             # 스크롤이 끝에서 이 비율 안쪽이면 다음 페이지 로드
+
+ACTION_TEXT = {"add": "➕ 추가", "update": "🔄 업데이트", "delete": "🗑️ 삭제", "upload": "📤 업로드"}
+STATUS_TEXT = {STATUS_SUCCESS: "✅ 성공", STATUS_FAILED: "❌ 실패"}
+STATUS_FILTERS = {"전체": None, "성공": STATUS_SUCCESS, "실패": STATUS_FAILED}
+
+
+class UploadHistoryWindow:
+    def __init__(self, parent, profiles, current_profile=None):
+        self.reader = HistoryReader()
+        self.window = tk.Toplevel(parent)
+        self.window.title("📊 업로드 기록")
+        self.window.geometry("900x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.profile_var = tk.StringVar(value=current_profile or "전체")
+        self.status_var = tk.StringVar(value="전체")
+        self.path_var = tk.StringVar()
+        self.filters = {}
+        self.newest_id = None   # 현재 로드된 범위의 가장 최신 id
+        self.oldest_id = None   # 현재 로드된 범위의 가장 오래된 id
+        self.reached_end = False
+        self.loading = False
+        self.load_scheduled = False  # after_idle로 예약한 로드가 아직 실행 전
+
+        self.setup_ui(["전체"] + list(profiles))
+        self.apply_filters()
+
+    def setup_ui(self, profile_values):
+        main_frame = tk.Frame(self.window, padx=15, pady=15)
+        main_frame.pack(fill='both', expand=True)
+
+        # 필터
+        filter_frame = tk.LabelFrame(main_frame, text="🔍 필터", font=("Arial", 11, "bold"),
+                                     padx=10, pady=8)
+        filter_frame.pack(fill='x', pady=(0, 10))
+
+        tk.Label(filter_frame, text="프로필:", font=("Arial", 10)).pack(side='left')
+        ttk.Combobox(filter_frame, textvariable=self.profile_var, values=profile_values,
+                     state="readonly", width=15).pack(side='left', padx=(5, 15))
+
+        tk.Label(filter_frame, text="결과:", font=("Arial", 10)).pack(side='left')
+        ttk.Combobox(filter_frame, textvariable=self.status_var, values=list(STATUS_FILTERS),
+                     state="readonly", width=8).pack(side='left', padx=(5, 15))
+
+        tk.Label(filter_frame, text="파일명:", font=("Arial", 10)).pack(side='left')
+        path_entry = tk.Entry(filter_frame, textvariable=self.path_var, width=20)
+        path_entry.pack(side='left', padx=(5, 15))
+        path_entry.bind('<Return>', lambda e: self.apply_filters())
+
+        tk.Button(filter_frame, text="검색", command=self.apply_filters,
+                  font=("Arial", 10), width=8).pack(side='left')
+
+        # 목록
+        list_frame = tk.Frame(main_frame)
+        list_frame.pack(fill='both', expand=True)
+
+        columns = ("time", "profile", "action", "path", "status", "bytes", "commit")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show='headings')
+        headings = {"time": ("시간", 140), "profile": ("프로필", 100), "action": ("작업", 90),
+                    "path": ("파일", 200), "status": ("결과", 70), "bytes": ("크기", 80),
+                    "commit": ("커밋/오류", 180)}
+        for column, (text, width) in headings.items():
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width, anchor='w')
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.status_label = tk.Label(main_frame, text="", font=("Arial", 10), fg="gray")
+        self.status_label.pack(anchor='w', pady=(8, 0))
+
+    def apply_filters(self):
+        """필터 변경 → 처음(최신)부터 다시 로드"""
+        profile = self.profile_var.get()
+        self.filters = {
+            "profile": None if profile == "전체" else profile,
+            "status": STATUS_FILTERS.get(self.status_var.get()),
+            "path_prefix": self.path_var.get().strip() or None,
+        }
+        self.tree.delete(*self.tree.get_children())
+        self.newest_id = self.oldest_id = None
+        self.reached_end = False
+        self.load_older()
+
+    def format_row(self, row):
+        row_id, ts, profile, action, path, status, byte_count, commit_sha, message = row
+        detail = (commit_sha or "")[:7] if status == STATUS_SUCCESS else (message or "")
+        return (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)), profile,
+                ACTION_TEXT.get(action, action), path, STATUS_TEXT.get(status, status),
+                f"{byte_count:,}" if byte_count else "", detail)
+
+    def load_older(self):
+        """아래쪽(더 오래된 기록) 페이지 로드, 넘치면 위쪽 행 제거"""
+        if self.loading or self.reached_end:
+            return
+        self.loading = True
+        try:
+            rows = self.reader.page(before_id=self.oldest_id, **self.filters)
+            if len(rows) < PAGE_SIZE:
+                self.reached_end = True
+            children = self.tree.get_children()
+            anchor = children[-1] if children else None
+            for row in rows:
+                self.tree.insert('', 'end', iid=str(row[0]), values=self.format_row(row))
+            if rows:
+                self.oldest_id = rows[-1][0]
+                if self.newest_id is None:
+                    self.newest_id = rows[0][0]
+            self.trim('top')
+            if anchor:
+                self.tree.see(anchor)  # 위쪽 행을 지워도 보던 위치 유지
+        finally:
+            self.loading = False
+        self.update_status_text()
+
+    def load_newer(self):
+        """위쪽(더 최신 기록) 페이지 로드, 넘치면 아래쪽 행 제거"""
+        if self.loading or self.newest_id is None:
+            return
+        self.loading = True
+        try:
+            rows = self.reader.page(after_id=self.newest_id, **self.filters)
+            children = self.tree.get_children()
+            anchor = children[0] if children else None
+            for index, row in enumerate(rows):
+                self.tree.insert('', index, iid=str(row[0]), values=self.format_row(row))
+            if rows:
+                self.newest_id = rows[0][0]
+                self.trim('bottom')
+                if anchor:
+                    self.tree.see(anchor)
+        finally:
+            self.loading = False
+        self.update_status_text()
+
+    def trim(self, side):
+        """로드된 행이 MAX_LOADED_ROWS를 넘으면 반대쪽부터 제거"""
+        children = self.tree.get_children()
+        extra = len(children) - MAX_LOADED_ROWS
+        if extra <= 0:
+            return
+        if side == 'top':
+            removed = children[:extra]
+            self.tree.delete(*removed)
+            self.newest_id = int(self.tree.get_children()[0])
+        else:
+            removed = children[-extra:]
+            self.tree.delete(*removed)
+            self.oldest_id = int(self.tree.get_children()[-1])
+            self.reached_end = False
+
+    def on_scroll(self, first, last):
+        """트리뷰 스크롤 위치에 따라 필요한 페이지만 로드"""
+        self.scrollbar.set(first, last)
+        first, last = float(first), float(last)
+        if self.load_scheduled or self.loading:
+            return  # 스크롤 이벤트마다 같은 페이지를 다시 조회하지 않음
+        if last >= 1 - EDGE_THRESHOLD and not self.reached_end:
+            self.schedule_load(self.load_older)
+        elif first <= EDGE_THRESHOLD and self.newest_id is not None:
+            self.schedule_load(self.load_newer)
+
+    def schedule_load(self, load):
+        """화면 갱신이 끝난 뒤 로드 1번만 실행"""
+        self.load_scheduled = True
+
+        def run():
+            self.load_scheduled = False
+            load()
+        self.window.after_idle(run)
+
+    def update_status_text(self):
+        total = self.reader.approximate_total()
+        self.status_label.config(
+            text=f"표시 중: {len(self.tree.get_children())}건 (전체 약 {total:,}건)")
+
+    def close(self):
+        self.reader.close()
+        self.window.destroy()
@@ -0,0 +1,241 @@
+# instance_registry.py - 프로필별 단일 실행 잠금 + 제어 소켓 (pid 파일/psutil 대체)
+#
+# 제어 소켓은 같은 사용자만 연결할 수 있고(local_socket.py), 모든 명령에 실행마다 새로 만드는 토큰이 필요합니다.
+# 토큰이 들어 있는 제어 주소는 본인만 읽을 수 있는 실행 정보 파일(0600)에만 기록합니다.
+import os
+import re
+import json
+import time
+import threading
+import metrics
+from local_socket import LocalServer, connect, token_matches
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+REGISTRY_DIR = ".upload_instances"
+CONTROL_TIMEOUT = 5
+
+
+def _safe_name(profile):
+    return re.sub(r'[^\w\-.]', '_', profile or 'default')
+
+
+def _lock_paths(profile, registry_dir=REGISTRY_DIR):
+    name = _safe_name(profile)
+    return os.path.join(registry_dir, f"{name}.lock"), os.path.join(registry_dir, f"{name}.json")
+
+
+def _try_lock(fd):
+    """잠금 시도 (다른 프로세스가 잡고 있으면 False)"""
+    try:
+        if os.name == 'nt':
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    try:
+        if os.name == 'nt':
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+class InstanceLock:
+    """프로필당 업로더 1개만 실행되도록 하는 권고 잠금
+
+    잠금은 프로세스가 끝나면 OS가 자동으로 풀어주므로 pid 재사용이나
+    비정상 종료 후 남은 파일 때문에 잘못 판단하지 않습니다.
+    """
+    def __init__(self, profile, registry_dir=REGISTRY_DIR):
+        self.profile = profile
+        self.lock_path, self.info_path = _lock_paths(profile, registry_dir)
+        self._fd = None
+
+    def acquire(self, control_address=None):
+        os.makedirs(os.path.dirname(self.lock_path), mode=0o700, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        if not _try_lock(fd):
+            os.close(fd)
+            return False
+        self._fd = fd
+        self.update(control_address)
+        return True
+
+    def update(self, control_address):
+        """실행 정보(제어 소켓 주소 + 토큰 등) 기록 (본인만 읽을 수 있게 0600)"""
+        info = {
+            "profile": self.profile,
+            "pid": os.getpid(),
+            "control": control_address,
+            "started": time.time(),
+        }
+        temp_path = self.info_path + ".tmp"
+        try:
+            os.remove(temp_path)  # 이전 실행이 남긴 파일의 권한을 그대로 쓰지 않음
+        except OSError:
+            pass
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        os.replace(temp_path, self.info_path)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            os.remove(self.info_path)
+        except OSError:
+            pass
+        _unlock(self._fd)
+        os.close(self._fd)
+        self._fd = None
+
+
+def find_instance(profile, registry_dir=REGISTRY_DIR):
+    """실행 중인 업로더 정보 (없으면 None) - 프로세스 목록을 뒤지지 않고 잠금 파일 1개만 확인"""
+    lock_path, info_path = _lock_paths(profile, registry_dir)
+    if not os.path.exists(lock_path):
+        return None
+    try:
+        fd = os.open(lock_path, os.O_RDWR)
+    except OSError:
+        return None
+    try:
+        if _try_lock(fd):
+            _unlock(fd)  # 잠글 수 있으면 실행 중인 업로더가 없음
+            return None
+    finally:
+        os.close(fd)
+    try:
+        with open(info_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"profile": profile, "control": None}
+
+
+class ControlServer:
+    """업로더 쪽 제어 소켓: status / pause / resume / reload / stop / subscribe 명령 처리
+
+    토큰이 맞지 않는 요청은 응답 없이 연결을 끊습니다.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self._server = LocalServer(f"control-{engine.profile_name or 'default'}")
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    @property
+    def address(self):
+        return self._server.address
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self._server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        metrics.wakeup("control")
+        try:
+            conn.settimeout(CONTROL_TIMEOUT)
+            with conn.makefile('r', encoding='utf-8') as stream:
+                line = stream.readline()
+            request = json.loads(line) if line else {}
+            command = request.get("cmd")
+        except (OSError, ValueError):
+            conn.close()
+            return
+        if not token_matches(self._server.token, request.get("token")):
+            conn.close()
+            return
+
+        if command == "subscribe":
+            # 이 연결로 진행 이벤트를 계속 보냄 (연결은 publisher가 관리)
+            conn.settimeout(None)
+            self.engine.progress.attach_socket(conn)
+            self.engine.publish("state", state=self.engine.state)
+            return
+
+        reply = {"ok": True}
+        if command == "status":
+            reply["status"] = self.engine.status()
+        elif command == "pause":
+            self.engine.pause()
+        elif command == "resume":
+            self.engine.resume()
+        elif command == "reload":
+            # 설정 다시 읽기 (프로필 전환 포함)
+            threading.Thread(target=self.engine.reload_config,
+                             args=(request.get("profile"),), daemon=True).start()
+        elif command == "stop":
+            threading.Thread(target=self.engine.stop, daemon=True).start()
+        else:
+            reply = {"ok": False, "error": f"알 수 없는 명령: {command}"}
+
+        try:
+            conn.sendall((json.dumps(reply, ensure_ascii=False) + "\n").encode('utf-8'))
+        except OSError:
+            pass
+        conn.close()
+
+    def close(self):
+        self._server.close()
+
+
+def _connect(address, command, **fields):
+    """제어 소켓에 연결하고 명령 1줄 전송 (토큰 포함)"""
+    conn, token = connect(address, timeout=CONTROL_TIMEOUT)
+    request = {"cmd": command, "token": token}
+    request.update(fields)
+    try:
+        conn.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode('utf-8'))
+    except OSError:
+        conn.close()
+        raise
+    return conn
+
+
+def send_command(address, command, **fields):
+    """제어 소켓에 명령 전송 후 응답 반환 (실패 시 None)"""
+    try:
+        with _connect(address, command, **fields) as conn:
+            with conn.makefile('r', encoding='utf-8') as stream:
+                line = stream.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def subscribe(address, callback, on_close=None):
+    """실행 중인 업로더의 진행 이벤트 구독 (별도 쓰레드, 연결이 끊기면 on_close 호출)"""
+    try:
+        conn = _connect(address, "subscribe")
+        conn.settimeout(None)
+    except (OSError, ValueError):
+        return False
+
+    def read_loop():
+        with conn, conn.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                try:
+                    callback(json.loads(line))
+                except ValueError:
+                    continue
+        if on_close:
+            on_close()
+
+    threading.Thread(target=read_loop, daemon=True).start()
+    return True
@@ -0,0 +1,99 @@
+# local_socket.py - 같은 사용자만 쓸 수 있는 로컬 소켓 (제어 소켓 / 진행 상황 채널)
+#
+# POSIX: 사용자 전용(0700) 폴더 안의 유닉스 소켓 (다른 사용자는 연결 자체가 불가)
+# Windows: 127.0.0.1 TCP 소켓 + 실행마다 새로 만드는 토큰
+#
+# 주소 문자열은 "unix:/경로#토큰" 또는 "127.0.0.1:포트#토큰" 형식이고, 토큰이 맞지 않는 연결은 바로 끊습니다.
+# 주소는 0600 실행 정보 파일(.upload_instances/)이나 자식 프로세스 환경변수로만 전달합니다.
+import os
+import re
+import hmac
+import stat
+import socket
+import secrets
+import tempfile
+
+UNIX_PREFIX = "unix:"
+USE_UNIX_SOCKET = os.name != 'nt' and hasattr(socket, "AF_UNIX")
+TOKEN_BYTES = 16
+SOCKET_NAME_LIMIT = 40  # 유닉스 소켓 경로 길이 제한(약 100자) 때문에 이름을 자름
+
+
+def runtime_dir():
+    """소켓을 둘 사용자 전용 폴더 (없으면 0700으로 생성, 권한이 느슨하면 PermissionError)"""
+    base = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    path = os.path.join(base, f"github-uploader-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"소켓 폴더가 안전하지 않습니다 (본인 소유, 0700이어야 함): {path}")
+    return path
+
+
+def split_address(address):
+    """'주소#토큰' → (주소, 토큰)"""
+    endpoint, _, token = (address or "").rpartition("#")
+    return (endpoint, token) if endpoint else (address, "")
+
+
+def token_matches(expected, given):
+    return isinstance(given, str) and hmac.compare_digest(expected, given)
+
+
+class LocalServer:
+    """같은 사용자만 연결할 수 있는 대기 소켓 (address에 토큰 포함)"""
+    def __init__(self, name):
+        self.token = secrets.token_hex(TOKEN_BYTES)
+        self.path = None
+        if USE_UNIX_SOCKET:
+            safe_name = re.sub(r'[^\w\-.]', '_', name)[:SOCKET_NAME_LIMIT]
+            self.path = os.path.join(runtime_dir(), f"{safe_name}-{os.getpid()}-{secrets.token_hex(4)}.sock")
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.bind(self.path)
+            os.chmod(self.path, 0o600)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.bind(("127.0.0.1", 0))
+        self.socket.listen()
+
+    @property
+    def endpoint(self):
+        if self.path:
+            return UNIX_PREFIX + self.path
+        host, port = self.socket.getsockname()[:2]
+        return f"{host}:{port}"
+
+    @property
+    def address(self):
+        return f"{self.endpoint}#{self.token}"
+
+    def accept(self):
+        conn, _ = self.socket.accept()
+        return conn
+
+    def close(self):
+        try:
+            self.socket.close()
+        except OSError:
+            pass
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def connect(address, timeout=None):
+    """주소(토큰 포함)로 연결 → (소켓, 토큰)"""
+    endpoint, token = split_address(address)
+    if endpoint.startswith(UNIX_PREFIX):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(endpoint[len(UNIX_PREFIX):])
+        except OSError:
+            sock.close()
+            raise
+        return sock, token
+    host, _, port = endpoint.rpartition(":")
+    return socket.create_connection((host or "127.0.0.1", int(port)), timeout=timeout), token
@@ -0,0 +1,123 @@
+# log_buffer.py - 업로더 출력 캡처용 고정 크기 링 버퍼
+import json
+import time
+import threading
+from collections import deque
+
+LOG_CAPACITY = 5000  # 메모리에 보관하는 최대 로그 줄 수
+
+LEVEL_INFO = "INFO"
+LEVEL_WARNING = "WARNING"
+LEVEL_ERROR = "ERROR"
+LEVEL_ORDER = {LEVEL_INFO: 0, LEVEL_WARNING: 1, LEVEL_ERROR: 2}
+
+
+def detect_level(text):
+    """기존 이모티콘 메시지에서 로그 레벨 추정"""
+    if "❌" in text:
+        return LEVEL_ERROR
+    if "⚠️" in text:
+        return LEVEL_WARNING
+    return LEVEL_INFO
+
+
+def parse_json_line(text):
+    """LOG_FORMAT=json 로그 한 줄 → (레벨, 메시지), 아니면 None"""
+    if not text.startswith('{"ts"'):
+        return None
+    try:
+        record = json.loads(text)
+    except ValueError:
+        return None
+    level = record.get("level")
+    return (level if level in LEVEL_ORDER else LEVEL_INFO), str(record.get("msg", ""))
+
+
+class LogRingBuffer:
+    """가장 최근 LOG_CAPACITY 줄만 보관하는 로그 버퍼 (쓰레드 안전)
+
+    각 줄에 증가하는 번호를 붙여서, 화면은 마지막으로 그린 번호 이후의
+    줄만 가져가 점진적으로 그릴 수 있습니다.
+    """
+    def __init__(self, capacity=LOG_CAPACITY):
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._listeners = []
+
+    def append(self, text, level=None):
+        text = text.rstrip()
+        parsed = parse_json_line(text.lstrip())
+        if parsed:
+            level, text = level or parsed[0], parsed[1]
+        if not text.strip():
+            return
+        with self._lock:
+            self._seq += 1
+            self._entries.append((self._seq, time.time(), level or detect_level(text), text))
+        for callback in list(self._listeners):
+            callback()
+
+    def since(self, seq, min_level=LEVEL_INFO):
+        """seq 이후의 줄 중 min_level 이상만 반환"""
+        threshold = LEVEL_ORDER[min_level]
+        with self._lock:
+            entries = list(self._entries)
+        return [entry for entry in entries
+                if entry[0] > seq and LEVEL_ORDER[entry[2]] >= threshold]
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def add_listener(self, callback):
+        """새 줄이 들어올 때 호출 (호출 쓰레드는 로그를 쓴 쓰레드)"""
+        self._listeners.append(callback)
+
+
+class StreamCapture:
+    """print() 출력을 링 버퍼에 넣는 stdout 대체 객체 (원래 스트림에도 그대로 출력)
+
+    '\\r'로 끝나는 임시 출력(스피너 등)은 버퍼에 넣지 않습니다.
+    """
+    def __init__(self, buffer, original=None):
+        self.buffer = buffer
+        self.original = original
+        self._partial = ""
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        if self.original is not None:
+            try:
+                self.original.write(text)
+            except (OSError, ValueError):
+                pass
+        with self._lock:
+            data = self._partial + text
+            lines = data.split("\n")
+            self._partial = lines.pop()
+            if "\r" in self._partial:
+                # 줄바꿈 없이 덮어쓰는 임시 출력(스피너 등)은 버림
+                self._partial = self._partial.rsplit("\r", 1)[-1]
+        for line in lines:
+            # 같은 줄을 '\r'로 덮어쓴 경우 마지막 내용만 보관
+            self.buffer.append(line.rstrip("\r").rsplit("\r", 1)[-1])
+        return len(text)
+
+    def flush(self):
+        if self.original is not None:
+            try:
+                self.original.flush()
+            except (OSError, ValueError):
+                pass
+
+    def isatty(self):
+        return False
+
+
+def pump_stream(stream, buffer):
+    """하위 프로세스의 출력 스트림을 끝날 때까지 읽어서 버퍼에 넣기 (별도 쓰레드에서 실행)"""
+    capture = StreamCapture(buffer)
+    for chunk in iter(stream.readline, ""):
+        capture.write(chunk)
+    capture.write("\n")
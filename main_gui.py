@@ -3,13 +3,21 @@ import tkinter as tk
 from tkinter import messagebox, ttk, scrolledtext
 import subprocess
 import os
+import io
 import sys
-import psutil
 import threading
 import time
-import importlib
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+import config_cache
 from env_generate import EnvGenerator
+from package_check import REQUIRED_PACKAGES, package_status, missing_packages, invalidate_cache
+from progress_channel import ProgressSubscriber, PROGRESS_ADDR_ENV
+from instance_registry import find_instance, send_command, subscribe
+from log_buffer import LogRingBuffer, StreamCapture, pump_stream, LEVEL_INFO, LEVEL_WARNING, LEVEL_ERROR
+
+LOG_VIEW_LINES = 1000       # 로그 창에 표시하는 최대 줄 수
+LOG_RENDER_INTERVAL = 200   # 로그 화면 갱신 간격 (ms, 새 줄이 있을 때만)
+LOG_LEVEL_FILTERS = {"전체": LEVEL_INFO, "경고 이상": LEVEL_WARNING, "오류만": LEVEL_ERROR}
 
 class GitHubAutoUploadMain:
     def __init__(self):
@@ -19,40 +27,43 @@ class GitHubAutoUploadMain:
         
         # 업로드 프로세스 관리 변수들
         self.upload_process = None
-        self.upload_pid_file = "upload_process.pid"
         self.is_upload_running = False
+        self.remote_state = None  # 별도 프로세스 업로더가 알려준 상태 (running / paused ...)
+        self.uploader_control = None  # 별도 프로세스 업로더의 제어 소켓 주소 (프로필을 바꿔도 그대로)
+        
+        # 🔧 GUI 프로세스 안에서 실행하는 업로드 엔진 (기본값)
+        self.upload_engine = None
+        self.run_in_process = tk.BooleanVar(value=True)
+        self.is_stopping = False  # 중지 작업이 백그라운드에서 진행 중
+        
+        # 🔧 설정 읽기/프로필 전환은 백그라운드 쓰레드 1개에서 순서대로 처리 (UI 멈춤 방지)
+        self.config_executor = ThreadPoolExecutor(max_workers=1)
+        self.config_generations = {}
+        
+        # 🔧 업로더 진행 상황 구독 (푸시 방식, 폴링 없음)
+        self.progress_subscriber = None
+        
+        # 🔧 실행 로그 (콘솔 대신 GUI에 표시, 최근 줄만 보관)
+        self.log_buffer = LogRingBuffer()
+        self.log_rendered_seq = 0
+        self.log_render_pending = False
+        self.log_level = tk.StringVar(value="전체")
+        self.log_text = None
+        self.log_buffer.add_listener(self.on_log_appended)
+        sys.stdout = StreamCapture(self.log_buffer, sys.stdout)
         
         self.setup_ui()
         self.check_required_packages()  # 시작 시 패키지 체크
         self.load_profiles()
         self.update_status()
         self.check_upload_process()
-        self.start_process_monitor()
         
     # 🔧 패키지 설치 관련 메서드들
     def check_required_packages(self):
-        """필수 패키지 설치 상태 체크"""
-        required_packages = [
-            'PyGithub', 'python-dotenv', 'watchdog', 'schedule', 
-            'requests', 'beautifulsoup4', 'psutil'
-        ]
-        
-        missing_packages = []
-        for package in required_packages:
-            try:
-                if package == 'PyGithub':
-                    importlib.import_module('github')
-                elif package == 'python-dotenv':
-                    importlib.import_module('dotenv')
-                elif package == 'beautifulsoup4':
-                    importlib.import_module('bs4')
-                else:
-                    importlib.import_module(package)
-            except ImportError:
-                missing_packages.append(package)
-        
-        if missing_packages:
-            self.show_package_install_dialog(missing_packages)
+        """필수 패키지 설치 상태 체크 (import 없이 메타데이터만 확인)"""
+        missing = missing_packages()
+        if missing:
+            self.show_package_install_dialog(missing)
     
     def detect_environment_type(self):
         """현재 Python 환경 타입 감지"""
@@ -257,6 +268,7 @@ class GitHubAutoUploadMain:
                 
                 # 프로세스 완료 대기
                 return_code = process.wait()
+                invalidate_cache()
                 
                 progress_bar.stop()
                 
@@ -362,6 +374,9 @@ class GitHubAutoUploadMain:
         # 기능 버튼들
         self.create_function_buttons(main_frame)
         
+        # 🔧 실행 로그
+        self.create_log_section(main_frame)
+        
         # 🔧 패키지 관리 버튼 추가
         self.create_package_management_section(main_frame)
         
@@ -386,6 +401,74 @@ class GitHubAutoUploadMain:
         self.canvas.bind('<Enter>', bind_to_mousewheel)
         self.canvas.bind('<Leave>', unbind_from_mousewheel)
     
+    # 🔧 실행 로그 섹션
+    def create_log_section(self, parent):
+        log_frame = tk.LabelFrame(parent, text="📜 실행 로그", 
+                                 font=("Arial", 11, "bold"), 
+                                 padx=15, pady=10)
+        log_frame.pack(fill='both', expand=True, pady=(15, 0))
+        
+        option_frame = tk.Frame(log_frame)
+        option_frame.pack(fill='x', pady=(0, 5))
+        
+        tk.Label(option_frame, text="표시 레벨:", font=("Arial", 10)).pack(side='left')
+        level_combobox = ttk.Combobox(option_frame, textvariable=self.log_level,
+                                      values=list(LOG_LEVEL_FILTERS),
+                                      state="readonly", width=10)
+        level_combobox.pack(side='left', padx=5)
+        level_combobox.bind('<<ComboboxSelected>>', lambda e: self.rerender_log())
+        
+        tk.Button(option_frame, text="🧹 지우기", font=("Arial", 9),
+                 command=self.clear_log_view).pack(side='right')
+        
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=12, font=("Consolas", 9),
+                                                  state='disabled', wrap='none')
+        self.log_text.pack(fill='both', expand=True)
+        self.log_text.tag_config(LEVEL_WARNING, foreground="darkorange")
+        self.log_text.tag_config(LEVEL_ERROR, foreground="red")
+    
+    def on_log_appended(self):
+        """새 로그 줄 알림 (아무 쓰레드) → 잠시 모았다가 한 번에 그리기"""
+        if not self.log_render_pending:
+            self.log_render_pending = True
+            self.root.after(LOG_RENDER_INTERVAL, self.render_log)
+    
+    def render_log(self):
+        """마지막으로 그린 이후의 줄만 추가 (오래된 줄은 잘라냄)"""
+        self.log_render_pending = False
+        if self.log_text is None:
+            return
+        
+        min_level = LOG_LEVEL_FILTERS.get(self.log_level.get(), LEVEL_INFO)
+        entries = self.log_buffer.since(self.log_rendered_seq, min_level)[-LOG_VIEW_LINES:]
+        self.log_rendered_seq = self.log_buffer.last_seq
+        if not entries:
+            return
+        
+        at_bottom = self.log_text.yview()[1] >= 0.999
+        self.log_text.config(state='normal')
+        for _, ts, level, text in entries:
+            line = f"{time.strftime('%H:%M:%S', time.localtime(ts))} {text}\n"
+            self.log_text.insert(tk.END, line, level)
+        
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > LOG_VIEW_LINES:
+            self.log_text.delete('1.0', f"{line_count - LOG_VIEW_LINES + 1}.0")
+        self.log_text.config(state='disabled')
+        if at_bottom:
+            self.log_text.see(tk.END)
+    
+    def rerender_log(self):
+        """레벨 필터 변경 시 버퍼에 남은 줄로 다시 그리기"""
+        self.clear_log_view()
+        self.log_rendered_seq = 0
+        self.render_log()
+    
+    def clear_log_view(self):
+        self.log_text.config(state='normal')
+        self.log_text.delete('1.0', tk.END)
+        self.log_text.config(state='disabled')
+    
     # 🔧 패키지 관리 섹션 추가
     def create_package_management_section(self, parent):
         package_frame = tk.LabelFrame(parent, text="📦 패키지 관리", 
@@ -439,26 +522,17 @@ class GitHubAutoUploadMain:
         status_text = scrolledtext.ScrolledText(main_frame, height=20, font=("Consolas", 10))
         status_text.pack(fill='both', expand=True, pady=(0, 20))
         
-        required_packages = [
-            ('PyGithub', 'github'),
-            ('python-dotenv', 'dotenv'),
-            ('watchdog', 'watchdog'),
-            ('schedule', 'schedule'),
-            ('requests', 'requests'),
-            ('beautifulsoup4', 'bs4'),
-            ('psutil', 'psutil')
-        ]
+        packages = package_status(use_cache=False)
         
         status_text.insert(tk.END, "📦 필수 패키지 설치 상태\n")
         status_text.insert(tk.END, "=" * 40 + "\n\n")
         
         all_installed = True
-        for package_name, import_name in required_packages:
-            try:
-                module = importlib.import_module(import_name)
-                version = getattr(module, '__version__', 'Unknown')
+        for package_name, _ in REQUIRED_PACKAGES:
+            version = packages.get(package_name)
+            if version:
                 status_text.insert(tk.END, f"✅ {package_name:<20} 버전: {version}\n")
-            except ImportError:
+            else:
                 status_text.insert(tk.END, f"❌ {package_name:<20} 설치되지 않음\n")
                 all_installed = False
         
@@ -535,18 +609,68 @@ class GitHubAutoUploadMain:
             print(f"❌ 프로필 로드 실패: {e}")
             self.profile_info_label.config(text="프로필 로드 실패", fg="red")
     
+    def run_config_task(self, kind, work, on_done):
+        """설정 작업을 백그라운드에서 실행하고 결과는 root.after로 Tk 쓰레드에서 반영
+        
+        같은 종류의 요청이 연달아 들어오면 마지막 요청만 처리합니다.
+        """
+        generation = self.config_generations.get(kind, 0) + 1
+        self.config_generations[kind] = generation
+        
+        def finish(result, error):
+            if self.config_generations.get(kind) == generation:
+                on_done(result, error)
+        
+        def task():
+            if self.config_generations.get(kind) != generation:
+                return  # 더 최신 요청이 대기 중
+            try:
+                result, error = work(), None
+            except Exception as e:
+                result, error = None, e
+            self.root.after(0, finish, result, error)
+        
+        self.config_executor.submit(task)
+    
     def on_profile_change(self, event=None):
         selected_profile = self.current_profile.get()
         if not selected_profile:
             return
         
-        try:
-            print(f"🔄 프로필 전환: {selected_profile}")
+        print(f"🔄 프로필 전환: {selected_profile}")
+        
+        def switch_profile():
             success, message = self.env_generator.copy_profile_to_current_env(selected_profile)
+            profile_info = self.env_generator.get_profile_info(selected_profile) if success else None
+            return success, message, profile_info
+        
+        self.run_config_task('profile', switch_profile,
+                             lambda result, error: self.apply_profile_change(selected_profile, result, error))
+    
+    def reload_running_uploader(self, profile_name):
+        """실행 중인 업로더에 바뀐 프로필 반영 (재시작 없이)"""
+        if not self.is_upload_running:
+            return
+        if self.upload_engine:
+            threading.Thread(target=self.upload_engine.reload_config, args=(profile_name,),
+                             daemon=True).start()
+            return
+        
+        def send_reload():
+            control = self.get_uploader_control()
+            if control:
+                send_command(control, "reload", profile=profile_name)
+        
+        self.config_executor.submit(send_reload)
+    
+    def apply_profile_change(self, selected_profile, result, error):
+        try:
+            if error:
+                raise error
+            success, message, profile_info = result
             
             if success:
                 print(f"✅ 프로필 전환 성공: {message}")
-                profile_info = self.env_generator.get_profile_info(selected_profile)
                 if profile_info:
                     repo = profile_info.get('GITHUB_REPO', 'Unknown')
                     username = profile_info.get('GITHUB_USERNAME', 'Unknown')
@@ -555,6 +679,7 @@ class GitHubAutoUploadMain:
                         fg="darkblue"
                     )
                 self.update_status()
+                self.reload_running_uploader(selected_profile)
             else:
                 print(f"❌ 프로필 전환 실패: {message}")
                 messagebox.showerror("프로필 전환 실패", message)
@@ -588,6 +713,15 @@ class GitHubAutoUploadMain:
         self.upload_status_label = tk.Label(status_frame, text="🚀 업로드 상태: 중지됨", 
                                            font=("Arial", 10, "bold"), fg="red")
         self.upload_status_label.pack(anchor='w', pady=2)
+        
+        # 실시간 진행 상황 (업로더가 푸시)
+        self.progress_label = tk.Label(status_frame, text="📈 진행 상황: -", 
+                                      font=("Arial", 10), fg="gray")
+        self.progress_label.pack(anchor='w', pady=2)
+        
+        self.commit_label = tk.Label(status_frame, text="📝 마지막 커밋: -", 
+                                    font=("Arial", 10), fg="gray")
+        self.commit_label.pack(anchor='w', pady=2)
     
     def create_function_buttons(self, parent):
         button_frame = tk.Frame(parent)
@@ -627,6 +761,22 @@ class GitHubAutoUploadMain:
                                command=self.show_history)
         history_btn.pack(side='left', padx=20)
         
+        # 실행 방식 / 일시정지
+        engine_row = tk.Frame(button_frame)
+        engine_row.pack(pady=(0, 5))
+        
+        in_process_check = tk.Checkbutton(engine_row, text="GUI 안에서 실행 (별도 프로세스 없이)",
+                                          variable=self.run_in_process,
+                                          font=("Arial", 10))
+        in_process_check.pack(side='left', padx=5)
+        
+        self.pause_btn = tk.Button(engine_row, text="⏸️ 일시정지", 
+                                  width=10, height=1,
+                                  font=("Arial", 10),
+                                  state='disabled',
+                                  command=self.toggle_pause)
+        self.pause_btn.pack(side='left', padx=5)
+        
         refresh_btn = tk.Button(button_frame, text="🔄 상태 새로고침", 
                                width=20, height=1,
                                font=("Arial", 10),
@@ -653,22 +803,35 @@ class GitHubAutoUploadMain:
                 messagebox.showwarning("경고", "업로드가 이미 실행 중입니다!")
                 return
             
-            self.upload_process = subprocess.Popen([sys.executable, 'main_upload.py'])
-            
-            with open(self.upload_pid_file, 'w') as f:
-                f.write(str(self.upload_process.pid))
+            if self.run_in_process.get():
+                self.start_upload_engine()
+            else:
+                env = dict(os.environ)
+                env[PROGRESS_ADDR_ENV] = self.get_progress_subscriber().address
+                env['UPLOAD_PROFILE'] = self.current_profile.get() or 'default'
+                env['PYTHONUNBUFFERED'] = '1'
+                env['PYTHONIOENCODING'] = 'utf-8'
+                self.upload_process = subprocess.Popen([sys.executable, 'main_upload.py'], env=env,
+                                                       stdout=subprocess.PIPE,
+                                                       stderr=subprocess.STDOUT)
+                
+                # 업로더 출력을 로그 버퍼로 (스피너의 '\r'을 구분하려고 줄바꿈 변환 없이 읽음)
+                output = io.TextIOWrapper(self.upload_process.stdout, encoding='utf-8',
+                                          errors='replace', newline='')
+                threading.Thread(target=pump_stream, args=(output, self.log_buffer), daemon=True).start()
+                self.watch_upload_process(self.upload_process)
+                print(f"✅ 업로드 프로세스 시작됨 (PID: {self.upload_process.pid})")
             
             self.is_upload_running = True
             self.update_upload_button()
             
             current_profile = self.current_profile.get()
             if current_profile:
-                message_text = f"GitHub 자동 업로드가 시작되었습니다!\n\n현재 프로필: {current_profile}\n콘솔 창에서 업로드 상태를 확인할 수 있습니다."
+                message_text = f"GitHub 자동 업로드가 시작되었습니다!\n\n현재 프로필: {current_profile}\n실행 로그에서 업로드 상태를 확인할 수 있습니다."
             else:
-                message_text = "GitHub 자동 업로드가 시작되었습니다!\n\n콘솔 창에서 업로드 상태를 확인할 수 있습니다."
+                message_text = "GitHub 자동 업로드가 시작되었습니다!\n\n실행 로그에서 업로드 상태를 확인할 수 있습니다."
             
             messagebox.showinfo("시작", message_text)
-            print(f"✅ 업로드 프로세스 시작됨 (PID: {self.upload_process.pid})")
             
         except FileNotFoundError:
             messagebox.showerror("오류", "main_upload.py 파일을 찾을 수 없습니다!")
@@ -677,48 +840,162 @@ class GitHubAutoUploadMain:
             self.is_upload_running = False
             self.update_upload_button()
     
-    def stop_upload(self):
-        try:
-            if self.upload_process and self.upload_process.poll() is None:
-                try:
-                    parent = psutil.Process(self.upload_process.pid)
-                    children = parent.children(recursive=True)
-                    
-                    for child in children:
-                        try:
-                            child.terminate()
-                        except psutil.NoSuchProcess:
-                            pass
-                    
-                    parent.terminate()
+    # 🔧 GUI 내장 업로드 엔진
+    def start_upload_engine(self):
+        """업로드 엔진을 GUI 프로세스의 작업 쓰레드에서 시작"""
+        from main_upload import UploadEngine
+        
+        def on_state_change(state):
+            self.root.after(0, self.on_engine_state_change, state, engine)
+        
+        engine = self.upload_engine = UploadEngine(profile_name=self.current_profile.get() or None,
+                                                   on_state_change=on_state_change)
+        self.upload_engine.progress.add_listener(self.on_progress_event_threadsafe)
+        self.upload_engine.start()
+        print("✅ 업로드 엔진 시작됨 (GUI 내장)")
+    
+    def on_engine_state_change(self, state, engine=None):
+        """엔진 상태 변경 반영 (Tk 쓰레드)
+
+        제어 소켓/CLI로 중지된 경우에도 버튼 상태를 맞춥니다. GUI에서 중지한 엔진은 이미 정리됨.
+        """
+        if engine is not None and engine is not self.upload_engine:
+            return
+        if state == "error":
+            from main_upload import START_ERROR_LOCKED
+            self.upload_engine = None
+            self.is_upload_running = False
+            if engine is not None and engine.start_error == START_ERROR_LOCKED:
+                messagebox.showerror("오류", f"'{engine.profile_name}' 프로필 업로더가 이미 실행 중입니다.\n"
+                                           f"실행 중인 업로더를 먼저 중지해주세요.")
+            else:
+                messagebox.showerror("오류", "업로드 엔진을 시작할 수 없습니다. 설정을 확인해주세요.")
+        elif state == "stopped":
+            self.upload_engine = None
+            self.is_upload_running = False
+            print("ℹ️  업로드 엔진이 중지되어 버튼 상태를 업데이트했습니다")
+        self.update_upload_button()
+    
+    # 🔧 진행 상황 표시
+    def get_progress_subscriber(self):
+        """업로드 프로세스가 진행 상황을 보낼 로컬 소켓 (처음 필요할 때 생성)"""
+        if self.progress_subscriber is None:
+            self.progress_subscriber = ProgressSubscriber(self.on_progress_event_threadsafe)
+        return self.progress_subscriber
+    
+    def on_progress_event_threadsafe(self, event):
+        """업로더 쓰레드에서 받은 이벤트를 Tk 쓰레드로 전달"""
+        self.root.after(0, self.on_progress_event, event)
+    
+    def on_progress_event(self, event):
+        """진행 이벤트를 화면에 반영"""
+        if event.get('type') == 'state' and not self.upload_engine:
+            self.remote_state = event.get('state')
+            self.update_upload_button()
+        
+        rate = event.get('bytes_per_sec', 0)
+        if rate >= 1024 * 1024:
+            rate_text = f"{rate / (1024 * 1024):.1f} MB/s"
+        elif rate >= 1024:
+            rate_text = f"{rate / 1024:.1f} KB/s"
+        else:
+            rate_text = f"{rate:.0f} B/s"
+        
+        errors = event.get('errors', 0)
+        self.progress_label.config(
+            text=f"📈 대기 {event.get('queue_depth', 0)} · 처리 중 {event.get('in_flight', 0)} · "
+                 f"{rate_text} · 오류 {errors}",
+            fg="red" if errors else "black"
+        )
+        
+        if event.get('type') == 'task_started':
+            self.progress_label.config(text=self.progress_label.cget('text') + f" · ⏳ {event.get('path')}")
+        
+        last_commit = event.get('last_commit')
+        if last_commit:
+            commit_time = time.strftime('%H:%M:%S', time.localtime(last_commit.get('time', 0)))
+            short_sha = (last_commit.get('sha') or '')[:7]
+            self.commit_label.config(
+                text=f"📝 마지막 커밋: {last_commit.get('message')} ({short_sha}, {commit_time})",
+                fg="black"
+            )
+    
+    def toggle_pause(self):
+        if self.upload_engine:
+            if self.upload_engine.state == "paused":
+                self.upload_engine.resume()
+            else:
+                self.upload_engine.pause()
+            return
+        
+        # 별도 프로세스 업로더는 제어 소켓으로 요청
+        control = self.get_uploader_control()
+        if control:
+            command = "resume" if self.remote_state == "paused" else "pause"
+            if not send_command(control, command):
+                messagebox.showerror("오류", "업로드 프로세스에 명령을 보낼 수 없습니다.")
+    
+    def stop_upload(self, on_done=None):
+        """업로드 중지 (쓰레드/프로세스 종료 대기는 백그라운드에서, 결과는 root.after로 반영)
+
+        on_done: 중지가 끝난 뒤 Tk 쓰레드에서 호출 (지정하면 완료 안내창 없음)
+        """
+        if self.is_stopping:
+            return
+        self.is_stopping = True
+        engine, self.upload_engine = self.upload_engine, None
+        process = self.upload_process
+        control = None if engine else self.get_uploader_control()
+        self.upload_btn.config(state='disabled')
+        self.pause_btn.config(state='disabled')
+        self.upload_status_label.config(text="🚀 업로드 상태: 중지 중...", fg="orange")
+        
+        def stop():
+            error = None
+            try:
+                if engine:
+                    engine.stop()
+                else:
+                    if control:
+                        send_command(control, "stop")
                     
-                    gone, still_alive = psutil.wait_procs([parent] + children, timeout=3)
-                    for p in still_alive:
+                    if process:
                         try:
-                            p.kill()
-                        except psutil.NoSuchProcess:
-                            pass
-                    
-                    print(f"✅ 업로드 프로세스 종료됨 (PID: {self.upload_process.pid})")
-                    
-                except psutil.NoSuchProcess:
-                    print("ℹ️  프로세스가 이미 종료되었습니다")
-                except Exception as e:
-                    print(f"⚠️  프로세스 종료 중 오류: {e}")
-                    self.upload_process.terminate()
-            
-            if os.path.exists(self.upload_pid_file):
-                os.remove(self.upload_pid_file)
-            
-            self.upload_process = None
-            self.is_upload_running = False
+                            process.wait(timeout=5)
+                        except subprocess.TimeoutExpired:
+                            # 제어 소켓 응답이 없으면 강제 종료
+                            process.terminate()
+                            try:
+                                process.wait(timeout=3)
+                            except subprocess.TimeoutExpired:
+                                process.kill()
+                        print(f"✅ 업로드 프로세스 종료됨 (PID: {process.pid})")
+            except Exception as e:
+                error = e
+            self.root.after(0, self.finish_stop_upload, error, on_done)
+        
+        threading.Thread(target=stop, daemon=True).start()
+    
+    def finish_stop_upload(self, error, on_done=None):
+        """중지 결과 반영 (Tk 쓰레드)"""
+        self.is_stopping = False
+        self.upload_btn.config(state='normal')
+        if on_done:
+            on_done()
+            return
+        if error:
+            messagebox.showerror("오류", f"업로드 프로그램을 중지할 수 없습니다: {error}")
+            print(f"❌ 업로드 중지 실패: {error}")
             self.update_upload_button()
-            
-            messagebox.showinfo("중지", "GitHub 자동 업로드가 중지되었습니다!")
-            
-        except Exception as e:
-            messagebox.showerror("오류", f"업로드 프로그램을 중지할 수 없습니다: {e}")
-            print(f"❌ 업로드 중지 실패: {e}")
+            return
+        
+        self.upload_process = None
+        self.uploader_control = None
+        self.is_upload_running = False
+        self.remote_state = None
+        self.update_upload_button()
+        
+        messagebox.showinfo("중지", "GitHub 자동 업로드가 중지되었습니다!")
     
     def update_upload_button(self):
         if self.is_upload_running:
@@ -727,10 +1004,17 @@ class GitHubAutoUploadMain:
                 bg="red",
                 fg="white"
             )
-            self.upload_status_label.config(
-                text="🚀 업로드 상태: 실행 중",
-                fg="green"
-            )
+            paused = self.upload_engine.state == "paused" if self.upload_engine else self.remote_state == "paused"
+            if paused:
+                self.upload_status_label.config(
+                    text="🚀 업로드 상태: 일시정지",
+                    fg="orange"
+                )
+            else:
+                self.upload_status_label.config(
+                    text="🚀 업로드 상태: 실행 중",
+                    fg="green"
+                )
         else:
             self.upload_btn.config(
                 text="🚀\n업로드\n시작",
@@ -741,27 +1025,42 @@ class GitHubAutoUploadMain:
                 text="🚀 업로드 상태: 중지됨",
                 fg="red"
             )
+        
+        # 일시정지 버튼 (내장 엔진 또는 제어 소켓이 있는 업로더)
+        if self.is_upload_running:
+            self.pause_btn.config(state='normal', text="▶️ 계속" if paused else "⏸️ 일시정지")
+        else:
+            self.pause_btn.config(state='disabled', text="⏸️ 일시정지")
+    
+    # 🔧 실행 중인 업로더 찾기 (프로필별 잠금 파일, 프로세스 목록 조회 없음)
+    def find_running_uploader(self):
+        for profile in (self.current_profile.get(), 'default'):
+            if profile:
+                instance = find_instance(profile)
+                if instance:
+                    return instance
+        return None
+    
+    def get_uploader_control(self):
+        """별도 프로세스 업로더의 제어 소켓 주소 (처음 한 번만 잠금 파일에서 찾음)"""
+        if not self.uploader_control:
+            instance = self.find_running_uploader()
+            if instance:
+                self.uploader_control = instance.get('control')
+        return self.uploader_control
     
     def check_upload_process(self):
         try:
-            if os.path.exists(self.upload_pid_file):
-                with open(self.upload_pid_file, 'r') as f:
-                    pid = int(f.read().strip())
+            instance = self.find_running_uploader()
+            if instance:
+                self.is_upload_running = True
+                print(f"ℹ️  기존 업로드 프로세스 발견 (프로필: {instance.get('profile')}, PID: {instance.get('pid')})")
                 
-                if psutil.pid_exists(pid):
-                    try:
-                        process = psutil.Process(pid)
-                        if 'python' in process.name().lower():
-                            self.is_upload_running = True
-                            self.upload_process = subprocess.Popen([], shell=False)
-                            self.upload_process.pid = pid
-                            print(f"ℹ️  기존 업로드 프로세스 발견 (PID: {pid})")
-                        else:
-                            os.remove(self.upload_pid_file)
-                    except psutil.NoSuchProcess:
-                        os.remove(self.upload_pid_file)
-                else:
-                    os.remove(self.upload_pid_file)
+                # 실행 중인 업로더에 연결해서 진행 상황 구독 (연결이 끊기면 종료로 판단)
+                control = self.uploader_control = instance.get('control')
+                if control:
+                    subscribe(control, self.on_progress_event_threadsafe,
+                              on_close=lambda: self.root.after(0, self.on_upload_process_exit))
             
             self.update_upload_button()
             
@@ -770,42 +1069,46 @@ class GitHubAutoUploadMain:
             self.is_upload_running = False
             self.update_upload_button()
     
-    def start_process_monitor(self):
-        def monitor():
-            while True:
-                try:
-                    if self.is_upload_running and self.upload_process:
-                        if self.upload_process.poll() is not None:
-                            self.is_upload_running = False
-                            self.upload_process = None
-                            
-                            if os.path.exists(self.upload_pid_file):
-                                os.remove(self.upload_pid_file)
-                            
-                            self.root.after(0, self.update_upload_button)
-                            print("ℹ️  업로드 프로세스가 종료되어 버튼 상태를 업데이트했습니다")
-                    
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    print(f"⚠️  프로세스 모니터링 오류: {e}")
-                    time.sleep(5)
+    def watch_upload_process(self, process):
+        """업로드 프로세스 종료를 기다렸다가 버튼 상태 갱신 (주기적 확인 없음)"""
+        def wait_for_exit():
+            process.wait()
+            self.root.after(0, self.on_upload_process_exit, process)
         
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
+        threading.Thread(target=wait_for_exit, daemon=True).start()
+    
+    def on_upload_process_exit(self, process=None):
+        if process is not None and process is not self.upload_process:
+            return  # 이미 다른 프로세스로 바뀐 경우
+        if self.upload_engine:
+            return
+        if self.is_upload_running:
+            print("ℹ️  업로드 프로세스가 종료되어 버튼 상태를 업데이트했습니다")
+        self.is_upload_running = False
+        self.upload_process = None
+        self.uploader_control = None
+        self.remote_state = None
+        self.update_upload_button()
     
     def update_status(self):
+        print("🔄 상태 업데이트 중...")
+        self.run_config_task('status', lambda: config_cache.read_env('.env'), self.apply_status)
+    
+    def apply_status(self, config, error):
         try:
-            print("🔄 상태 업데이트 중...")
+            if error:
+                raise error
             
-            if os.path.exists('.env'):
-                load_dotenv(override=True)
+            if config is not None:
+                def get(key, default=None):
+                    value = config.get(key)
+                    return value if value is not None else os.getenv(key, default)
                 
-                token = os.getenv('GITHUB_TOKEN')
-                username = os.getenv('GITHUB_USERNAME')
-                repo = os.getenv('GITHUB_REPO')
-                folder = os.getenv('WATCH_FOLDER')
-                mode = os.getenv('UPLOAD_MODE', 'realtime')
+                token = get('GITHUB_TOKEN')
+                username = get('GITHUB_USERNAME')
+                repo = get('GITHUB_REPO')
+                folder = get('WATCH_FOLDER')
+                mode = get('UPLOAD_MODE', 'realtime')
                 
                 if all([token, username, repo, folder]):
                     current_profile = self.current_profile.get()
@@ -876,7 +1179,12 @@ class GitHubAutoUploadMain:
             messagebox.showerror("오류", f"환경설정 창을 열 수 없습니다: {e}")
     
     def show_history(self):
-        messagebox.showinfo("개발 중", "업로드 기록 기능은 개발 중입니다!")
+        try:
+            from history_gui import UploadHistoryWindow
+            UploadHistoryWindow(self.root, self.env_generator.get_all_profiles(),
+                                self.current_profile.get() or None)
+        except Exception as e:
+            messagebox.showerror("오류", f"업로드 기록을 열 수 없습니다: {e}")
     
     def on_exit(self):
         if self.is_upload_running:
@@ -885,10 +1193,16 @@ class GitHubAutoUploadMain:
                 "업로드가 실행 중입니다.\n업로드를 중지하고 종료하시겠습니까?"
             )
             if result:
-                self.stop_upload()
-                self.root.quit()
+                self.stop_upload(on_done=self.quit_app)
         else:
-            self.root.quit()
+            self.quit_app()
+
+    def quit_app(self):
+        """종료가 확정된 뒤 백그라운드 작업 정리 후 창 닫기"""
+        self.config_executor.shutdown(wait=False)
+        if self.progress_subscriber:
+            self.progress_subscriber.close()
+        self.root.quit()
 
 if __name__ == "__main__":
     print("🚀 GitHub 자동 업로드 메인 GUI 시작...")
@@ -1,345 +1,1392 @@
 # main_upload.py - 실시간 파일 삭제 감지 포함 완전 버전
 import time
-import requests
+PROCESS_STARTED_AT = time.perf_counter()  # 감시 시작까지 걸린 시간 측정용
+
+# requests / watchdog / schedule / dotenv 는 실제로 필요할 때 함수 안에서 import
 import base64
 import os
 import json
-import schedule
 import threading
 import glob
-from dotenv import load_dotenv
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-
-# 전역 변수들
-GITHUB_TOKEN = None
-GITHUB_USERNAME = None
-REPO_NAME = None
-WATCH_FOLDER_PATH = None
-UPLOAD_MODE = None
-SCHEDULE_HOUR = None
-SCHEDULE_MINUTE = None
-REPEAT_OPTION = None
-BRANCH = None
-FILE_EXTENSIONS = None
+import config_cache
+import metrics
+import tracing
+import upload_log
+from file_hasher import hash_files
+from github_client import (CircuitBreaker, GitHubClient, throttle_reason, retry_after_seconds, WRITE_METHODS,
+                           WRITE_LIMIT_REASONS, GITHUB_API_URL, DEFAULT_API_URL, CONNECT_TIMEOUT,
+                           UPLOAD_READ_TIMEOUT)
+from instance_registry import InstanceLock, ControlServer
+from sync_manifest import SyncManifest, target_key, MODE_FILE
+from sync_planner import build_plan
+from upload_history import HistoryWriter, STATUS_SUCCESS, STATUS_FAILED
+from progress_channel import ProgressPublisher, ThroughputMeter, PROGRESS_ADDR_ENV
+from watch_hub import WatchHub
+from upload_throttle import TokenBucket, GLOBAL_BUCKET, configure_global, parse_rate, parse_rate_schedule, request_body
+from upload_scheduler import DeadlineScheduler, parse_schedule, legacy_cron, spread_offset
+from upload_queue import (UploadQueue, UploadBatch, RateBudget, classify_upload, SMALL_FILE_LIMIT, WINDOW_MAX,
+                          PRIORITY_INTERACTIVE, PRIORITY_DELETE)
 
-def check_env_config():
-    """환경 설정 확인"""
-    if not GITHUB_TOKEN:
-        print("❌ .env 파일에 GITHUB_TOKEN이 설정되지 않았습니다!")
-        print("💡 setup_gui.py를 먼저 실행해서 설정을 완료해주세요.")
-        return False
-    
-    required_vars = [GITHUB_USERNAME, REPO_NAME, WATCH_FOLDER_PATH]
-    if not all(required_vars):
-        print("❌ .env 파일의 설정이 불완전합니다!")
-        print("💡 setup_gui.py를 다시 실행해서 설정을 완료해주세요.")
-        return False
-    
-    if not os.path.exists(WATCH_FOLDER_PATH):
-        print(f"❌ 감시할 폴더가 존재하지 않습니다: {WATCH_FOLDER_PATH}")
-        return False
-    
-    return True
+log = upload_log.get_logger("engine")
 
-def upload_file_to_github(local_file_path):
-    """GitHub에 파일 업로드 (이모티콘 커밋 메시지 포함)"""
-    print(" " * 50, end='\r')
-    print(f"\n📄 감지된 파일: {os.path.basename(local_file_path)}")
-    
-    repo_file_path = os.path.basename(local_file_path)
-    url = f"https://api.github.com/repos/{GITHUB_USERNAME}/{REPO_NAME}/contents/{repo_file_path}"
-    headers = {"Authorization": f"token {GITHUB_TOKEN}"}
-    
-    try:
-        with open(local_file_path, "rb") as file:
-            content_encoded = base64.b64encode(file.read()).decode('utf-8')
-    except (FileNotFoundError, PermissionError) as e:
-        print(f"  ❌ 파일 읽기 실패: {e}")
-        return False
-    
-    # 기존 파일 확인 및 커밋 메시지 결정
-    sha = None
-    is_update = False
-    try:
-        response_get = requests.get(url, headers=headers)
-        if response_get.status_code == 200:
-            sha = response_get.json().get('sha')
-            is_update = True
-    except requests.exceptions.RequestException:
-        pass
-    
-    # 이모티콘 커밋 메시지 설정
-    if is_update:
-        commit_message = f"🔄 Update {repo_file_path}"
-        action_emoji = "🔄"
-        action_text = "업데이트"
-    else:
-        commit_message = f"➕ Add {repo_file_path}"
-        action_emoji = "➕"
-        action_text = "추가"
-    
-    # 업로드 데이터 준비
-    data = {
-        "message": commit_message,
-        "content": content_encoded
-    }
-    if sha:
-        data["sha"] = sha
-    
-    print(f"  🚀 {action_text} 업로드를 시도합니다...")
-    try:
-        response_put = requests.put(url, headers=headers, data=json.dumps(data))
-        if response_put.status_code in [200, 201]:
-            print(f"  ✅ {action_emoji} {repo_file_path} {action_text} 성공!")
-            return True
-        else:
-            print(f"  ❌ {repo_file_path} 업로드 실패! (상태 코드: {response_put.status_code})")
-            error_msg = response_put.json().get('message', 'Unknown error')
-            print(f"     오류 내용: {error_msg}")
+DEFAULT_FILE_EXTENSIONS = 'py,txt,md,json,js,html,css'
+
+WRITE_SETTLE_SECONDS = 1  # 파일 쓰기 완료 대기
+WORKER_THREADS = WINDOW_MAX  # 큐 처리 쓰레드 수 (실제로 동시에 처리하는 수는 창 크기)
+MAX_THROTTLE_RETRIES = 3     # 요청 제한으로 실패한 작업을 창을 줄인 뒤 다시 시도하는 횟수
+
+# 빠른 시작: 감시 시작까지의 목표 시간 (초)
+STARTUP_BUDGET_SECONDS = 1.0
+
+# 설정 파일 변경 후 다시 읽기까지 대기 (저장 중 이벤트 여러 개를 한 번에 처리)
+CONFIG_RELOAD_DELAY = 0.5
+
+# Windows는 시간 제한 없이 기다리는 동안 Ctrl+C를 받지 못하므로 이 간격으로 나눠서 대기
+# (그만큼 주기적으로 깨어나며, 깨어난 횟수는 wakeups_per_minute에 그대로 집계)
+INTERRUPT_CHECK_SECONDS = 1.0 if os.name == 'nt' else None
+
+# 실행 중 바꿀 수 있는 설정 값
+CONFIG_FIELDS = ('github_token', 'github_username', 'repo_name', 'watch_folder_path', 'upload_mode',
+                 'schedule_hour', 'schedule_minute', 'repeat_option', 'schedule_cron', 'branch', 'file_extensions',
+                 'api_url', 'upload_rate_limit', 'upload_rate_schedule', 'rate_bypass_interactive')
+
+# 엔진 상태
+STATE_STOPPED = "stopped"
+STATE_STARTING = "starting"
+STATE_RUNNING = "running"
+STATE_PAUSED = "paused"
+STATE_ERROR = "error"
+
+# 시작 실패 원인 (CLI 종료 코드 구분용)
+START_ERROR_CONFIG = "config"
+START_ERROR_LOCKED = "already_running"
+
+
+def wait_interruptible(event, source="main"):
+    """event가 설정될 때까지 대기 (Ctrl+C는 그대로 전달)
+
+    POSIX에서는 event가 설정될 때만 깨어나고, Windows에서는 Ctrl+C 확인을 위해
+    INTERRUPT_CHECK_SECONDS마다 깨어납니다. 어느 쪽이든 깨어날 때마다 집계합니다.
+    """
+    while not event.wait(INTERRUPT_CHECK_SECONDS):
+        metrics.wakeup("interrupt_check")
+    metrics.wakeup(source)
+
+
+class UploadEngine:
+    """GUI/CLI에 내장 가능한 업로드 엔진 (start / stop / pause / status)
+
+    설정 값과 업로드 큐, 감시 옵저버, 스케줄러를 엔진 인스턴스가 가지고 있어서
+    별도 프로세스 없이 GUI 프로세스 안의 작업 쓰레드에서 실행할 수 있습니다.
+    """
+    def __init__(self, env_path='.env', profile_name=None, on_state_change=None, shared=None, overrides=None):
+        self.env_path = env_path
+        self.profile_name = profile_name
+        self.on_state_change = on_state_change
+        self.shared = shared  # 데몬 실행 시 공유 자원 (감시 허브, HTTP 풀, 토큰별 호출 예산, 기록)
+        self.overrides = dict(overrides or {})  # 설정 덮어쓰기 {속성: 값} (명령줄 옵션, .env/환경변수보다 우선)
+
+        # 설정 값 (load_config()에서 채움)
+        self.github_token = None
+        self.github_username = None
+        self.repo_name = None
+        self.watch_folder_path = None
+        self.upload_mode = None
+        self.schedule_hour = None
+        self.schedule_minute = None
+        self.repeat_option = None
+        self.schedule_cron = None
+        self.branch = None
+        self.file_extensions = None
+        self.api_url = None
+        self.trace_file = None
+        self.metrics_port = None
+        self.log_level = None
+        self.log_format = None
+        self.log_file = None
+        self.upload_rate_limit = None
+        self.upload_rate_schedule = None
+        self.rate_bypass_interactive = True
+
+        # 실행 상태
+        self.state = STATE_STOPPED
+        self.queue = UploadQueue()  # 실시간 수정 > 삭제 > 작은 파일 > 큰 파일
+        self.watch_hub = None
+        self.watch = None            # 감시 폴더 등록 키 (설정이 바뀌면 교체)
+        self.config_watch = None
+        self.rate_budget = RateBudget(profile_name or "")
+        self.bandwidth = TokenBucket(profile_name or "")  # 프로필 업로드 속도 상한 (전체 상한은 GLOBAL_BUCKET)
+        # 연결 실패가 이어지면 요청 차단 + 큐 처리 대기 (데몬이면 모든 프로필이 공유)
+        self.breaker = shared.breaker if shared else CircuitBreaker()
+        self.wait_offline = True     # False면 차단 중인 작업을 기다리지 않고 바로 실패 (1회 동기화용)
+        # 예약 실행 (데몬이면 모든 프로필이 스케줄러 쓰레드 1개를 공유)
+        self.scheduler = shared.scheduler if shared else DeadlineScheduler()
+        self.schedule_job = None
+        self._stopped = threading.Event()  # 실행 중/일시정지가 아니면 설정
+        self._stopped.set()
+        self._reload_timer = None
+        self._reload_lock = threading.Lock()
+        self.last_startup_seconds = None
+        self._session = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+        # 진행 상황 (GUI로 푸시)
+        self.progress = ProgressPublisher()
+        self.throughput = ThroughputMeter()
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._local = threading.local()  # 작업 쓰레드별 상태 (요청 제한 응답을 받았는지)
+        self.error_count = 0
+        self.last_commit = None
+
+        # GitHub 저장소 파일 SHA 인덱스 {파일명: sha} (저장소가 바뀌지 않으면 계속 사용)
+        self.remote_index = None
+
+        # 동기화 상태 기록 (.sync_state/, 변경 없는 파일은 다시 해시하지 않음)
+        self.manifest = None
+        self.start_error = None
+
+        # 업로드 기록 (SQLite, 일괄 쓰기)
+        self.history = None
+
+        # 프로필별 단일 실행 잠금 + 제어 소켓
+        self.instance_lock = None
+        self.control = None
+
+    # 설정 관련 메서드들
+    def load_config(self):
+        """.env 파일에서 설정 값 로드
+
+        기존 load_dotenv()와 같이 프로세스 환경변수가 있으면 .env 값보다 우선합니다.
+        환경변수로 지정한 값은 실행 중에 .env를 고쳐도 바뀌지 않습니다.
+        데몬에서는 모든 프로필이 같은 환경변수를 보므로 프로필 .env 값이 우선합니다 (파일에 없을 때만 환경변수).
+        """
+        values = config_cache.read_env(self.env_path) or {}
+
+        def get(key, default=None):
+            sources = (values.get, os.getenv) if self.shared else (os.getenv, values.get)
+            for source in sources:
+                value = source(key)
+                if value is not None:
+                    return value
+            return default
+
+        self.github_token = get('GITHUB_TOKEN')
+        self.github_username = get('GITHUB_USERNAME')
+        self.repo_name = get('GITHUB_REPO')
+        self.watch_folder_path = get('WATCH_FOLDER')
+        self.upload_mode = get('UPLOAD_MODE', 'realtime')
+        self.schedule_hour = int(get('SCHEDULE_HOUR', 14))
+        self.schedule_minute = int(get('SCHEDULE_MINUTE', 30))
+        self.repeat_option = get('REPEAT_OPTION', 'daily')
+        self.schedule_cron = get('SCHEDULE_CRON')  # 지정하면 시/분/반복 대신 사용 (upload_scheduler.py)
+        self.branch = get('BRANCH', 'main')
+        self.file_extensions = get('FILE_EXTENSIONS', DEFAULT_FILE_EXTENSIONS)
+        self.api_url = get('GITHUB_API_URL', GITHUB_API_URL).rstrip('/')
+        self.trace_file = get('TRACE_FILE')  # 지정하면 단계별 소요 시간 기록 (tracing.py)
+        self.metrics_port = get('METRICS_PORT')  # 지정하면 localhost 지표 엔드포인트 (metrics.py)
+        self.log_level = get('LOG_LEVEL')    # 로그 설정 (upload_log.py)
+        self.log_format = get('LOG_FORMAT')
+        self.log_file = get('LOG_FILE')
+        self.upload_rate_limit = get('UPLOAD_RATE_LIMIT')  # 업로드 속도 상한 (upload_throttle.py)
+        self.upload_rate_schedule = get('UPLOAD_RATE_SCHEDULE')
+        self.rate_bypass_interactive = get('UPLOAD_RATE_BYPASS_INTERACTIVE', 'true').strip().lower() not in (
+            '0', 'false', 'no', 'off')
+        if not self.profile_name:
+            self.profile_name = get('PROFILE_NAME') or get('UPLOAD_PROFILE', 'default')
+        for field, value in self.overrides.items():
+            setattr(self, field, value)
+
+    def config_snapshot(self):
+        """현재 설정 값 (변경 비교용)"""
+        return {field: getattr(self, field) for field in CONFIG_FIELDS}
+
+    def restore_config(self, snapshot):
+        for field, value in snapshot.items():
+            setattr(self, field, value)
+
+    def check_env_config(self):
+        """환경 설정 확인"""
+        if not self.github_token:
+            log.error("❌ .env 파일에 GITHUB_TOKEN이 설정되지 않았습니다!")
+            log.info("💡 setup_gui.py를 먼저 실행해서 설정을 완료해주세요.")
             return False
-    except requests.exceptions.RequestException as e:
-        print(f"  ❌ {repo_file_path} 네트워크 오류: {e}")
-        return False
 
-def get_github_files():
-    """GitHub 저장소의 파일 목록 가져오기"""
-    try:
-        url = f"https://api.github.com/repos/{GITHUB_USERNAME}/{REPO_NAME}/contents"
-        headers = {"Authorization": f"token {GITHUB_TOKEN}"}
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            files_data = response.json()
-            # 파일만 필터링 (폴더 제외)
-            github_files = {}
-            for item in files_data:
-                if item['type'] == 'file':
-                    github_files[item['name']] = item['sha']
-            return github_files
-        else:
-            print(f"⚠️ GitHub 파일 목록 가져오기 실패: {response.status_code}")
-            return {}
-    except Exception as e:
-        print(f"⚠️ GitHub 파일 목록 가져오기 오류: {e}")
-        return {}
+        required_vars = [self.github_username, self.repo_name, self.watch_folder_path]
+        if not all(required_vars):
+            log.error("❌ .env 파일의 설정이 불완전합니다!")
+            log.info("💡 setup_gui.py를 다시 실행해서 설정을 완료해주세요.")
+            return False
 
-def get_local_files():
-    """로컬 폴더의 파일 목록 가져오기"""
-    try:
-        # 환경변수에서 파일 형식 읽어오기
-        file_extensions_str = os.getenv('FILE_EXTENSIONS', 'py,txt,md,json,js,html,css')
-        file_extensions_list = [ext.strip() for ext in file_extensions_str.split(',')]
-        file_patterns = [f'*.{ext}' for ext in file_extensions_list]
-        
-        local_files = set()
-        for pattern in file_patterns:
-            files = glob.glob(os.path.join(WATCH_FOLDER_PATH, pattern))
-            for file_path in files:
-                if os.path.isfile(file_path):
-                    local_files.add(os.path.basename(file_path))
-        
-        return local_files
-    except Exception as e:
-        print(f"⚠️ 로컬 파일 목록 가져오기 오류: {e}")
-        return set()
+        if not os.path.exists(self.watch_folder_path):
+            log.error(f"❌ 감시할 폴더가 존재하지 않습니다: {self.watch_folder_path}")
+            return False
 
-def delete_file_from_github(filename, sha):
-    """GitHub에서 파일 삭제"""
-    try:
-        url = f"https://api.github.com/repos/{GITHUB_USERNAME}/{REPO_NAME}/contents/{filename}"
-        headers = {"Authorization": f"token {GITHUB_TOKEN}"}
-        
-        # 삭제 데이터 준비
+        return True
+
+    def target(self):
+        """현재 업로드 대상 저장소 식별자"""
+        target = target_key(self.github_username, self.repo_name, self.branch)
+        if self.api_url != DEFAULT_API_URL:
+            target = f"{self.api_url} {target}"  # 다른 API 서버(로컬 테스트 서버 등)의 기록과 섞이지 않게
+        return target
+
+    def get_extensions(self):
+        """지원 파일 형식 목록"""
+        return [ext.strip() for ext in self.file_extensions.split(',')]
+
+    def find_watch_files(self):
+        """감시 폴더에서 지원 형식의 파일 경로 목록 가져오기"""
+        files = []
+        for ext in self.get_extensions():
+            files.extend(glob.glob(os.path.join(self.watch_folder_path, f'*.{ext}')))
+        return files
+
+    # GitHub API 관련 메서드들
+    @property
+    def http(self):
+        """연결을 재사용하는 GitHub 클라이언트 (타임아웃 + 서킷 브레이커, 세션은 처음 사용할 때 생성)"""
+        if self.shared:
+            return GitHubClient(self.shared.session_for(self.github_token), self.breaker,
+                                observer=self.observe_api_call)
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers["Authorization"] = f"token {self.github_token}"
+        return GitHubClient(self._session, self.breaker, observer=self.observe_api_call)
+
+    def budget(self):
+        """같은 토큰을 쓰는 작업들이 나눠 쓰는 호출 예산 (동시 요청 창)"""
+        return self.shared.budget_for(self.github_token, self.profile_name) if self.shared else self.rate_budget
+
+    def observe_api_call(self, method, response, seconds):
+        """API 호출 지표 기록 (응답 헤더의 남은 호출 수 포함) + 동시 요청 창 조절"""
+        status = str(response.status_code) if response is not None else "error"
+        metrics.API_CALLS.inc(profile=self.profile_name, method=method, status=status)
+        metrics.API_SECONDS.observe(seconds, profile=self.profile_name)
+        remaining = response.headers.get("X-RateLimit-Remaining") if response is not None else None
+        if remaining is not None and remaining.isdigit():
+            metrics.RATE_REMAINING.set(int(remaining), profile=self.profile_name)
+        # 속도 상한 때문에 본문을 천천히 보낸 시간은 응답 지연으로 보지 않음
+        body = getattr(self._local, "upload_body", None)
+        if body is not None:
+            seconds -= getattr(body, "waited", 0.0)
+            self._local.upload_body = None
+        if response is None:
+            return
+        reason = throttle_reason(method, response)
+        if reason:
+            metrics.THROTTLED.inc(profile=self.profile_name, status=str(response.status_code))
+            self.budget().record_throttle(reason, retry_after_seconds(response),
+                                          limit_writes=reason in WRITE_LIMIT_REASONS)
+            self._local.throttled = True
+        elif method in WRITE_METHODS and response.status_code < 300:
+            self.budget().record_success(seconds)
+
+    def setup_bandwidth(self):
+        """업로드 속도 상한 설정 (프로필 + 전체) → 성공 여부 (잘못된 설정은 제한 없이 진행)"""
+        configure_global()
+        self.bandwidth.name = self.profile_name or ""
+        try:
+            self.bandwidth.configure(parse_rate(self.upload_rate_limit), parse_rate_schedule(self.upload_rate_schedule))
+        except ValueError as e:
+            log.error(f"❌ 업로드 속도 설정이 올바르지 않습니다: {e}")
+            self.bandwidth.configure()
+            return False
+        for bucket in (self.bandwidth, GLOBAL_BUCKET):
+            if bucket.configured:
+                bucket.current_rate()  # 지금 적용되는 상한 출력
+        return True
+
+    def contents_url(self, repo_file_path=""):
+        """contents API 주소"""
+        url = f"{self.api_url}/repos/{self.github_username}/{self.repo_name}/contents"
+        return f"{url}/{repo_file_path}" if repo_file_path else url
+
+    def upload_file_to_github(self, local_file_path, interactive=False):
+        """GitHub에 파일 업로드 (이모티콘 커밋 메시지 포함)
+
+        업로드 속도 상한이 있으면 본문을 나눠 보내며 속도를 맞춥니다.
+        interactive=True인 작은 파일(실시간 수정)은 UPLOAD_RATE_BYPASS_INTERACTIVE 설정에 따라 상한 없이 보냅니다.
+        """
+        import requests
+        log.info(f"\n📄 감지된 파일: {os.path.basename(local_file_path)}")
+
+        repo_file_path = os.path.basename(local_file_path)
+        url = self.contents_url(repo_file_path)
+
+        try:
+            with tracing.span("upload.read"):
+                with open(local_file_path, "rb") as file:
+                    raw = file.read()
+            with tracing.span("upload.encode", bytes=len(raw)):
+                content_encoded = base64.b64encode(raw).decode('utf-8')
+        except (FileNotFoundError, PermissionError) as e:
+            log.error(f"  ❌ 파일 읽기 실패: {e}", extra=self.log_fields(path=repo_file_path, error=str(e)))
+            self.record_history("upload", repo_file_path, STATUS_FAILED, message=str(e))
+            return False
+
+        # 기존 파일 확인 및 커밋 메시지 결정
+        sha = None
+        is_update = False
+        try:
+            with tracing.span("upload.get_sha") as phase:
+                response_get = self.http.get(url)
+                phase.set(status=response_get.status_code)
+            if response_get.status_code == 200:
+                sha = response_get.json().get('sha')
+                is_update = True
+        except requests.exceptions.RequestException:
+            pass
+
+        # 이모티콘 커밋 메시지 설정
+        if is_update:
+            commit_message = f"🔄 Update {repo_file_path}"
+            action_emoji = "🔄"
+            action_text = "업데이트"
+            history_action = "update"
+        else:
+            commit_message = f"➕ Add {repo_file_path}"
+            action_emoji = "➕"
+            action_text = "추가"
+            history_action = "add"
+
+        # 업로드 데이터 준비
         data = {
-            "message": f"🗑️ Delete {filename}",
-            "sha": sha
+            "message": commit_message,
+            "content": content_encoded
         }
-        
-        print(f"  🗑️ {filename} 삭제를 시도합니다...")
-        response = requests.delete(url, headers=headers, data=json.dumps(data))
-        
-        if response.status_code == 200:
-            print(f"  ✅ 🗑️ {filename} 삭제 성공!")
-            return True
+        if sha:
+            data["sha"] = sha
+
+        log.info(f"  🚀 {action_text} 업로드를 시도합니다...")
+        bypass = interactive and self.rate_bypass_interactive and len(raw) <= SMALL_FILE_LIMIT
+        body = request_body(json.dumps(data).encode('utf-8'), [] if bypass else [self.bandwidth, GLOBAL_BUCKET],
+                            self._stop_event)
+        self._local.upload_body = body
+        try:
+            with tracing.span("upload.put", bytes=len(content_encoded)) as phase:
+                response_put = self.http.put(url, data=body, timeout=(CONNECT_TIMEOUT, UPLOAD_READ_TIMEOUT))
+                phase.set(status=response_put.status_code, throttled=round(getattr(body, "waited", 0.0), 3))
+            if response_put.status_code in [200, 201]:
+                self.throughput.add(len(data["content"]))
+                commit_sha = self.record_commit(response_put, commit_message)
+                log.info(f"  ✅ {action_emoji} {repo_file_path} {action_text} 성공!",
+                         extra=self.log_fields(action=history_action, path=repo_file_path,
+                                               bytes=len(data["content"]), commit=commit_sha))
+                try:
+                    self.update_remote_index(repo_file_path, (response_put.json().get('content') or {}).get('sha'))
+                except ValueError:
+                    pass
+                self.record_history(history_action, repo_file_path, STATUS_SUCCESS,
+                                    byte_count=len(data["content"]), commit_sha=commit_sha)
+                return True
+            else:
+                error_msg = response_put.json().get('message', 'Unknown error')
+                log.error(f"  ❌ {repo_file_path} 업로드 실패! (상태 코드: {response_put.status_code})",
+                          extra=self.log_fields(action=history_action, path=repo_file_path,
+                                                status=response_put.status_code, error=error_msg))
+                log.error(f"     오류 내용: {error_msg}")
+                self.record_history(history_action, repo_file_path, STATUS_FAILED,
+                                    message=f"{response_put.status_code}: {error_msg}")
+                return False
+        except requests.exceptions.RequestException as e:
+            log.error(f"  ❌ {repo_file_path} 네트워크 오류: {e}",
+                      extra=self.log_fields(action=history_action, path=repo_file_path, error=str(e)))
+            self.record_history(history_action, repo_file_path, STATUS_FAILED, message=str(e))
+            return False
+
+    def remote_files(self):
+        """GitHub 파일 SHA 인덱스 (없으면 한 번 조회해서 채움)"""
+        if self.remote_index is None:
+            github_files = self.get_github_files()
+            if not github_files:
+                return {}
+            self.remote_index = github_files
+            if self.manifest:
+                self.manifest.set_remote(self.target(), github_files)
+        return dict(self.remote_index)
+
+    def update_remote_index(self, filename, sha):
+        """업로드/삭제 성공 후 인덱스 갱신 (sha가 None이면 삭제)"""
+        if self.manifest:
+            self.manifest.update_remote(filename, sha)
+        if self.remote_index is None:
+            return
+        if sha:
+            self.remote_index[filename] = sha
         else:
-            print(f"  ❌ {filename} 삭제 실패! (상태 코드: {response.status_code})")
-            error_msg = response.json().get('message', 'Unknown error')
-            print(f"     오류 내용: {error_msg}")
+            self.remote_index.pop(filename, None)
+
+    def list_remote(self):
+        """GitHub 저장소의 파일 목록 {파일명: sha} (조회 실패 시 None, 빈 저장소는 {})"""
+        try:
+            with tracing.span("remote.list") as phase:
+                response = self.http.get(self.contents_url())
+                phase.set(status=response.status_code)
+            if response.status_code == 200:
+                files_data = response.json()
+                # 파일만 필터링 (폴더 제외)
+                github_files = {}
+                for item in files_data:
+                    if item['type'] in ('file', 'symlink'):  # 실행 파일도 'file'
+                        github_files[item['name']] = item['sha']
+                return github_files
+            elif response.status_code == 404:
+                return {}
+            else:
+                log.warning(f"⚠️ GitHub 파일 목록 가져오기 실패: {response.status_code}")
+                return None
+        except Exception as e:
+            log.warning(f"⚠️ GitHub 파일 목록 가져오기 오류: {e}")
+            return None
+
+    def get_github_files(self):
+        """GitHub 저장소의 파일 목록 가져오기"""
+        return self.list_remote() or {}
+
+    def repo_url(self):
+        return f"{self.api_url}/repos/{self.github_username}/{self.repo_name}"
+
+    def remote_head_tree(self):
+        """기본 브랜치 최신 커밋의 루트 트리 SHA (API 1회, 실패/빈 저장소면 None)"""
+        try:
+            with tracing.span("remote.head_tree"):
+                response = self.http.get(f"{self.repo_url()}/commits/HEAD")
+            if response.status_code == 200:
+                return response.json()['commit']['tree']['sha']
+        except Exception as e:
+            log.warning(f"⚠️ 최신 커밋 조회 오류: {e}")
+        return None
+
+    def fetch_remote_tree(self, tree_sha):
+        """루트 트리 항목 조회 → ({파일명: sha}, {폴더 등 기타 항목: (mode, sha)}, {파일명: mode}), 실패 시 None
+
+        파일은 일반(100644)/실행(100755)/심볼릭 링크(120000) 모두 포함하고, mode는 일반 파일이 아닐 때만 기록합니다.
+        """
+        try:
+            with tracing.span("remote.tree"):
+                response = self.http.get(f"{self.repo_url()}/git/trees/{tree_sha}")
+            if response.status_code != 200:
+                return None
+            data = response.json()
+        except Exception as e:
+            log.warning(f"⚠️ 트리 조회 오류: {e}")
+            return None
+        if data.get('truncated'):
+            return None
+        files, extras, modes = {}, {}, {}
+        for item in data.get('tree', []):
+            if item['type'] == 'blob':
+                files[item['path']] = item['sha']
+                if item['mode'] != MODE_FILE:
+                    modes[item['path']] = item['mode']
+            else:
+                extras[item['path']] = (item['mode'], item['sha'])
+        return files, extras, modes
+
+    def in_sync_with_remote(self, files):
+        """로컬 파일로 만든 트리 SHA가 GitHub 최신 트리와 같은지 확인 (같으면 파일별 비교 생략)
+
+        다르면 루트 트리를 한 번 조회해서 SHA 인덱스를 새로 채웁니다.
+        """
+        if not self.manifest:
             return False
-    except Exception as e:
-        print(f"  ❌ {filename} 삭제 오류: {e}")
+        head_tree = self.remote_head_tree()
+        if head_tree is None:
+            return False
+
+        with tracing.span("sync.hash_local", files=len(files)):
+            local_hashes = self.manifest.hashes(files)
+        if all(local_hashes.get(path) for path in files):
+            local_shas = {os.path.basename(path): local_hashes[path] for path in files}
+            if self.manifest.expected_tree(local_shas) == head_tree:
+                self.remote_index = local_shas
+                self.manifest.set_remote(self.target(), local_shas)
+                return True
+
+        tree = self.fetch_remote_tree(head_tree)
+        if tree is not None:
+            remote_files, extras, modes = tree
+            self.remote_index = remote_files
+            self.manifest.set_remote(self.target(), remote_files, extras, modes)
         return False
 
-def sync_deleted_files():
-    """삭제된 파일들을 GitHub에서도 제거"""
-    print(f"\n🔍 삭제된 파일 동기화 확인 중...")
-    
-    # GitHub와 로컬 파일 목록 가져오기
-    github_files = get_github_files()  # {filename: sha}
-    local_files = get_local_files()    # {filename}
-    
-    if not github_files:
-        print("📂 GitHub 저장소가 비어있거나 파일 목록을 가져올 수 없습니다.")
-        return
-    
-    # GitHub에만 있고 로컬에 없는 파일들 찾기
-    files_to_delete = []
-    for github_file, sha in github_files.items():
-        if github_file not in local_files:
-            files_to_delete.append((github_file, sha))
-    
-    if not files_to_delete:
-        print("🔄 삭제할 파일이 없습니다. 모든 파일이 동기화되어 있습니다.")
-        return
-    
-    print(f"🗑️ {len(files_to_delete)}개의 삭제된 파일을 발견했습니다.")
-    for filename, _ in files_to_delete:
-        print(f"   📄 {filename} (로컬에서 삭제됨)")
-    
-    # 삭제 실행
-    deleted = 0
-    failed = 0
-    for filename, sha in files_to_delete:
-        success = delete_file_from_github(filename, sha)
-        if success:
-            deleted += 1
-        else:
-            failed += 1
-        time.sleep(0.5)  # API 제한 방지
-    
-    # 결과 출력
-    if failed == 0:
-        print(f"\n🎉 파일 삭제 동기화 완료! 🗑️ {deleted}개 파일 모두 삭제됨")
-    else:
-        print(f"\n🎉 파일 삭제 동기화 완료! 🗑️ {deleted}개 삭제 성공, ❌ {failed}개 실패")
-    
-    print("=" * 60)
+    def get_rate_limit(self):
+        """현재 API 호출 한도 {"limit", "remaining", "reset"} (조회 자체는 한도를 쓰지 않음)"""
+        try:
+            response = self.http.get(f"{self.api_url}/rate_limit")
+            if response.status_code == 200:
+                core = response.json().get('resources', {}).get('core', {})
+                return {"limit": core.get('limit', 0), "remaining": core.get('remaining', 0),
+                        "reset": core.get('reset', 0)}
+        except Exception as e:
+            log.warning(f"⚠️ API 한도 조회 오류: {e}")
+        return None
 
-def upload_existing_files():
-    """프로그램 시작 시 기존 파일들을 자동으로 업로드하고 삭제된 파일 동기화"""
-    print(f"\n📂 기존 파일 확인 중...")
-    
-    # 환경변수에서 파일 형식 읽어오기
-    file_extensions_str = os.getenv('FILE_EXTENSIONS', 'py,txt,md,json,js,html,css')
-    file_extensions_list = [ext.strip() for ext in file_extensions_str.split(',')]
-    file_patterns = [f'*.{ext}' for ext in file_extensions_list]
-    
-    print(f"📋 지원 파일 형식: {', '.join(file_extensions_list)}")
-    
-    files = []
-    for pattern in file_patterns:
-        files.extend(glob.glob(os.path.join(WATCH_FOLDER_PATH, pattern)))
-    
-    if not files:
-        print("📁 기존 파일이 없습니다.")
-    else:
-        print(f"🔍 {len(files)}개의 기존 파일을 발견했습니다.")
-        print("📤 자동으로 기존 파일들을 업로드합니다...")
-        
-        uploaded = 0
-        failed = 0
-        for file_path in files:
-            if os.path.isfile(file_path):
-                print(f"\n📄 기존 파일 처리: {os.path.basename(file_path)}")
-                success = upload_file_to_github(file_path)
-                if success:
-                    uploaded += 1
+    def get_local_files(self):
+        """로컬 폴더의 파일 목록 가져오기"""
+        try:
+            return {os.path.basename(path) for path in self.find_watch_files() if os.path.isfile(path)}
+        except Exception as e:
+            log.warning(f"⚠️ 로컬 파일 목록 가져오기 오류: {e}")
+            return set()
+
+    def delete_file_from_github(self, filename, sha):
+        """GitHub에서 파일 삭제"""
+        try:
+            # 삭제 데이터 준비
+            data = {
+                "message": f"🗑️ Delete {filename}",
+                "sha": sha
+            }
+
+            log.info(f"  🗑️ {filename} 삭제를 시도합니다...")
+            with tracing.span("delete.request") as phase:
+                response = self.http.delete(self.contents_url(filename), data=json.dumps(data))
+                phase.set(status=response.status_code)
+
+            if response.status_code == 200:
+                commit_sha = self.record_commit(response, data["message"])
+                log.info(f"  ✅ 🗑️ {filename} 삭제 성공!",
+                         extra=self.log_fields(action="delete", path=filename, commit=commit_sha))
+                self.update_remote_index(filename, None)
+                self.record_history("delete", filename, STATUS_SUCCESS, commit_sha=commit_sha)
+                return True
+            else:
+                error_msg = response.json().get('message', 'Unknown error')
+                log.error(f"  ❌ {filename} 삭제 실패! (상태 코드: {response.status_code})",
+                          extra=self.log_fields(action="delete", path=filename,
+                                                status=response.status_code, error=error_msg))
+                log.error(f"     오류 내용: {error_msg}")
+                self.record_history("delete", filename, STATUS_FAILED,
+                                    message=f"{response.status_code}: {error_msg}")
+                return False
+        except Exception as e:
+            log.error(f"  ❌ {filename} 삭제 오류: {e}", extra=self.log_fields(action="delete", path=filename, error=str(e)))
+            self.record_history("delete", filename, STATUS_FAILED, message=str(e))
+            return False
+
+    def delete_file_by_name(self, filename):
+        """SHA를 조회한 뒤 GitHub에서 파일 삭제 (실시간 삭제용)"""
+        try:
+            # GitHub에서 파일 정보 가져오기 (sha 필요)
+            response = self.http.get(self.contents_url(filename))
+            if response.status_code == 200:
+                file_data = response.json()
+                sha = file_data.get('sha')
+
+                if sha:
+                    success = self.delete_file_from_github(filename, sha)
+                    if success:
+                        log.info(f"  ✅ 실시간 삭제 완료: {filename}")
+                    else:
+                        log.error(f"  ❌ 실시간 삭제 실패: {filename}")
+                    return success
                 else:
-                    failed += 1
-                time.sleep(1)  # API 제한 방지
-        
-        # 업로드 결과
+                    log.warning(f"  ⚠️ {filename}의 SHA를 가져올 수 없습니다.")
+            elif response.status_code == 404:
+                log.info(f"  ℹ️ {filename}는 이미 GitHub에 없습니다.")
+                return True
+            else:
+                log.warning(f"  ⚠️ {filename} 정보 조회 실패: {response.status_code}")
+
+        except Exception as e:
+            log.error(f"  ❌ {filename} 삭제 처리 중 오류: {e}")
+        return False
+
+    # 진행 상황 관련 메서드들
+    def progress_stats(self):
+        """진행 상황 요약 (모든 진행 이벤트에 포함)"""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "window": self.budget().limit,
+            "bytes_per_sec": round(self.throughput.rate(), 1),
+            "errors": self.error_count,
+            "last_commit": self.last_commit,
+        }
+
+    def publish(self, event_type, **fields):
+        """진행 이벤트 발행 (현재 통계 포함)"""
+        fields.update(self.progress_stats())
+        self.progress.publish(event_type, **fields)
+
+    def record_commit(self, response, message):
+        """API 응답에서 커밋 정보 기록"""
+        try:
+            commit_sha = (response.json().get('commit') or {}).get('sha')
+        except ValueError:
+            commit_sha = None
+        self.last_commit = {"sha": commit_sha, "message": message, "time": time.time()}
+        return commit_sha
+
+    def log_fields(self, **values):
+        """로그 구조화 필드 (프로필 포함)"""
+        return upload_log.fields(profile=self.profile_name, **values)
+
+    def record_history(self, action, path, status, byte_count=0, commit_sha=None, message=None):
+        """업로드 기록 저장소에 1건 추가 (일괄 쓰기라 바로 반환)"""
+        if self.history:
+            self.history.record(self.profile_name, action, path, status,
+                                byte_count=byte_count, commit_sha=commit_sha, message=message)
+        if action == "delete":
+            metrics.DELETES.inc(profile=self.profile_name, result=status)
+        else:
+            metrics.UPLOADS.inc(profile=self.profile_name, action=action, result=status)
+            if status == STATUS_SUCCESS:
+                metrics.BYTES_SENT.inc(byte_count, profile=self.profile_name)
+
+    def enqueue(self, action, path, priority, sha=None, batch=None):
+        """업로드 큐에 작업 추가 + 진행 이벤트 발행"""
+        task = self.queue.put(action, path, priority, sha=sha, batch=batch)
+        if task.coalesced:
+            metrics.COALESCED.inc(profile=self.profile_name)
+        self.publish("queued", action=action, path=os.path.basename(path), priority=task.priority)
+        return task
+
+    # 동기화 관련 메서드들
+    def sync_deleted_files(self):
+        """삭제된 파일들을 GitHub에서도 제거"""
+        log.info(f"\n🔍 삭제된 파일 동기화 확인 중...")
+
+        # GitHub와 로컬 파일 목록 가져오기
+        github_files = self.remote_files()    # {filename: sha}
+        local_files = self.get_local_files()  # {filename}
+
+        if not github_files:
+            log.info("📂 GitHub 저장소가 비어있거나 파일 목록을 가져올 수 없습니다.")
+            return
+
+        # GitHub에만 있고 로컬에 없는 파일들 찾기
+        files_to_delete = []
+        for github_file, sha in github_files.items():
+            if github_file not in local_files:
+                files_to_delete.append((github_file, sha))
+
+        if not files_to_delete:
+            log.info("🔄 삭제할 파일이 없습니다. 모든 파일이 동기화되어 있습니다.")
+            return
+
+        log.info(f"🗑️ {len(files_to_delete)}개의 삭제된 파일을 발견했습니다.")
+        for filename, _ in files_to_delete:
+            log.info(f"   📄 {filename} (로컬에서 삭제됨)")
+
+        # 삭제 실행 (업로드 큐에서 실시간 수정 다음 순위로 처리)
+        batch = UploadBatch(len(files_to_delete))
+        for filename, sha in files_to_delete:
+            self.enqueue("delete", os.path.join(self.watch_folder_path, filename),
+                         PRIORITY_DELETE, sha=sha, batch=batch)
+        batch.wait()
+        deleted, failed = batch.succeeded, batch.failed
+
+        # 결과 출력
         if failed == 0:
-            print(f"\n🎉 기존 파일 업로드 완료! ✅ {uploaded}개 파일 모두 성공")
+            log.info(f"\n🎉 파일 삭제 동기화 완료! 🗑️ {deleted}개 파일 모두 삭제됨",
+                     extra=self.log_fields(phase="delete_sync", deleted=deleted, failed=failed))
         else:
-            print(f"\n🎉 기존 파일 업로드 완료! ✅ {uploaded}개 성공, ❌ {failed}개 실패")
-    
-    # 삭제된 파일 동기화 추가
-    sync_deleted_files()
+            log.warning(f"\n🎉 파일 삭제 동기화 완료! 🗑️ {deleted}개 삭제 성공, ❌ {failed}개 실패",
+                        extra=self.log_fields(phase="delete_sync", deleted=deleted, failed=failed))
 
-def scheduled_upload():
-    """예약된 시간에 실행되는 업로드 함수 (삭제 동기화 포함)"""
-    print(f"\n⏰ 예약 업로드 시작: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # 환경변수에서 파일 형식 읽어오기
-    file_extensions_str = os.getenv('FILE_EXTENSIONS', 'py,txt,md,json,js,html,css')
-    file_extensions_list = [ext.strip() for ext in file_extensions_str.split(',')]
-    file_patterns = [f'*.{ext}' for ext in file_extensions_list]
-    
-    print(f"📋 지원 파일 형식: {', '.join(file_extensions_list)}")
-    
-    files = []
-    for pattern in file_patterns:
-        files.extend(glob.glob(os.path.join(WATCH_FOLDER_PATH, pattern)))
-    
-    if not files:
-        print("📂 업로드할 파일이 없습니다.")
-    else:
-        print(f"📁 {len(files)}개 파일을 업로드합니다.")
-        uploaded = 0
-        failed = 0
-        
-        for file_path in files:
-            if os.path.isfile(file_path):
-                success = upload_file_to_github(file_path)
-                if success:
-                    uploaded += 1
+        log.info("=" * 60)
+
+    def filter_changed_files(self, file_paths):
+        """GitHub에 같은 내용으로 이미 있는 파일 제외 (blob SHA 비교)"""
+        github_files = self.remote_files()  # {filename: sha}
+        if not github_files:
+            return file_paths
+
+        if self.manifest:
+            self.manifest.forget_missing(file_paths)
+            local_hashes = self.manifest.hashes(file_paths)
+        else:
+            local_hashes = hash_files(file_paths)
+        changed = [path for path in file_paths
+                   if local_hashes.get(path) is None
+                   or github_files.get(os.path.basename(path)) != local_hashes[path]]
+        skipped = len(file_paths) - len(changed)
+        if skipped:
+            log.info(f"⏭️ 변경 없는 파일 {skipped}개는 건너뜁니다.")
+        return changed
+
+    def enqueue_backfill(self, files):
+        """기존 파일들을 크기별 우선순위로 큐에 넣고 모두 처리될 때까지 대기"""
+        file_paths = self.filter_changed_files([path for path in files if os.path.isfile(path)])
+        batch = UploadBatch(len(file_paths))
+        for file_path in file_paths:
+            self.enqueue("upload", file_path, classify_upload(file_path), batch=batch)
+        batch.wait()
+        return batch.succeeded, batch.failed
+
+    def upload_existing_files(self):
+        """프로그램 시작 시 기존 파일들을 자동으로 업로드하고 삭제된 파일 동기화"""
+        log.info(f"\n📂 기존 파일 확인 중...")
+        log.info(f"📋 지원 파일 형식: {', '.join(self.get_extensions())}")
+
+        files = self.find_watch_files()
+        if self.in_sync_with_remote(files):
+            log.info("🌳 로컬 파일과 GitHub 트리가 같습니다. 동기화할 내용이 없습니다.")
+            return
+
+        if not files:
+            log.info("📁 기존 파일이 없습니다.")
+        else:
+            log.info(f"🔍 {len(files)}개의 기존 파일을 발견했습니다.")
+            log.info("📤 자동으로 기존 파일들을 업로드합니다...")
+
+            uploaded, failed = self.enqueue_backfill(files)
+
+            # 업로드 결과
+            if failed == 0:
+                log.info(f"\n🎉 기존 파일 업로드 완료! ✅ {uploaded}개 파일 모두 성공",
+                         extra=self.log_fields(phase="initial", uploaded=uploaded, failed=failed))
+            else:
+                log.warning(f"\n🎉 기존 파일 업로드 완료! ✅ {uploaded}개 성공, ❌ {failed}개 실패",
+                            extra=self.log_fields(phase="initial", uploaded=uploaded, failed=failed))
+
+        # 삭제된 파일 동기화 추가
+        self.sync_deleted_files()
+
+    def scheduled_upload(self):
+        """예약된 시간에 실행되는 업로드 함수 (삭제 동기화 포함)"""
+        log.info(f"\n⏰ 예약 업로드 시작: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        self.remote_index = None  # 다른 곳에서 바뀌었을 수 있으므로 다시 조회
+        log.info(f"📋 지원 파일 형식: {', '.join(self.get_extensions())}")
+
+        files = self.find_watch_files()
+        if self.in_sync_with_remote(files):
+            log.info("🌳 로컬 파일과 GitHub 트리가 같습니다. 업로드할 내용이 없습니다.")
+            return
+
+        if not files:
+            log.info("📂 업로드할 파일이 없습니다.")
+        else:
+            log.info(f"📁 {len(files)}개 파일을 업로드합니다.")
+            uploaded, failed = self.enqueue_backfill(files)
+
+            # 업로드 결과
+            if failed == 0:
+                log.info(f"\n🎉 예약 업로드 완료! ✅ {uploaded}개 파일 모두 성공",
+                         extra=self.log_fields(phase="scheduled", uploaded=uploaded, failed=failed))
+            else:
+                log.warning(f"\n🎉 예약 업로드 완료! ✅ {uploaded}개 성공, ❌ {failed}개 실패",
+                            extra=self.log_fields(phase="scheduled", uploaded=uploaded, failed=failed))
+
+        # 삭제된 파일 동기화 추가
+        self.sync_deleted_files()
+
+    # 업로드 큐 처리
+    def process_upload_task(self, task):
+        """큐에서 꺼낸 작업 1개 처리"""
+        filename = os.path.basename(task.path)
+        if task.action == "delete":
+            with tracing.span("task.delete", path=filename) as phase:
+                if task.sha:
+                    success = self.delete_file_from_github(filename, task.sha)
                 else:
-                    failed += 1
-                time.sleep(1)  # API 제한 방지
-        
-        # 업로드 결과
-        if failed == 0:
-            print(f"\n🎉 예약 업로드 완료! ✅ {uploaded}개 파일 모두 성공")
+                    success = self.delete_file_by_name(filename)
+                phase.set(success=success)
+            return success
+
+        if task.priority == PRIORITY_INTERACTIVE:
+            # 마지막 수정 이벤트 후 파일 쓰기가 끝날 때까지 잠시 대기
+            settle = task.updated_at + WRITE_SETTLE_SECONDS - time.monotonic()
+            if settle > 0:
+                with tracing.span("upload.settle"):
+                    time.sleep(settle)
+        with tracing.span("task.upload", path=filename) as phase:
+            success = self.upload_file_to_github(task.path, interactive=task.priority == PRIORITY_INTERACTIVE)
+            phase.set(success=success)
+        return success
+
+    def wait_for_github(self):
+        """GitHub 요청이 차단 중이면 복구될 때까지 큐 처리 대기 (중지되거나 기다리지 않으면 False)
+
+        기다리는 동안 호출 한도를 쓰지 않는 /rate_limit 요청으로 연결을 확인합니다.
+        """
+        if not self.breaker.is_open:
+            return True
+        if not self.wait_offline:
+            return False
+        import requests
+        self.publish("network", online=False)
+        log.info("⏸️ GitHub에 연결할 수 없어 업로드를 잠시 멈춥니다. (연결되면 자동으로 다시 시작)")
+        while self.breaker.is_open:
+            # 다른 쓰레드가 확인 중이면 잠시 후 다시 확인
+            if self._stop_event.wait(max(self.breaker.retry_in(), 0.5)):
+                return False
+            metrics.wakeup("network")
+            try:
+                self.http.get(f"{self.api_url}/rate_limit")
+            except requests.exceptions.RequestException:
+                pass
+        self.publish("network", online=True)
+        log.info("▶️ 연결이 복구되어 업로드를 다시 시작합니다.")
+        return True
+
+    def upload_worker(self):
+        """업로드 큐 처리 쓰레드"""
+        while True:
+            task = self.queue.get()
+            if task is None:
+                break
+            metrics.wakeup("queue")
+            filename = os.path.basename(task.path)
+            started = time.monotonic()
+            success = False
+
+            # 처리 중에 연결이 끊긴 작업은 실패로 끝내지 않고 복구 후 다시 시도
+            throttle_retries = 0
+            while self.wait_for_github():
+                # 같은 토큰을 쓰는 작업들과 차례대로, 동시 요청 창 안에서 처리 (API 제한 방지)
+                budget = self.budget()
+                with tracing.span("queue.budget_wait"):
+                    acquired = budget.acquire(self._stop_event, task.priority)
+                if not acquired:
+                    break
+
+                self.add_in_flight(1)
+                self.publish("task_started", action=task.action, path=filename)
+                self._local.throttled = False
+                try:
+                    success = self.process_upload_task(task)
+                except Exception as e:
+                    log.error(f"  ❌ {filename} 작업 처리 중 오류: {e}")
+                    success = False
+                self.add_in_flight(-1)
+                budget.release()
+                if not success and self._local.throttled and throttle_retries < MAX_THROTTLE_RETRIES:
+                    # 요청 제한 → 창이 줄어든 상태로 다시 차례를 기다림
+                    throttle_retries += 1
+                    log.info(f"  🔁 {filename} 요청 제한으로 다시 시도합니다 ({throttle_retries}/{MAX_THROTTLE_RETRIES})")
+                    continue
+                if success or not self.breaker.is_open or not self.wait_offline:
+                    break
+
+            if success and (task.priority == PRIORITY_INTERACTIVE or (task.action == "delete" and not task.sha)):
+                # 실시간 감지 작업: 마지막 저장부터 커밋까지
+                metrics.SAVE_TO_COMMIT.observe(time.monotonic() - task.updated_at, profile=self.profile_name)
+            if not success:
+                self.error_count += 1
+                self.publish("error", action=task.action, path=filename)
+            self.publish("task_done", action=task.action, path=filename, success=success,
+                         seconds=round(time.monotonic() - started, 3))
+            self.queue.done(task)
+            task.finish(success)
+
+    def add_in_flight(self, amount):
+        with self._in_flight_lock:
+            self.in_flight += amount
+
+    def start_workers(self):
+        """큐 처리 쓰레드 시작 (창이 커지면 여러 작업을 동시에 처리)"""
+        for _ in range(WORKER_THREADS):
+            self._start_thread(self.upload_worker)
+
+    # 스케줄러
+    def setup_scheduler(self):
+        """예약 등록 (SCHEDULE_CRON, 없으면 기존 시/분/반복 설정) → 성공 여부"""
+        cron_text = self.schedule_cron or legacy_cron(self.schedule_hour, self.schedule_minute, self.repeat_option)
+        try:
+            expressions = parse_schedule(cron_text)
+        except ValueError as e:
+            log.error(f"❌ 예약 설정이 올바르지 않습니다: {e}")
+            self.cancel_schedule()
+            return False
+
+        if self.schedule_job is not None and self.schedule_job.key != self.profile_name:
+            self.cancel_schedule()  # 프로필이 바뀐 경우 이전 예약 해제
+        self.schedule_job = self.scheduler.set_job(self.profile_name, expressions, self.run_scheduled_upload,
+                                                   offset=spread_offset(self.profile_name))
+
+        schedule_time = f"{self.schedule_hour:02d}:{self.schedule_minute:02d}"
+        if self.schedule_cron:
+            log.info(f"📅 예약: {' | '.join(expression.text for expression in expressions)}")
+        elif self.repeat_option == "weekdays":
+            log.info(f"📅 평일 {schedule_time}에 업로드 예약됨")
+        elif self.repeat_option == "weekends":
+            log.info(f"📅 주말 {schedule_time}에 업로드 예약됨")
         else:
-            print(f"\n🎉 예약 업로드 완료! ✅ {uploaded}개 성공, ❌ {failed}개 실패")
-    
-    # 삭제된 파일 동기화 추가
-    sync_deleted_files()
-
-def setup_scheduler():
-    """스케줄러 설정"""
-    schedule_time = f"{SCHEDULE_HOUR:02d}:{SCHEDULE_MINUTE:02d}"
-    
-    if REPEAT_OPTION == "daily":
-        schedule.every().day.at(schedule_time).do(scheduled_upload)
-        print(f"📅 매일 {schedule_time}에 업로드 예약됨")
-    elif REPEAT_OPTION == "weekdays":
-        for day in ["monday", "tuesday", "wednesday", "thursday", "friday"]:
-            getattr(schedule.every(), day).at(schedule_time).do(scheduled_upload)
-        print(f"📅 평일 {schedule_time}에 업로드 예약됨")
-    elif REPEAT_OPTION == "weekends":
-        schedule.every().saturday.at(schedule_time).do(scheduled_upload)
-        schedule.every().sunday.at(schedule_time).do(scheduled_upload)
-        print(f"📅 주말 {schedule_time}에 업로드 예약됨")
-
-def run_scheduler():
-    """스케줄러 실행 (별도 쓰레드)"""
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # 1분마다 체크
+            log.info(f"📅 매일 {schedule_time}에 업로드 예약됨")
+        if self.schedule_job.deadline is not None:
+            log.info(f"⏭️ 다음 예약 실행: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.schedule_job.deadline))}")
+        return True
+
+    def cancel_schedule(self):
+        """예약 해제"""
+        if self.schedule_job is not None:
+            self.scheduler.remove_job(self.schedule_job.key)
+            self.schedule_job = None
+
+    def run_scheduled_upload(self):
+        """예약 작업 실행 (데몬에서는 공용 스케줄러 쓰레드를 막지 않도록 별도 쓰레드)"""
+        if self.shared:
+            self._start_thread(self.scheduled_upload)
+        else:
+            self.scheduled_upload()
+
+    def start_scheduler(self):
+        """예약 설정 후 스케줄러 쓰레드 시작 (이미 실행 중이면 예약만 교체)"""
+        if self.setup_scheduler() and not self.shared:  # 데몬은 공용 스케줄러를 데몬이 시작
+            self.scheduler.start()
+
+    # 감시 / 실행 제어
+    def start_observer(self):
+        """파일 감시 시작 (설정 파일은 항상, 감시 폴더는 실시간 모드일 때)"""
+        self.watch_hub = self.shared.watch_hub if self.shared else WatchHub()
+        self.watch_hub.start()
+        config_dir = os.path.dirname(os.path.abspath(self.env_path))
+        self.config_watch = self.watch_hub.add(config_dir, ConfigFileHandler(self))
+        if self.upload_mode in ["realtime", "hybrid"]:
+            self.watch_folder()
+        return self.watch_hub
+
+    def watch_folder(self):
+        """감시 폴더 watch 등록 (기존 watch는 해제)"""
+        self.unwatch_folder()
+        if not os.path.exists(self.watch_folder_path):
+            os.makedirs(self.watch_folder_path)
+            log.info(f"📁 감시 폴더를 생성했습니다: {self.watch_folder_path}")
+
+        self.watch = self.watch_hub.add(self.watch_folder_path, FileEventHandler(self))
+        log.info("🔄 실시간 파일 감시 시작! (추가/수정/삭제 모두 감지)")
+
+    def unwatch_folder(self):
+        if self.watch is not None:
+            self.watch_hub.remove(self.watch)
+            self.watch = None
+
+    # 설정 변경 반영 (재시작 없이)
+    def schedule_reload(self):
+        """설정 파일 변경 감지 → 잠시 후 한 번만 다시 읽기"""
+        if self._reload_timer is not None:
+            self._reload_timer.cancel()
+        self._reload_timer = threading.Timer(CONFIG_RELOAD_DELAY, self.reload_config)
+        self._reload_timer.daemon = True
+        self._reload_timer.start()
+
+    def switch_profile_lock(self, profile_name):
+        """단일 실행 잠금을 다른 프로필로 옮기기"""
+        new_lock = InstanceLock(profile_name)
+        if not new_lock.acquire(self.control.address if self.control else None):
+            log.error(f"❌ '{profile_name}' 프로필 업로더가 이미 실행 중이라 전환할 수 없습니다!")
+            return False
+        if self.instance_lock:
+            self.instance_lock.release()
+        self.instance_lock = new_lock
+        self.profile_name = profile_name
+        return True
+
+    def reload_config(self, profile_name=None):
+        """실행 중에 바뀐 설정만 반영
+
+        HTTP 연결과 SHA 인덱스는 저장소가 바뀌지 않으면 그대로 쓰고,
+        감시 폴더/파일 형식이 바뀐 경우에는 새 범위만 다시 동기화합니다.
+        """
+        with self._reload_lock:
+            if self.state not in (STATE_RUNNING, STATE_PAUSED):
+                return False
+
+            old = self.config_snapshot()
+            try:
+                self.load_config()
+            except (OSError, ValueError) as e:
+                log.warning(f"⚠️ 설정 파일을 다시 읽을 수 없습니다: {e}")
+                self.restore_config(old)
+                return False
+
+            new = self.config_snapshot()
+            changed = {field for field in CONFIG_FIELDS if old[field] != new[field]}
+            profile_changed = profile_name and profile_name != self.profile_name
+            if not changed and not profile_changed:
+                return False
+
+            if not self.check_env_config():
+                log.warning("⚠️ 새 설정이 올바르지 않아 기존 설정을 유지합니다.")
+                self.restore_config(old)
+                return False
+
+            if profile_changed:
+                if not self.switch_profile_lock(profile_name):
+                    self.restore_config(old)
+                    return False
+                if self.manifest:
+                    self.manifest.save()
+                self.manifest = SyncManifest(self.profile_name).load()
+
+            log.info(f"\n🔁 설정 변경 반영: {', '.join(sorted(changed)) or '프로필'}")
+
+            # 토큰만 바뀌면 기존 연결 풀 유지
+            if 'github_token' in changed and self._session is not None:
+                self._session.headers["Authorization"] = f"token {self.github_token}"
+
+            # 대상 저장소가 바뀌면 SHA 인덱스를 버리고 전체 동기화
+            target_changed = bool(changed & {'github_username', 'repo_name', 'branch'})
+            if target_changed:
+                self.remote_index = None
+
+            if changed & {'watch_folder_path', 'upload_mode'}:
+                if self.upload_mode in ["realtime", "hybrid"]:
+                    self.watch_folder()
+                else:
+                    self.unwatch_folder()
+                    log.info("⏹️ 실시간 감시를 중지했습니다.")
+
+            if changed & {'upload_rate_limit', 'upload_rate_schedule'}:
+                self.setup_bandwidth()
+
+            if changed & {'upload_mode', 'schedule_hour', 'schedule_minute', 'repeat_option', 'schedule_cron'}:
+                if self.upload_mode in ["schedule", "hybrid"]:
+                    self.start_scheduler()
+                else:
+                    self.cancel_schedule()
+
+            self.publish("config", repo=f"{self.github_username}/{self.repo_name}",
+                         watch_folder=self.watch_folder_path, profile=self.profile_name)
+
+            # 동기화 범위가 바뀐 경우에만 다시 동기화 (변경 없는 파일은 SHA 인덱스로 건너뜀)
+            if target_changed or changed & {'watch_folder_path', 'file_extensions'}:
+                self._start_thread(self.initial_sync)
+            return True
+
+    def _start_thread(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    def _set_state(self, state):
+        self.state = state
+        if state in (STATE_STOPPED, STATE_ERROR):
+            self._stopped.set()
+        else:
+            self._stopped.clear()
+        if self.shared:
+            self.shared.state_changed.set()
+        self.publish("state", state=state)
+        if self.on_state_change:
+            try:
+                self.on_state_change(state)
+            except Exception as e:
+                log.warning(f"⚠️ 상태 알림 오류: {e}")
+
+    def prepare(self):
+        """설정 로드 + 확인 + 단일 실행 잠금 (감시/1회 동기화 공통)"""
+        self._set_state(STATE_STARTING)
+        self.start_error = None
+        self._stop_event = threading.Event()
+        self.queue = UploadQueue()
+        self._threads = []
+
+        # GUI가 구독 주소를 넘겨준 경우 진행 상황 푸시 연결
+        progress_addr = os.getenv(PROGRESS_ADDR_ENV)
+        if progress_addr:
+            self.progress.connect(progress_addr)
+
+        log.info("🚀 GitHub 자동 업로드 시스템 시작!")
+        log.info("=" * 60)
+
+        # 설정 값 로드
+        try:
+            self.load_config()
+        except (OSError, ValueError) as e:
+            log.error(f"❌ 설정 파일을 읽을 수 없습니다: {e}")
+            self.start_error = START_ERROR_CONFIG
+            self._set_state(STATE_ERROR)
+            return False
+        if not self.shared:  # 데몬은 시작할 때 한 번 설정 (프로필마다 프로세스 전체 설정을 바꾸지 않음)
+            upload_log.configure(self.log_level, self.log_format, self.log_file)
+        self.setup_bandwidth()
+
+        # 환경 설정 확인
+        if not self.check_env_config():
+            log.error("❌ 설정이 올바르지 않습니다!")
+            self.start_error = START_ERROR_CONFIG
+            self._set_state(STATE_ERROR)
+            return False
+
+        # 같은 프로필 업로더가 이미 실행 중인지 확인 (잠금은 프로세스가 끝나면 자동 해제)
+        self.instance_lock = InstanceLock(self.profile_name)
+        if not self.instance_lock.acquire():
+            log.error(f"❌ '{self.profile_name}' 프로필 업로더가 이미 실행 중입니다!")
+            self.instance_lock = None
+            self.start_error = START_ERROR_LOCKED
+            self._set_state(STATE_ERROR)
+            return False
+
+        if self.trace_file:
+            tracing.enable(self.trace_file)
+        if self.metrics_port:
+            metrics.serve(self.metrics_port)
+        metrics.QUEUE_DEPTH.set_function(lambda: self.queue.qsize(), profile=self.profile_name)
+        metrics.OLDEST_PENDING.set_function(lambda: self.queue.oldest_age(), profile=self.profile_name)
+        metrics.CONCURRENCY_WINDOW.set_function(lambda: self.budget().limit, profile=self.profile_name)
+        metrics.IN_FLIGHT.set_function(lambda: self.in_flight, profile=self.profile_name)
+        self.manifest = SyncManifest(self.profile_name).load()
+        self.history = self.shared.history if self.shared else HistoryWriter()
+        return True
+
+    def run(self, started_at=None):
+        """설정 로드부터 감시 시작까지 실행 (현재 쓰레드에서, 감시가 시작되면 반환)"""
+        started_at = started_at or time.perf_counter()
+        if not self.prepare():
+            return False
+
+        try:
+            self.control = ControlServer(self)
+            self.instance_lock.update(self.control.address)
+        except OSError as e:
+            # 제어 소켓 없이도 업로드는 계속 (CLI/GUI의 중지·상태 명령만 사용 불가)
+            log.warning(f"⚠️ 제어 소켓을 열 수 없습니다: {e}")
+            self.control = None
+
+        log.info(f"✅ 설정 로드 완료!")
+        log.info(f"📍 사용자: {self.github_username}")
+        log.info(f"📂 저장소: {self.repo_name}")
+        log.info(f"👀 감시 폴더: {self.watch_folder_path}")
+        log.info(f"🔧 업로드 모드: {self.upload_mode}")
+        log.info(f"📄 지원 파일 형식: {self.file_extensions}")
+
+        # 업로드 큐 처리 시작
+        self.start_workers()
+
+        # 실시간 감시를 먼저 시작 (초기 동기화 중 수정된 파일도 바로 반영)
+        self.remote_index = None
+        self.start_observer()
+
+        self.last_startup_seconds = time.perf_counter() - started_at
+        log.info(f"⚡ 감시 시작까지 {self.last_startup_seconds:.2f}초")
+        if self.last_startup_seconds > STARTUP_BUDGET_SECONDS:
+            log.warning(f"⚠️ 시작 시간이 목표({STARTUP_BUDGET_SECONDS:.1f}초)를 초과했습니다.")
+
+        # 기존 파일 자동 업로드 + 삭제 동기화 (백그라운드)
+        self._start_thread(self.initial_sync)
+
+        # 스케줄러 시작
+        if self.upload_mode in ["schedule", "hybrid"]:
+            self.start_scheduler()
+
+        log.info("=" * 60)
+        log.info("📂 GitHub 자동 업로드 시스템이 실행 중입니다...")
+        log.info("💡 감시 폴더에서 파일을 추가/수정/삭제하면 자동으로 GitHub에 반영됩니다.")
+
+        self._set_state(STATE_RUNNING)
+        return True
+
+    def initial_sync(self):
+        """기존 파일 업로드 + 삭제 동기화 (백그라운드 쓰레드)"""
+        try:
+            self.upload_existing_files()
+        except Exception as e:
+            log.error(f"❌ 초기 동기화 중 오류: {e}")
+
+    def sync_once(self, full=False):
+        """증분 동기화 1회 실행 후 중지 (CLI/cron용) → 실패한 작업 수, 시작하지 못하면 None
+
+        기록된 GitHub SHA를 믿을 수 있으면 저장소 목록을 조회하지 않고,
+        변경 없는 파일은 해시도 다시 계산하지 않습니다. full=True면 저장소 목록을 다시 조회합니다.
+        """
+        if not self.prepare():
+            return None
+
+        self.wait_offline = False  # 연결이 끊기면 기다리지 않고 다음 실행에 맡김
+        self.start_workers()
+        self._set_state(STATE_RUNNING)
+        self.remote_index = None if full else self.manifest.remote_for(self.target())
+        if self.remote_index is not None:
+            log.info(f"📒 동기화 기록 사용 (GitHub 파일 {len(self.remote_index)}개)")
+
+        errors_before = self.error_count
+        try:
+            self.upload_existing_files()
+            self.manifest.mark_synced()
+        finally:
+            self.stop()
+        return self.error_count - errors_before
+
+    def plan_sync(self, offline=False):
+        """동기화하면 바뀔 내용과 비용만 계산 (GitHub에 쓰지 않음) → SyncPlan, 실패 시 None
+
+        로컬 스캔, 동기화 기록, GitHub 파일 목록을 비교합니다. offline=True면
+        GitHub을 조회하지 않고 기록된 목록만 사용합니다.
+        """
+        try:
+            self.load_config()
+        except (OSError, ValueError) as e:
+            log.error(f"❌ 설정 파일을 읽을 수 없습니다: {e}")
+            return None
+        if not self.check_env_config():
+            return None
+
+        manifest = SyncManifest(self.profile_name).load()
+        recorded = manifest.remote_for(self.target())
+        rate_limit = None
+        request_seconds = None
+        if offline:
+            if recorded is None:
+                log.error("❌ 동기화 기록이 없어 GitHub 조회 없이 계획을 만들 수 없습니다.")
+                return None
+            remote = recorded
+        else:
+            started = time.monotonic()
+            remote = self.list_remote()
+            if remote is None:
+                return None
+            request_seconds = time.monotonic() - started
+            rate_limit = self.get_rate_limit()
+
+        files = [path for path in self.find_watch_files() if os.path.isfile(path)]
+        local_hashes = manifest.hashes(files)
+        local = {}
+        for path in files:
+            if local_hashes.get(path) is None:
+                continue
+            try:
+                local[os.path.basename(path)] = (local_hashes[path], os.path.getsize(path))
+            except OSError:
+                continue
+
+        return build_plan(local, remote, recorded, rate_limit=rate_limit, request_seconds=request_seconds)
+
+    def start(self):
+        """작업 쓰레드에서 엔진 시작 (GUI 내장용, 바로 반환)"""
+        if self.state in (STATE_STARTING, STATE_RUNNING, STATE_PAUSED):
+            return False
+        self._set_state(STATE_STARTING)
+        threading.Thread(target=self.run, daemon=True).start()
+        return True
+
+    def stop(self):
+        """감시/스케줄러/큐 처리 중지"""
+        if self.state == STATE_STOPPED:
+            return
+        self._stop_event.set()
+        self.budget().wake()  # 창 자리를 기다리는 작업 쓰레드 깨우기
+        self.cancel_schedule()
+        if not self.shared:  # 공용 스케줄러는 데몬이 중지
+            self.scheduler.stop()
+        if self._reload_timer is not None:
+            self._reload_timer.cancel()
+            self._reload_timer = None
+        if self.watch_hub:
+            self.unwatch_folder()
+            if self.config_watch is not None:
+                self.watch_hub.remove(self.config_watch)
+                self.config_watch = None
+            if not self.shared:
+                self.watch_hub.stop()
+            self.watch_hub = None
+        self.queue.close()
+        for thread in self._threads:
+            thread.join(timeout=3)
+        self._threads = []
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.manifest:
+            try:
+                self.manifest.save()
+            except OSError as e:
+                log.warning(f"⚠️ 동기화 기록 저장 실패: {e}")
+        metrics.QUEUE_DEPTH.remove(profile=self.profile_name)
+        metrics.OLDEST_PENDING.remove(profile=self.profile_name)
+        metrics.CONCURRENCY_WINDOW.remove(profile=self.profile_name)
+        metrics.IN_FLIGHT.remove(profile=self.profile_name)
+        if self.metrics_port and not self.shared:  # 공유 엔드포인트는 데몬이 닫음
+            metrics.stop_server()
+        if tracing.is_enabled():
+            try:
+                log.info(f"🧭 단계별 요약 저장: {tracing.write_summary()}")
+            except OSError as e:
+                log.warning(f"⚠️ 추적 요약 저장 실패: {e}")
+        if self.history:
+            if not self.shared:  # 공유 기록은 데몬이 닫음
+                self.history.close()
+            self.history = None
+        if self.control:
+            self.control.close()
+            self.control = None
+        if self.instance_lock:
+            self.instance_lock.release()
+            self.instance_lock = None
+        self._set_state(STATE_STOPPED)
+        log.info("🛑 업로드 엔진이 중지되었습니다.")
+
+    def wait_until_stopped(self):
+        """엔진이 중지될 때까지 대기 (제어 소켓 stop, 오류 등)"""
+        wait_interruptible(self._stopped)
+
+    def pause(self):
+        """업로드 일시정지 (감지된 변경은 큐에 계속 쌓임)"""
+        if self.state == STATE_RUNNING:
+            self.queue.pause()
+            self._set_state(STATE_PAUSED)
+            log.info("⏸️ 업로드를 일시정지했습니다.")
+
+    def resume(self):
+        """일시정지 해제"""
+        if self.state == STATE_PAUSED:
+            self.queue.resume()
+            self._set_state(STATE_RUNNING)
+            log.info("▶️ 업로드를 다시 시작합니다.")
+
+    def status(self):
+        """현재 엔진 상태 요약"""
+        return {
+            "state": self.state,
+            "profile_env": self.env_path,
+            "repo": f"{self.github_username}/{self.repo_name}" if self.repo_name else None,
+            "watch_folder": self.watch_folder_path,
+            "upload_mode": self.upload_mode,
+            "network": self.breaker.state,
+            "queue_depth": self.queue.qsize(),
+            "queue_by_priority": self.queue.stats(),
+            "startup_seconds": self.last_startup_seconds,
+            "wakeups_per_minute": metrics.wakeups_per_minute(),
+            "window": self.budget().limit,
+            "window_reason": self.budget().last_change,
+            "write_pace": self.budget().write_pace,
+            "upload_rate_limit": self.bandwidth.current_rate(),
+            "global_upload_rate_limit": GLOBAL_BUCKET.current_rate(),
+            "next_scheduled": (time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.schedule_job.deadline))
+                               if self.schedule_job and self.schedule_job.deadline else None),
+        }
+
 
 # 🔧 실시간 파일 삭제 감지 포함 이벤트 핸들러
-class FileEventHandler(FileSystemEventHandler):
+class FileEventHandler:
     """파일 시스템 이벤트 핸들러 (삭제 감지 포함)"""
+    def __init__(self, engine=None):
+        self.engine = engine or get_default_engine()
+
+    def dispatch(self, event):
+        """watchdog 옵저버가 호출하는 진입점 (FileSystemEventHandler 상속 없이 watchdog 지연 로드)"""
+        handler = getattr(self, f"on_{event.event_type}", None)
+        if handler is not None:
+            if not event.is_directory:
+                metrics.EVENTS.inc(profile=self.engine.profile_name, type=event.event_type)
+            with tracing.span(f"event.{event.event_type}"):
+                handler(event)
+
     def on_created(self, event):
         if not event.is_directory:
             # 파일 형식 체크
             file_ext = os.path.splitext(event.src_path)[1][1:]  # 확장자 추출 (점 제거)
             if self.is_supported_file(file_ext):
-                print(f"\n➕ 새 파일 감지: {os.path.basename(event.src_path)}")
-                upload_file_to_github(event.src_path)
+                log.info(f"\n➕ 새 파일 감지: {os.path.basename(event.src_path)}",
+                         extra=self.engine.log_fields(event="created", path=event.src_path))
+                self.engine.enqueue("upload", event.src_path, PRIORITY_INTERACTIVE)
 
     def on_modified(self, event):
         if not event.is_directory:
             # 파일 형식 체크
             file_ext = os.path.splitext(event.src_path)[1][1:]  # 확장자 추출 (점 제거)
             if self.is_supported_file(file_ext):
-                print(f"\n🔄 파일 수정 감지: {os.path.basename(event.src_path)}")
-                time.sleep(1)  # 파일 쓰기 완료 대기
-                upload_file_to_github(event.src_path)
-    
+                log.info(f"\n🔄 파일 수정 감지: {os.path.basename(event.src_path)}",
+                         extra=self.engine.log_fields(event="modified", path=event.src_path))
+                self.engine.enqueue("upload", event.src_path, PRIORITY_INTERACTIVE)
+
     # 🔧 새로 추가: 파일 삭제 실시간 감지
     def on_deleted(self, event):
         if not event.is_directory:
@@ -347,184 +1394,96 @@ class FileEventHandler(FileSystemEventHandler):
             file_ext = os.path.splitext(event.src_path)[1][1:]  # 확장자 추출 (점 제거)
             if self.is_supported_file(file_ext):
                 filename = os.path.basename(event.src_path)
-                print(f"\n🗑️ 파일 삭제 감지: {filename}")
-                self.handle_file_deletion(filename)
-    
+                log.info(f"\n🗑️ 파일 삭제 감지: {filename}",
+                         extra=self.engine.log_fields(event="deleted", path=event.src_path))
+                self.engine.enqueue("delete", event.src_path, PRIORITY_DELETE)
+
     def handle_file_deletion(self, filename):
         """삭제된 파일을 GitHub에서도 제거"""
-        try:
-            # GitHub에서 파일 정보 가져오기 (sha 필요)
-            url = f"https://api.github.com/repos/{GITHUB_USERNAME}/{REPO_NAME}/contents/{filename}"
-            headers = {"Authorization": f"token {GITHUB_TOKEN}"}
-            
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                file_data = response.json()
-                sha = file_data.get('sha')
-                
-                if sha:
-                    success = delete_file_from_github(filename, sha)
-                    if success:
-                        print(f"  ✅ 실시간 삭제 완료: {filename}")
-                    else:
-                        print(f"  ❌ 실시간 삭제 실패: {filename}")
-                else:
-                    print(f"  ⚠️ {filename}의 SHA를 가져올 수 없습니다.")
-            elif response.status_code == 404:
-                print(f"  ℹ️ {filename}는 이미 GitHub에 없습니다.")
-            else:
-                print(f"  ⚠️ {filename} 정보 조회 실패: {response.status_code}")
-                
-        except Exception as e:
-            print(f"  ❌ {filename} 삭제 처리 중 오류: {e}")
-    
+        return self.engine.delete_file_by_name(filename)
+
     def is_supported_file(self, file_ext):
         """지원되는 파일 형식인지 확인"""
-        file_extensions_str = os.getenv('FILE_EXTENSIONS', 'py,txt,md,json,js,html,css')
-        supported_extensions = [ext.strip() for ext in file_extensions_str.split(',')]
-        return file_ext.lower() in supported_extensions
+        return file_ext.lower() in self.engine.get_extensions()
+
+
+class ConfigFileHandler:
+    """설정 파일(.env) 변경 감지 → 엔진에 다시 읽기 요청"""
+    def __init__(self, engine):
+        self.engine = engine
+        self.config_path = os.path.abspath(engine.env_path)
+
+    def dispatch(self, event):
+        if event.is_directory:
+            return
+        # 저장 방식에 따라 바로 수정되거나 임시 파일에서 이름이 바뀜
+        paths = [event.src_path, getattr(event, 'dest_path', None)]
+        if any(path and os.path.abspath(path) == self.config_path for path in paths):
+            self.engine.schedule_reload()
 
-def run_upload_system():
+
+# 기존 함수형 진입점 (기본 엔진 1개에 위임)
+_default_engine = None
+
+def get_default_engine():
+    """모듈 함수들이 사용하는 기본 엔진 (.env)"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = UploadEngine()
+    return _default_engine
+
+def check_env_config():
+    return get_default_engine().check_env_config()
+
+def upload_file_to_github(local_file_path):
+    return get_default_engine().upload_file_to_github(local_file_path)
+
+def get_github_files():
+    return get_default_engine().get_github_files()
+
+def get_local_files():
+    return get_default_engine().get_local_files()
+
+def delete_file_from_github(filename, sha):
+    return get_default_engine().delete_file_from_github(filename, sha)
+
+def sync_deleted_files():
+    return get_default_engine().sync_deleted_files()
+
+def upload_existing_files():
+    return get_default_engine().upload_existing_files()
+
+def scheduled_upload():
+    return get_default_engine().scheduled_upload()
+
+def run_upload_system(started_at=None):
     """메인 업로드 시스템 실행 함수 (GUI에서 호출용)"""
-    global GITHUB_TOKEN, GITHUB_USERNAME, REPO_NAME, WATCH_FOLDER_PATH
-    global UPLOAD_MODE, SCHEDULE_HOUR, SCHEDULE_MINUTE, REPEAT_OPTION, BRANCH, FILE_EXTENSIONS
-    
-    print("🚀 GitHub 자동 업로드 시스템 시작!")
-    print("=" * 60)
-    
-    # .env 파일 로드
-    load_dotenv()
-    
-    # 설정 값 로드
-    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-    GITHUB_USERNAME = os.getenv('GITHUB_USERNAME')
-    REPO_NAME = os.getenv('GITHUB_REPO')
-    WATCH_FOLDER_PATH = os.getenv('WATCH_FOLDER')
-    UPLOAD_MODE = os.getenv('UPLOAD_MODE', 'realtime')
-    SCHEDULE_HOUR = int(os.getenv('SCHEDULE_HOUR', 14))
-    SCHEDULE_MINUTE = int(os.getenv('SCHEDULE_MINUTE', 30))
-    REPEAT_OPTION = os.getenv('REPEAT_OPTION', 'daily')
-    BRANCH = os.getenv('BRANCH', 'main')
-    FILE_EXTENSIONS = os.getenv('FILE_EXTENSIONS', 'py,txt,md,json,js,html,css')
-    
-    # 환경 설정 확인
-    if not check_env_config():
-        print("❌ 설정이 올바르지 않습니다!")
-        return False
-    
-    print(f"✅ 설정 로드 완료!")
-    print(f"📍 사용자: {GITHUB_USERNAME}")
-    print(f"📂 저장소: {REPO_NAME}")
-    print(f"👀 감시 폴더: {WATCH_FOLDER_PATH}")
-    print(f"🔧 업로드 모드: {UPLOAD_MODE}")
-    print(f"📄 지원 파일 형식: {FILE_EXTENSIONS}")
-    
-    # 기존 파일 자동 업로드 + 삭제 동기화
-    upload_existing_files()
-    
-    # 실시간 감시 시작
-    observer = None
-    if UPLOAD_MODE in ["realtime", "hybrid"]:
-        if not os.path.exists(WATCH_FOLDER_PATH):
-            os.makedirs(WATCH_FOLDER_PATH)
-            print(f"📁 감시 폴더를 생성했습니다: {WATCH_FOLDER_PATH}")
-        
-        event_handler = FileEventHandler()
-        observer = Observer()
-        observer.schedule(event_handler, WATCH_FOLDER_PATH, recursive=False)
-        observer.start()
-        print("🔄 실시간 파일 감시 시작! (추가/수정/삭제 모두 감지)")  # 🔧 메시지 업데이트
-    
-    # 스케줄러 시작
-    if UPLOAD_MODE in ["schedule", "hybrid"]:
-        setup_scheduler()
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
-    
-    print("=" * 60)
-    print("📂 GitHub 자동 업로드 시스템이 실행 중입니다...")
-    print("💡 감시 폴더에서 파일을 추가/수정/삭제하면 자동으로 GitHub에 반영됩니다.")  # 🔧 메시지 업데이트
-    
-    return True
+    return get_default_engine().run(started_at)
 
 if __name__ == "__main__":
-    # .env 파일 로드
-    load_dotenv()
-    
-    # 설정 값 로드
-    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-    GITHUB_USERNAME = os.getenv('GITHUB_USERNAME')
-    REPO_NAME = os.getenv('GITHUB_REPO')
-    WATCH_FOLDER_PATH = os.getenv('WATCH_FOLDER')
-    UPLOAD_MODE = os.getenv('UPLOAD_MODE', 'realtime')
-    SCHEDULE_HOUR = int(os.getenv('SCHEDULE_HOUR', 14))
-    SCHEDULE_MINUTE = int(os.getenv('SCHEDULE_MINUTE', 30))
-    REPEAT_OPTION = os.getenv('REPEAT_OPTION', 'daily')
-    BRANCH = os.getenv('BRANCH', 'main')
-    FILE_EXTENSIONS = os.getenv('FILE_EXTENSIONS', 'py,txt,md,json,js,html,css')
-    
-    # 환경 설정 확인
-    if not check_env_config():
+    if not run_upload_system(started_at=PROCESS_STARTED_AT):
+        upload_log.flush()
         input("⏸️ 아무 키나 눌러서 종료...")
         exit(1)
-    
-    print(f"✅ 설정 로드 완료!")
-    print(f"📍 사용자: {GITHUB_USERNAME}")
-    print(f"📂 저장소: {REPO_NAME}")
-    print(f"👀 감시 폴더: {WATCH_FOLDER_PATH}")
-    print(f"🔧 업로드 모드: {UPLOAD_MODE}")
-    print(f"📄 지원 파일 형식: {FILE_EXTENSIONS}")
-    
-    # 기존 파일 자동 업로드 + 삭제 동기화
-    upload_existing_files()
-    
-    # 실시간 감시 시작
-    observer = None
-    if UPLOAD_MODE in ["realtime", "hybrid"]:
-        if not os.path.exists(WATCH_FOLDER_PATH):
-            os.makedirs(WATCH_FOLDER_PATH)
-            print(f"📁 감시 폴더를 생성했습니다: {WATCH_FOLDER_PATH}")
-        
-        event_handler = FileEventHandler()
-        observer = Observer()
-        observer.schedule(event_handler, WATCH_FOLDER_PATH, recursive=False)
-        observer.start()
-        print("🔄 실시간 파일 감시 시작! (추가/수정/삭제 모두 감지)")
-    
-    # 스케줄러 시작
-    if UPLOAD_MODE in ["schedule", "hybrid"]:
-        setup_scheduler()
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
-    
-    print("=" * 60)
-    print("📂 GitHub 자동 업로드 시스템이 실행 중입니다...")
-    print("💡 감시 폴더에서 파일을 추가/수정/삭제하면 자동으로 GitHub에 반영됩니다.")
-    print("(Ctrl+C를 눌러서 종료)")
-    
-    # 상태 표시
-    spinner = ['|', '/', '-', '\\']
-    i = 0
-    
+
+    log.info("(Ctrl+C를 눌러서 종료)")
+    engine = get_default_engine()
+
+    # 상태 표시 (한 번만 출력, 로그 줄과 섞이지 않도록)
+    mode_text = {
+        "realtime": "실시간 감시 (추가/수정/삭제)",
+        "schedule": f"예약 업로드 ({engine.schedule_hour:02d}:{engine.schedule_minute:02d})",
+        "hybrid": f"실시간 + 예약 ({engine.schedule_hour:02d}:{engine.schedule_minute:02d})"
+    }
+    log.info(f"  👀 {mode_text.get(engine.upload_mode, '감시')} 중...")
+
     try:
-        while True:
-            mode_text = {
-                "realtime": "실시간 감시 (추가/수정/삭제)",
-                "schedule": f"예약 업로드 ({SCHEDULE_HOUR:02d}:{SCHEDULE_MINUTE:02d})",
-                "hybrid": f"실시간 + 예약 ({SCHEDULE_HOUR:02d}:{SCHEDULE_MINUTE:02d})"
-            }
-            
-            print(f"  👀 {mode_text.get(UPLOAD_MODE, '감시')} 중... {spinner[i % len(spinner)]}", 
-                  end='\r', flush=True)
-            i += 1
-            time.sleep(0.5)
-            
+        # 제어 소켓으로 stop 명령을 받으면 엔진이 멈추고 대기 종료
+        engine.wait_until_stopped()
+
     except KeyboardInterrupt:
-        if observer:
-            observer.stop()
-        print("\n🛑 시스템을 종료합니다...")
-        
-    if observer:
-        observer.join()
-    
-    print("👋 GitHub 자동 업로드 시스템이 종료되었습니다.")
\ No newline at end of file
+        log.info("\n🛑 시스템을 종료합니다...")
+
+    engine.stop()
+
+    log.info("👋 GitHub 자동 업로드 시스템이 종료되었습니다.")
@@ -0,0 +1,292 @@
+# metrics.py - Prometheus 형식 지표 (카운터/게이지/히스토그램) + localhost /metrics 엔드포인트
+#
+#   .env 또는 환경변수에 METRICS_PORT=9464 를 넣으면 http://127.0.0.1:9464/metrics 로 수집 가능
+#
+# 값은 쓰레드별 칸에 따로 더하고 수집할 때 합치므로 업로드 경로에서 잠금을 기다리지 않습니다.
+import time
+import bisect
+import socket
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import upload_log
+
+log = upload_log.get_logger(__name__)
+
+METRICS_HOST = "127.0.0.1"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+WAKEUP_WINDOW = 60      # 분당 깨어난 횟수 계산 구간 (초)
+WAKEUP_SAMPLES = 10000  # 구간 계산용으로 보관할 최근 깨어난 시각 수
+
+
+def _label_text(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._slots = {}  # 쓰레드 id → {라벨 값: 값} (각 쓰레드는 자기 칸에만 씀)
+        self._lock = threading.Lock()  # 칸 생성/수집할 때만 사용
+
+    def _key(self, labels):
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def _slot(self):
+        ident = threading.get_ident()
+        slot = self._slots.get(ident)
+        if slot is None:
+            with self._lock:
+                slot = self._slots[ident] = {}
+        return slot
+
+    def _collect_slots(self):
+        with self._lock:
+            return [dict(slot) for slot in self._slots.values()]
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """증가만 하는 값"""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        slot = self._slot()
+        key = self._key(labels)
+        slot[key] = slot.get(key, 0) + amount
+
+    def values(self):
+        totals = {}
+        for slot in self._collect_slots():
+            for key, value in slot.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def render(self):
+        lines = self.header()
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_label_text(self.labels, key)} {_format(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """현재 값 (직접 설정하거나 수집할 때 함수 호출)"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}     # 라벨 값 → 값 (대입은 원자적이라 잠금 없음)
+        self._functions = {}  # 라벨 값 → 함수
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function, **labels):
+        """수집할 때마다 function()으로 값 계산 (대기 작업 수 등)"""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def remove(self, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._functions.pop(key, None)
+        self._values.pop(key, None)
+
+    def render(self):
+        lines = self.header()
+        values = dict(self._values)
+        with self._lock:
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                continue
+        for key, value in sorted(values.items()):
+            if value is not None:
+                lines.append(f"{self.name}{_label_text(self.labels, key)} {_format(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """값 분포 (구간별 누적 개수 + 합계)"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        slot = self._slot()
+        key = self._key(labels)
+        entry = slot.get(key)
+        if entry is None:
+            entry = slot[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self):
+        lines = self.header()
+        merged = {}
+        for slot in self._collect_slots():
+            for key, (counts, total) in slot.items():
+                target = merged.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                for index, count in enumerate(counts):
+                    target[0][index] += count
+                target[1] += total
+        for key, (counts, total) in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {_format(total)}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# 업로더 지표 (모두 profile 라벨로 구분)
+EVENTS = REGISTRY.counter("uploader_events_total", "File system events received", ("profile", "type"))
+COALESCED = REGISTRY.counter("uploader_events_coalesced_total",
+                             "Queued tasks merged into an already pending task for the same file", ("profile",))
+UPLOADS = REGISTRY.counter("uploader_uploads_total", "File uploads by result", ("profile", "action", "result"))
+DELETES = REGISTRY.counter("uploader_deletes_total", "File deletes by result", ("profile", "result"))
+BYTES_SENT = REGISTRY.counter("uploader_bytes_sent_total", "Encoded content bytes uploaded", ("profile",))
+API_CALLS = REGISTRY.counter("uploader_api_calls_total", "GitHub API requests", ("profile", "method", "status"))
+API_SECONDS = REGISTRY.histogram("uploader_api_request_seconds", "GitHub API request duration", ("profile",))
+RATE_REMAINING = REGISTRY.gauge("uploader_rate_limit_remaining", "Remaining core API calls (last response)",
+                                ("profile",))
+QUEUE_DEPTH = REGISTRY.gauge("uploader_queue_depth", "Pending upload/delete tasks", ("profile",))
+OLDEST_PENDING = REGISTRY.gauge("uploader_oldest_pending_seconds", "Age of the oldest pending task", ("profile",))
+CONCURRENCY_WINDOW = REGISTRY.gauge("uploader_concurrency_window",
+                                    "Adaptive limit on concurrent upload/delete tasks (AIMD)", ("profile",))
+IN_FLIGHT = REGISTRY.gauge("uploader_in_flight", "Upload/delete tasks being processed", ("profile",))
+THROTTLED = REGISTRY.counter("uploader_throttled_total", "GitHub rate-limit or congestion responses",
+                             ("profile", "status"))
+SAVE_TO_COMMIT = REGISTRY.histogram("uploader_save_to_commit_seconds",
+                                    "Time from the last save of a file to its commit", ("profile",))
+WAKEUPS = REGISTRY.counter("uploader_wakeups_total", "Uploader thread wakeups by source", ("source",))
+WAKEUP_RATE = REGISTRY.gauge("uploader_wakeups_per_minute", "Uploader thread wakeups in the last minute")
+
+_wakeup_times = deque(maxlen=WAKEUP_SAMPLES)
+
+
+def wakeup(source):
+    """대기 중이던 쓰레드가 깨어남 (파일 이벤트, 큐 작업, 예약 시각, 제어 명령 등)"""
+    WAKEUPS.inc(source=source)
+    _wakeup_times.append(time.monotonic())
+
+
+def wakeups_per_minute():
+    """최근 WAKEUP_WINDOW초 동안 깨어난 횟수 (유휴 상태면 0이어야 함)"""
+    cutoff = time.monotonic() - WAKEUP_WINDOW
+    return sum(1 for at in list(_wakeup_times) if at >= cutoff)
+
+
+WAKEUP_RATE.set_function(wakeups_per_minute)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        wakeup("metrics")
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        data = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, host=METRICS_HOST):
+    """지표 엔드포인트 시작 (이미 실행 중이면 그대로) → 주소, 실패하면 None"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _Handler)
+            except (OSError, ValueError) as e:
+                log.warning(f"⚠️ 지표 엔드포인트를 열 수 없습니다 ({host}:{port}): {e}")
+                return None
+            _server.daemon_threads = True
+            # 주기적으로 종료 요청을 확인하지 않고 연결이 올 때만 깨어남 (stop_server가 빈 연결로 깨움)
+            threading.Thread(target=_server.serve_forever, kwargs={"poll_interval": None}, daemon=True).start()
+            log.info(f"📊 지표 엔드포인트: http://{host}:{_server.server_address[1]}/metrics")
+        return f"http://{host}:{_server.server_address[1]}/metrics"
+
+
+def stop_server():
+    global _server
+    with _server_lock:
+        server, _server = _server, None
+    if server is not None:
+        stopper = threading.Thread(target=server.shutdown, daemon=True)
+        stopper.start()
+        while stopper.is_alive():  # 연결을 기다리는 처리 루프를 빈 연결로 깨움
+            try:
+                socket.create_connection(server.server_address[:2], timeout=1).close()
+            except OSError:
+                break
+            stopper.join(0.1)
+        server.server_close()
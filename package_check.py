@@ -0,0 +1,88 @@
+# package_check.py - 필수 패키지 설치 여부 확인 (실제로 import 하지 않고 메타데이터만 조회)
+import os
+import sys
+import json
+import importlib.util
+from importlib import metadata
+
+# (pip 패키지 이름, import 이름)
+REQUIRED_PACKAGES = [
+    ('PyGithub', 'github'),
+    ('python-dotenv', 'dotenv'),
+    ('watchdog', 'watchdog'),
+    ('requests', 'requests'),
+    ('beautifulsoup4', 'bs4'),
+]
+
+PACKAGE_CACHE_FILE = ".package_cache.json"
+
+
+def _site_signature():
+    """패키지 설치 폴더들의 수정 시각 (설치/삭제가 있으면 바뀜)"""
+    signature = {}
+    for path in sys.path:
+        if ('site-packages' in path or 'dist-packages' in path) and os.path.isdir(path):
+            try:
+                signature[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+    return signature
+
+
+def _lookup(package_name, import_name):
+    """설치되어 있으면 버전 문자열, 없으면 None"""
+    try:
+        if importlib.util.find_spec(import_name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    try:
+        return metadata.version(package_name)
+    except metadata.PackageNotFoundError:
+        return "Unknown"
+
+
+def _load_cache():
+    try:
+        with open(PACKAGE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    try:
+        with open(PACKAGE_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+
+def package_status(use_cache=True):
+    """{패키지 이름: 버전 또는 None} - 인터프리터 경로별로 캐시"""
+    interpreter = sys.executable
+    signature = _site_signature()
+    cache = _load_cache()
+
+    entry = cache.get(interpreter)
+    if use_cache and entry and entry.get('signature') == signature:
+        packages = entry.get('packages', {})
+        if all(name in packages for name, _ in REQUIRED_PACKAGES):
+            return packages
+
+    packages = {name: _lookup(name, import_name) for name, import_name in REQUIRED_PACKAGES}
+    cache[interpreter] = {'signature': signature, 'packages': packages}
+    _save_cache(cache)
+    return packages
+
+
+def missing_packages(use_cache=True):
+    """설치되지 않은 패키지 이름 목록"""
+    return [name for name, version in package_status(use_cache).items() if version is None]
+
+
+def invalidate_cache():
+    """현재 인터프리터의 캐시 삭제 (패키지 설치 후 호출)"""
+    cache = _load_cache()
+    if cache.pop(sys.executable, None) is not None:
+        _save_cache(cache)
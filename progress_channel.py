@@ -0,0 +1,167 @@
+# progress_channel.py - 업로더 → GUI 진행 상황 푸시 채널 (로컬 소켓, JSON 한 줄씩)
+#
+# GUI가 만든 구독 소켓 주소(토큰 포함)는 업로더 프로세스 환경변수로만 넘기고,
+# 업로더는 연결하자마자 토큰 1줄을 보냅니다. 토큰이 맞지 않는 연결은 버립니다.
+import json
+import time
+import threading
+from collections import deque
+import upload_log
+from local_socket import LocalServer, connect, token_matches
+
+log = upload_log.get_logger(__name__)
+
+PROGRESS_ADDR_ENV = "UPLOAD_PROGRESS_ADDR"  # GUI가 구독 주소를 넘겨줄 때 쓰는 환경변수
+SEND_QUEUE_LIMIT = 1000                     # 전송 대기 이벤트 최대 개수 (넘으면 오래된 것부터 버림)
+THROUGHPUT_WINDOW = 10.0                    # 전송 속도 계산 구간 (초)
+
+
+class ThroughputMeter:
+    """최근 구간의 전송 바이트로 초당 전송량 계산"""
+    def __init__(self, window=THROUGHPUT_WINDOW):
+        self.window = window
+        self._samples = deque()
+        self._lock = threading.Lock()
+
+    def add(self, byte_count):
+        with self._lock:
+            self._samples.append((time.monotonic(), byte_count))
+
+    def rate(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._samples and now - self._samples[0][0] > self.window:
+                self._samples.popleft()
+            total = sum(count for _, count in self._samples)
+        return total / self.window
+
+
+class ProgressPublisher:
+    """업로더 쪽: 진행 이벤트를 구독자(같은 프로세스 콜백 / 소켓)에게 전달
+
+    소켓 전송은 별도 쓰레드에서 처리하므로 업로드 경로는 막히지 않습니다.
+    """
+    def __init__(self):
+        self._listeners = []
+        self._sockets = []
+        self._pending = deque(maxlen=SEND_QUEUE_LIMIT)
+        self._cond = threading.Condition()
+        self._sender = None
+
+    def add_listener(self, callback):
+        """같은 프로세스 구독자 등록 (GUI 내장 엔진용)"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def connect(self, address):
+        """GUI의 구독 소켓에 연결 (첫 줄로 토큰 전송)"""
+        try:
+            sock, token = connect(address, timeout=3)
+            sock.sendall((json.dumps({"token": token}) + "\n").encode("utf-8"))
+            sock.settimeout(None)
+        except (OSError, ValueError) as e:
+            log.warning(f"⚠️ 진행 상황 채널 연결 실패 ({address}): {e}")
+            return False
+        self.attach_socket(sock)
+        return True
+
+    def attach_socket(self, sock):
+        """이미 연결된 소켓을 구독자로 추가"""
+        with self._cond:
+            self._sockets.append(sock)
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._send_loop, daemon=True)
+                self._sender.start()
+
+    def publish(self, event_type, **fields):
+        """이벤트 발행"""
+        event = {"type": event_type, "ts": time.time()}
+        event.update(fields)
+
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                log.warning(f"⚠️ 진행 상황 콜백 오류: {e}")
+
+        if self._sockets:
+            with self._cond:
+                self._pending.append(event)
+                self._cond.notify()
+
+    def _send_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                events = list(self._pending)
+                self._pending.clear()
+                sockets = list(self._sockets)
+
+            data = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events).encode("utf-8")
+            for sock in sockets:
+                try:
+                    sock.sendall(data)
+                except OSError:
+                    with self._cond:
+                        if sock in self._sockets:
+                            self._sockets.remove(sock)
+                    sock.close()
+
+    def close(self):
+        with self._cond:
+            for sock in self._sockets:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+            self._sockets = []
+
+
+class ProgressSubscriber:
+    """GUI 쪽: 로컬 소켓에서 진행 이벤트를 받아 콜백 호출 (폴링 없음)"""
+    def __init__(self, callback):
+        self.callback = callback
+        self._server = LocalServer("progress")
+        self._closed = False
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    @property
+    def address(self):
+        return self._server.address
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self._server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._read_loop, args=(conn,), daemon=True).start()
+
+    def _authenticated(self, stream):
+        try:
+            hello = json.loads(stream.readline() or "{}")
+        except ValueError:
+            return False
+        return isinstance(hello, dict) and token_matches(self._server.token, hello.get("token"))
+
+    def _read_loop(self, conn):
+        with conn, conn.makefile("r", encoding="utf-8") as stream:
+            if not self._authenticated(stream):
+                return
+            for line in stream:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                try:
+                    self.callback(event)
+                except Exception as e:
+                    log.warning(f"⚠️ 진행 상황 처리 오류: {e}")
+
+    def close(self):
+        self._closed = True
+        self._server.close()
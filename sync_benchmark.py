@@ -0,0 +1,633 @@
+# sync_benchmark.py - 로컬 GitHub API 서버(fake_github)를 상대로 한 동기화 성능 측정
+#
+#   python sync_benchmark.py run [--files 200] [--sizes lognormal:4096] [--depth 0] [--seed 1]
+#                                [--edits 100] [--edit-rate 20] [--latency 0.02] [--trace 파일]
+#                                [--scenario initial ...] [--out 결과.json]
+#   python sync_benchmark.py record 폴더 --seconds 60 --out trace.jsonl   실제 파일 이벤트 기록
+#   python sync_benchmark.py compare 이전.json 새.json [--threshold 0.1]    결과 비교 (회귀 시 종료 코드 1)
+#
+# 시나리오 (각각 새 프로세스에서 실행 → 최대 메모리를 시나리오별로 측정)
+#   initial    빈 저장소에 기존 파일 업로드 (upload_existing_files)
+#   resync     변경 없이 다시 동기화 (upload_existing_files, 트리 비교로 끝나야 함)
+#   scheduled  일부 파일 수정/삭제 후 예약 업로드 (scheduled_upload)
+#   storm      실시간 감시 중 연속 저장 (FileEventHandler)
+#   replay     기록된 이벤트 재생 (--trace 필요, FileEventHandler)
+#   idle       실시간 + 예약 모드로 아무 변경 없이 대기 (분당 깨어난 횟수, --idle-seconds)
+import os
+import sys
+import json
+import time
+import math
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import contextlib
+import subprocess
+
+RESULTS_DIR = ".benchmarks"
+RESULT_VERSION = 1
+SCENARIOS = ("initial", "resync", "scheduled", "storm", "replay", "idle")
+PROFILE_NAME = "benchmark"
+OWNER = "bench"
+REPO = "bench-repo"
+EXTENSION = "txt"
+IDLE_TIMEOUT = 120  # 실시간 시나리오: 마지막 커밋까지 최대 대기 (초, 넘으면 settled=false)
+
+# 비교할 지표: 이름 → 높을수록 좋으면 True
+METRICS = {
+    "files_per_sec": True,
+    "api_calls_per_file": False,
+    "seconds": False,
+    "latency_p50": False,
+    "latency_p95": False,
+    "latency_p99": False,
+    "peak_rss_kb": False,
+    "wakeups_per_minute": False,
+    "thread_wakeups_per_minute": False,
+}
+
+
+def parse_sizes(spec):
+    """크기 분포 문자열 → (rng → 크기) 함수
+
+    fixed:N, uniform:최소-최대, lognormal:중앙값[:sigma]
+    """
+    kind, _, value = spec.partition(":")
+    if kind == "fixed":
+        size = int(value)
+        return lambda rng: size
+    if kind == "uniform":
+        low, _, high = value.partition("-")
+        return lambda rng: rng.randint(int(low), int(high))
+    if kind == "lognormal":
+        median, _, sigma = value.partition(":")
+        mu, sigma = math.log(int(median)), float(sigma or 1.0)
+        return lambda rng: max(1, int(rng.lognormvariate(mu, sigma)))
+    raise ValueError(f"알 수 없는 크기 분포: {spec}")
+
+
+def make_content(rng, size):
+    """재현 가능한 텍스트 내용 (같은 seed → 같은 내용)"""
+    line = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789 ") for _ in range(63)) + "\n"
+    data = (line * (size // len(line) + 1))[:size]
+    return data.encode("ascii")
+
+
+def generate_folder(folder, count, sizes, depth, rng):
+    """감시 폴더 생성 → 생성한 상대 경로 목록
+
+    depth > 0이면 일부 파일을 하위 폴더에 만듭니다. 감시는 폴더 1단계만 하므로
+    하위 폴더 파일은 동기화 대상이 아니고 스캔 비용만 늘립니다.
+    """
+    paths = []
+    for index in range(count):
+        level = rng.randint(0, depth) if depth else 0
+        parts = [f"d{rng.randint(0, 3)}" for _ in range(level)] + [f"file_{index:05d}.{EXTENSION}"]
+        rel_path = os.path.join(*parts)
+        full_path = os.path.join(folder, rel_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(make_content(rng, sizes(rng)))
+        paths.append(rel_path)
+    return paths
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return round(ordered[index], 4)
+
+
+def peak_rss_kb():
+    """현재 프로세스의 최대 메모리 사용량 (KB, 알 수 없으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak  # macOS는 바이트 단위
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize // 1024
+    return None
+
+
+def thread_switches(exclude=()):
+    """쓰레드별 자발적 문맥 전환 횟수 {쓰레드 id: 횟수} (= 잠들었다 깨어난 횟수, Linux만)"""
+    counts = {}
+    try:
+        tids = os.listdir("/proc/self/task")
+    except OSError:
+        return None
+    for tid in tids:
+        if int(tid) in exclude:
+            continue
+        try:
+            with open(f"/proc/self/task/{tid}/status", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("voluntary_ctxt_switches:"):
+                        counts[int(tid)] = int(line.split()[1])
+        except OSError:
+            continue
+    return counts
+
+
+class Workspace:
+    """시나리오 1개의 작업 폴더 + 로컬 API 서버 + 업로드 엔진"""
+    def __init__(self, options):
+        from fake_github import FakeGitHub
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.sizes = parse_sizes(options["sizes"])
+        self.root = tempfile.mkdtemp(prefix="sync_bench_")
+        self.folder = os.path.join(self.root, "watch")
+        os.makedirs(self.folder)
+        os.chdir(self.root)  # 동기화 기록/업로드 기록/실행 잠금 파일을 작업 폴더에 생성
+        self.fake = FakeGitHub(latency=options["latency"], jitter=options["jitter"],
+                               secondary_writes_per_minute=None)
+        self.fake.start()
+        self.engine = None
+        self.commits = {}  # 파일명 → [커밋 완료 시각]
+        self._lock = threading.Lock()
+
+    def write_env(self, upload_mode, extra=""):
+        with open(f".env_{PROFILE_NAME}", "w", encoding="utf-8") as f:
+            f.write(f"GITHUB_TOKEN=ghp_benchmark_token_0000\nGITHUB_USERNAME={OWNER}\nGITHUB_REPO={REPO}\n"
+                    f"WATCH_FOLDER={self.folder}\nUPLOAD_MODE={upload_mode}\nFILE_EXTENSIONS={EXTENSION}\n"
+                    f"GITHUB_API_URL={self.fake.url}\n{extra}")
+
+    def create_engine(self, upload_mode="realtime", extra=""):
+        import main_upload
+        self.write_env(upload_mode, extra)
+        self.engine = main_upload.UploadEngine(env_path=f".env_{PROFILE_NAME}", profile_name=PROFILE_NAME)
+        self.engine.progress.add_listener(self.on_event)
+        return self.engine
+
+    def on_event(self, event):
+        if event["type"] == "task_done" and event.get("success"):
+            with self._lock:
+                self.commits.setdefault(event["path"], []).append(time.monotonic())
+
+    def seed_remote(self, paths):
+        """저장소에 현재 파일을 미리 올려 두기 (API 호출로 세지 않음)"""
+        files = {}
+        for rel_path in paths:
+            with open(os.path.join(self.folder, rel_path), "rb") as f:
+                files[rel_path.replace(os.sep, "/")] = f.read()
+        self.fake.create_repo(OWNER, REPO, files=files)
+
+    def synced_paths(self, paths):
+        return [path for path in paths if os.sep not in path]
+
+    def start_batch(self):
+        """1회 동기화 방식으로 엔진 준비 (감시 없이 큐 처리 쓰레드만)"""
+        from main_upload import STATE_RUNNING
+        if not self.engine.prepare():
+            raise RuntimeError("엔진을 시작하지 못했습니다.")
+        self.engine.start_workers()
+        self.engine._set_state(STATE_RUNNING)
+
+    def wait_for_remote(self, expected, timeout=IDLE_TIMEOUT):
+        """저장소 내용이 expected({파일명: blob sha 또는 None})와 같아질 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            remote = self.fake.files(OWNER, REPO)
+            if all(remote.get(name) == sha for name, sha in expected.items()):
+                if self.engine.queue.qsize() == 0 and self.engine.in_flight == 0:
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.stop()
+        self.fake.stop()
+        os.chdir(os.path.dirname(self.root))
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def latencies(saves, commits):
+    """저장 시각 → 그 이후 첫 커밋 시각까지 걸린 시간 목록"""
+    result = []
+    for name, saved_at in saves:
+        done = [at for at in commits.get(name, []) if at >= saved_at]
+        if done:
+            result.append(done[0] - saved_at)
+    return result
+
+
+def local_shas(folder, names):
+    from file_hasher import git_blob_sha
+    shas = {}
+    for name in names:
+        path = os.path.join(folder, name)
+        shas[name] = git_blob_sha(path) if os.path.exists(path) else None
+    return shas
+
+
+def summarize(files, seconds, api_calls, latency_values=None, **extra):
+    result = {
+        "files": files,
+        "seconds": round(seconds, 3),
+        "files_per_sec": round(files / seconds, 2) if seconds > 0 and files else None,
+        "api_calls": api_calls,
+        "api_calls_per_file": round(api_calls / files, 3) if files else None,
+    }
+    if latency_values is not None:
+        result.update({
+            "latency_p50": percentile(latency_values, 0.50),
+            "latency_p95": percentile(latency_values, 0.95),
+            "latency_p99": percentile(latency_values, 0.99),
+            "latency_samples": len(latency_values),
+        })
+    result.update(extra)
+    return result
+
+
+def scenario_initial(ws):
+    paths = generate_folder(ws.folder, ws.options["files"], ws.sizes, ws.options["depth"], ws.rng)
+    ws.create_engine()
+    ws.start_batch()
+    started = time.perf_counter()
+    ws.engine.upload_existing_files()
+    seconds = time.perf_counter() - started
+    return summarize(len(ws.synced_paths(paths)), seconds, ws.fake.stats()["total"],
+                     failed=ws.engine.error_count)
+
+
+def scenario_resync(ws):
+    paths = generate_folder(ws.folder, ws.options["files"], ws.sizes, ws.options["depth"], ws.rng)
+    ws.create_engine()
+    ws.start_batch()
+    ws.engine.upload_existing_files()
+    ws.engine.manifest.save()
+    ws.fake.reset_stats()
+    time.sleep(2.1)  # 방금 해시한 파일은 수정 시각 해상도 때문에 다시 해시하므로 잠시 대기
+
+    started = time.perf_counter()
+    ws.engine.upload_existing_files()
+    seconds = time.perf_counter() - started
+    return summarize(len(ws.synced_paths(paths)), seconds, ws.fake.stats()["total"],
+                     failed=ws.engine.error_count)
+
+
+def scenario_scheduled(ws):
+    paths = generate_folder(ws.folder, ws.options["files"], ws.sizes, ws.options["depth"], ws.rng)
+    synced = ws.synced_paths(paths)
+    ws.seed_remote(synced)
+
+    # 10% 수정, 2% 삭제
+    changed = ws.rng.sample(synced, max(1, len(synced) // 10))
+    for rel_path in changed:
+        with open(os.path.join(ws.folder, rel_path), "wb") as f:
+            f.write(make_content(ws.rng, ws.sizes(ws.rng)))
+    removed = ws.rng.sample([path for path in synced if path not in changed], max(1, len(synced) // 50))
+    for rel_path in removed:
+        os.remove(os.path.join(ws.folder, rel_path))
+
+    ws.create_engine(upload_mode="schedule")
+    ws.start_batch()
+    ws.fake.reset_stats()
+    started = time.perf_counter()
+    ws.engine.scheduled_upload()
+    seconds = time.perf_counter() - started
+    return summarize(len(changed) + len(removed), seconds, ws.fake.stats()["total"],
+                     scanned=len(synced), failed=ws.engine.error_count)
+
+
+def run_realtime(ws, paths, apply_events):
+    """감시를 시작하고 apply_events(saves 목록에 (파일명, 저장 시각) 추가)를 실행한 뒤 반영될 때까지 측정"""
+    ws.seed_remote(ws.synced_paths(paths))
+    ws.create_engine()
+    if not ws.engine.run():
+        raise RuntimeError("엔진을 시작하지 못했습니다.")
+    time.sleep(1)  # 초기 동기화(트리 비교) 완료 대기
+    ws.fake.reset_stats()
+
+    saves = []
+    started = time.perf_counter()
+    apply_events(saves)
+    touched = sorted({name for name, _ in saves})
+    settled = ws.wait_for_remote(local_shas(ws.folder, touched))
+    seconds = time.perf_counter() - started
+    return summarize(len(touched), seconds, ws.fake.stats()["total"], latencies(saves, ws.commits),
+                     events=len(saves), settled=settled, failed=ws.engine.error_count)
+
+
+def scenario_storm(ws):
+    paths = generate_folder(ws.folder, ws.options["files"], ws.sizes, 0, ws.rng)
+    hot = ws.rng.sample(paths, max(1, len(paths) // 10))  # 자주 저장하는 파일 10%
+    interval = 1.0 / ws.options["edit_rate"]
+
+    def apply_events(saves):
+        for _ in range(ws.options["edits"]):
+            rel_path = ws.rng.choice(hot)
+            with open(os.path.join(ws.folder, rel_path), "wb") as f:
+                f.write(make_content(ws.rng, ws.sizes(ws.rng)))
+            saves.append((rel_path, time.monotonic()))
+            time.sleep(interval)
+
+    return run_realtime(ws, paths, apply_events)
+
+
+def load_trace(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def scenario_replay(ws):
+    trace = load_trace(ws.options["trace"])
+    speed = ws.options["speed"]
+    # 기록 시작 시점에 있던 파일 (처음 이벤트가 수정/삭제/이동인 파일)
+    existing = {}
+    for event in trace:
+        name = event["path"]
+        if name not in existing:
+            existing[name] = event["type"] != "created"
+    paths = [name for name, present in existing.items() if present]
+    for name in paths:
+        with open(os.path.join(ws.folder, name), "wb") as f:
+            f.write(make_content(ws.rng, ws.sizes(ws.rng)))
+
+    def apply_events(saves):
+        started = time.monotonic()
+        for event in trace:
+            delay = started + event["t"] / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            path = os.path.join(ws.folder, event["path"])
+            if event["type"] in ("created", "modified"):
+                with open(path, "wb") as f:
+                    f.write(make_content(ws.rng, event.get("size") or ws.sizes(ws.rng)))
+                saves.append((event["path"], time.monotonic()))
+            elif event["type"] == "deleted":
+                if os.path.exists(path):
+                    os.remove(path)
+                    saves.append((event["path"], time.monotonic()))
+            elif event["type"] == "moved" and os.path.exists(path):
+                # 이동은 감시 핸들러가 처리하지 않으므로 재생만 하고 측정하지 않음
+                os.replace(path, os.path.join(ws.folder, event["dest"]))
+
+    return run_realtime(ws, paths, apply_events)
+
+
+def scenario_idle(ws):
+    import metrics
+    paths = generate_folder(ws.folder, ws.options["files"], ws.sizes, 0, ws.rng)
+    ws.seed_remote(paths)
+    later = time.localtime(time.time() + 12 * 3600)  # 측정 중에 예약이 실행되지 않도록 12시간 뒤
+    ws.create_engine(upload_mode="hybrid", extra=f"SCHEDULE_HOUR={later.tm_hour}\nSCHEDULE_MINUTE={later.tm_min}\n")
+    if not ws.engine.run():
+        raise RuntimeError("엔진을 시작하지 못했습니다.")
+    time.sleep(2)  # 초기 동기화(트리 비교) 완료 대기
+    ws.fake.reset_stats()
+
+    # 로컬 API 서버 쓰레드는 업로더가 아니므로 제외
+    exclude = {ws.fake._thread.native_id, threading.get_native_id()}
+    engine_before = sum(metrics.WAKEUPS.values().values())
+    threads_before = thread_switches(exclude)
+    started = time.perf_counter()
+    time.sleep(ws.options["idle_seconds"])
+    seconds = time.perf_counter() - started
+    threads_after = thread_switches(exclude)
+    engine_wakeups = sum(metrics.WAKEUPS.values().values()) - engine_before
+
+    thread_wakeups = None
+    if threads_before is not None and threads_after is not None:
+        thread_wakeups = sum(count - threads_before.get(tid, 0) for tid, count in threads_after.items())
+    minutes = seconds / 60
+    return summarize(0, seconds, ws.fake.stats()["total"],
+                     wakeups_per_minute=round(engine_wakeups / minutes, 2),
+                     thread_wakeups_per_minute=round(thread_wakeups / minutes, 2) if thread_wakeups is not None else None,
+                     threads=threading.active_count())
+
+
+SCENARIO_FUNCTIONS = {
+    "initial": scenario_initial,
+    "resync": scenario_resync,
+    "scheduled": scenario_scheduled,
+    "storm": scenario_storm,
+    "replay": scenario_replay,
+    "idle": scenario_idle,
+}
+
+
+def run_scenario(name, options):
+    """시나리오 1개 실행 (새 프로세스에서 호출) → 결과 dict"""
+    sys.path.insert(0, options["project_root"])
+    ws = Workspace(options)
+    output = contextlib.nullcontext() if options["verbose"] else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with output:
+        try:
+            result = SCENARIO_FUNCTIONS[name](ws)
+        finally:
+            ws.close()
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def git_revision(project_root):
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def cmd_run(args):
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    scenarios = args.scenario or [name for name in SCENARIOS if name != "replay" or args.trace]
+    if "replay" in scenarios and not args.trace:
+        print("❌ replay 시나리오에는 --trace 파일이 필요합니다.")
+        return 2
+
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    options = {
+        "project_root": project_root,
+        "files": args.files, "sizes": args.sizes, "depth": args.depth, "seed": args.seed,
+        "edits": args.edits, "edit_rate": args.edit_rate, "latency": args.latency, "jitter": args.jitter,
+        "trace": os.path.abspath(args.trace) if args.trace else None,
+        "speed": args.speed, "idle_seconds": args.idle_seconds, "verbose": args.verbose,
+    }
+    report = {
+        "version": RESULT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": git_revision(project_root),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {key: value for key, value in options.items() if key not in ("project_root", "verbose")},
+        "scenarios": {},
+    }
+
+    for name in scenarios:
+        print(f"⏱️ {name} 실행 중...")
+        # 시나리오마다 새 프로세스 (최대 메모리/모듈 상태가 섞이지 않게)
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(run_scenario, name, options).result()
+        report["scenarios"][name] = result
+        print(f"   {format_result(result)}")
+
+    out_path = args.out or os.path.join(RESULTS_DIR, f"sync-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 결과 저장: {out_path}")
+    return 0
+
+
+def format_result(result):
+    parts = [f"{result['files']}개 {result['seconds']}초"]
+    if result.get("files_per_sec") is not None:
+        parts.append(f"{result['files_per_sec']} files/s")
+    if result.get("api_calls_per_file") is not None:
+        parts.append(f"API {result['api_calls']}회 ({result['api_calls_per_file']}/파일)")
+    if result.get("latency_p50") is not None:
+        parts.append(f"지연 p50 {result['latency_p50']}s / p95 {result['latency_p95']}s / p99 {result['latency_p99']}s")
+    if result.get("wakeups_per_minute") is not None:
+        parts.append(f"깨어남 {result['wakeups_per_minute']}회/분")
+    if result.get("thread_wakeups_per_minute") is not None:
+        parts.append(f"쓰레드 깨어남 {result['thread_wakeups_per_minute']}회/분")
+    if result.get("peak_rss_kb"):
+        parts.append(f"최대 메모리 {result['peak_rss_kb'] / 1024:.1f}MB")
+    if result.get("failed"):
+        parts.append(f"❌ 실패 {result['failed']}건")
+    return " | ".join(parts)
+
+
+def cmd_record(args):
+    """실제 폴더의 파일 이벤트를 trace(JSON Lines)로 기록"""
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+
+    folder = os.path.abspath(args.folder)
+    started = time.monotonic()
+    lock = threading.Lock()
+    out = open(args.out, "w", encoding="utf-8")
+
+    class Recorder(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ("created", "modified", "deleted", "moved"):
+                return
+            record = {"t": round(time.monotonic() - started, 4), "type": event.event_type,
+                      "path": os.path.relpath(event.src_path, folder)}
+            if event.event_type == "moved":
+                record["dest"] = os.path.relpath(event.dest_path, folder)
+            elif event.event_type != "deleted":
+                try:
+                    record["size"] = os.path.getsize(event.src_path)
+                except OSError:
+                    pass
+            with lock:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    observer = Observer()
+    observer.schedule(Recorder(), folder, recursive=False)
+    observer.start()
+    print(f"🎙️ {folder} 이벤트 기록 중... ({args.seconds}초, Ctrl+C로 중지)")
+    try:
+        time.sleep(args.seconds)
+    except KeyboardInterrupt:
+        pass
+    observer.stop()
+    observer.join()
+    out.close()
+    print(f"💾 기록 저장: {args.out}")
+    return 0
+
+
+def cmd_compare(args):
+    """두 결과 파일 비교 → 회귀가 있으면 1"""
+    with open(args.old, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"📊 {old.get('git_revision') or args.old} → {new.get('git_revision') or args.new}")
+
+    regressions = 0
+    for name, new_result in new["scenarios"].items():
+        old_result = old["scenarios"].get(name)
+        if not old_result:
+            continue
+        print(f"\n[{name}]")
+        for metric, higher_is_better in METRICS.items():
+            before, after = old_result.get(metric), new_result.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else (0.0 if after == before else math.inf)
+            worse = -change if higher_is_better else change
+            mark = "⚠️" if worse > args.threshold else ("✅" if worse < -args.threshold else "  ")
+            if worse > args.threshold:
+                regressions += 1
+            print(f"  {mark} {metric:<20} {before:>12} → {after:<12} ({change:+.1%})")
+
+    if regressions:
+        print(f"\n⚠️ 회귀 {regressions}건 (기준 {args.threshold:.0%})")
+        return 1
+    print("\n✅ 회귀 없음")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="동기화 성능 측정 (로컬 GitHub API 서버 사용)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="시나리오 실행 후 결과를 JSON으로 저장")
+    run_parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="실행할 시나리오 (반복 가능)")
+    run_parser.add_argument("--files", type=int, default=200, help="생성할 파일 수")
+    run_parser.add_argument("--sizes", default="lognormal:4096",
+                            help="크기 분포 (fixed:N, uniform:최소-최대, lognormal:중앙값[:sigma])")
+    run_parser.add_argument("--depth", type=int, default=0, help="하위 폴더 깊이 (감시 대상은 1단계만)")
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--edits", type=int, default=100, help="storm: 저장 횟수")
+    run_parser.add_argument("--edit-rate", type=float, default=20, help="storm: 초당 저장 횟수")
+    run_parser.add_argument("--latency", type=float, default=0.02, help="API 응답 지연 (초)")
+    run_parser.add_argument("--jitter", type=float, default=0.01, help="추가 무작위 지연 최대값 (초)")
+    run_parser.add_argument("--trace", help="replay: 기록된 이벤트 파일 (record로 생성)")
+    run_parser.add_argument("--speed", type=float, default=1.0, help="replay: 재생 속도 배율")
+    run_parser.add_argument("--idle-seconds", type=float, default=30, help="idle: 대기하며 측정할 시간 (초)")
+    run_parser.add_argument("--out", help=f"결과 파일 (기본: {RESULTS_DIR}/sync-시각.json)")
+    run_parser.add_argument("--verbose", action="store_true", help="업로더 출력 표시")
+    run_parser.set_defaults(func=cmd_run)
+
+    record_parser = subparsers.add_parser("record", help="폴더의 파일 이벤트를 trace로 기록")
+    record_parser.add_argument("folder")
+    record_parser.add_argument("--seconds", type=float, default=60)
+    record_parser.add_argument("--out", default="trace.jsonl")
+    record_parser.set_defaults(func=cmd_record)
+
+    compare_parser = subparsers.add_parser("compare", help="결과 파일 2개 비교")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 변화율")
+    compare_parser.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# sync_manifest.py - 프로필별 동기화 상태 기록 (증분 동기화용)
+import os
+import re
+import json
+import time
+import threading
+from file_hasher import hash_files, git_tree_sha
+
+SYNC_STATE_DIR = ".sync_state"
+MANIFEST_VERSION = 1
+MODE_FILE = "100644"  # 일반 파일 (업로드로 새로 만든 파일의 mode)
+RACY_WINDOW_NS = 2 * 10**9  # 해시 직전 2초 안에 수정된 파일은 다음에 다시 해시 (수정 시각 해상도 대비)
+
+
+def target_key(username, repo_name, branch):
+    """저장소 식별자 (대상이 바뀌면 기록된 GitHub SHA는 버림)"""
+    return f"{username}/{repo_name}@{branch}"
+
+
+class SyncManifest:
+    """로컬 파일 상태(크기/수정 시각/blob SHA)와 마지막으로 확인한 GitHub SHA 기록
+
+    크기와 수정 시각이 그대로인 파일은 다시 해시하지 않고, 기록된 GitHub SHA를
+    믿을 수 있으면 저장소 파일 목록도 다시 조회하지 않습니다.
+    """
+    def __init__(self, profile, state_dir=SYNC_STATE_DIR):
+        name = re.sub(r'[^\w\-.]', '_', profile or 'default')
+        self.path = os.path.join(state_dir, f"{name}.json")
+        self.target = None
+        self.files = {}     # 로컬 절대 경로 → {"size", "mtime_ns", "sha", "checked_ns"}
+        self.remote = None  # GitHub 파일명 → sha (조회한 적 없으면 None)
+        self.remote_extras = {}  # GitHub 루트 트리의 폴더 등 관리하지 않는 항목 {이름: [mode, sha]}
+        self.remote_modes = {}   # 일반 파일(100644)이 아닌 GitHub 파일의 mode {이름: '100755' 등}
+        self.synced_at = None
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """저장된 상태 읽기 (없거나 깨졌으면 빈 상태)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("version") != MANIFEST_VERSION:
+            return self
+        self.target = data.get("target")
+        self.files = data.get("files", {})
+        self.remote = data.get("remote")
+        self.remote_extras = data.get("remote_extras", {})
+        self.remote_modes = data.get("remote_modes", {})
+        self.synced_at = data.get("synced_at")
+        return self
+
+    def save(self):
+        """바뀐 내용이 있으면 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {
+                "version": MANIFEST_VERSION,
+                "target": self.target,
+                "synced_at": self.synced_at,
+                "remote": self.remote,
+                "remote_extras": self.remote_extras,
+                "remote_modes": self.remote_modes,
+                "files": self.files,
+            }
+            self.dirty = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def hashes(self, paths):
+        """{경로: blob SHA} - 크기/수정 시각이 기록과 같으면 저장된 SHA 사용"""
+        result = {}
+        stale = []
+        stats = {}
+        with self._lock:
+            for path in paths:
+                key = os.path.abspath(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    result[path] = None
+                    continue
+                stats[path] = stat
+                entry = self.files.get(key)
+                if (entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+                        and entry["mtime_ns"] + RACY_WINDOW_NS < entry["checked_ns"]):
+                    result[path] = entry["sha"]
+                else:
+                    stale.append(path)
+
+        if stale:
+            checked_ns = time.time_ns()
+            fresh = hash_files(stale)
+            with self._lock:
+                for path in stale:
+                    sha = fresh.get(path)
+                    result[path] = sha
+                    if sha is None:
+                        continue
+                    stat = stats[path]
+                    self.files[os.path.abspath(path)] = {
+                        "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                        "sha": sha, "checked_ns": checked_ns,
+                    }
+                self.dirty = True
+        return result
+
+    def forget_missing(self, paths):
+        """목록에 없는 로컬 파일 기록 삭제"""
+        keep = {os.path.abspath(path) for path in paths}
+        with self._lock:
+            missing = [key for key in self.files if key not in keep]
+            for key in missing:
+                del self.files[key]
+            if missing:
+                self.dirty = True
+
+    def remote_for(self, target):
+        """기록된 GitHub SHA 목록 (대상이 다르거나 없으면 None)"""
+        with self._lock:
+            if self.target != target or self.remote is None:
+                return None
+            return dict(self.remote)
+
+    def set_remote(self, target, files, extras=None, modes=None):
+        """GitHub 파일 목록을 새로 조회한 결과로 교체 (extras: 트리 조회 시 폴더 등, modes: 파일 mode)"""
+        with self._lock:
+            if extras is not None:
+                self.remote_extras = {name: list(entry) for name, entry in extras.items()}
+            elif self.target != target:
+                self.remote_extras = {}
+            if modes is not None:
+                self.remote_modes = dict(modes)
+            elif self.target != target:
+                self.remote_modes = {}
+            self.target = target
+            self.remote = dict(files)
+            self.dirty = True
+
+    def expected_tree(self, local_shas):
+        """로컬 파일이 모두 반영됐을 때의 GitHub 루트 트리 SHA
+
+        local_shas: {파일명: blob sha}. 관리하지 않는 폴더 항목과 파일 mode(실행 파일 등)는 마지막으로 본 값을 사용합니다.
+        """
+        with self._lock:
+            entries = {name: tuple(entry) for name, entry in self.remote_extras.items()}
+            modes = dict(self.remote_modes)
+        for name, sha in local_shas.items():
+            entries[name] = (modes.get(name, MODE_FILE), sha)
+        return git_tree_sha(entries)
+
+    def update_remote(self, filename, sha):
+        """업로드/삭제 후 1건 갱신 (sha가 None이면 삭제)"""
+        with self._lock:
+            if self.remote is None:
+                return
+            if sha:
+                self.remote[filename] = sha
+            else:
+                self.remote.pop(filename, None)
+                self.remote_modes.pop(filename, None)
+            self.dirty = True
+
+    def mark_synced(self):
+        with self._lock:
+            self.synced_at = time.time()
+            self.dirty = True
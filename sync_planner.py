@@ -0,0 +1,125 @@
+# sync_planner.py - 동기화 계획 (실제 업로드/삭제 없이 변경 내용과 API 비용 추정)
+import math
+import time
+
+API_CALLS_PER_UPLOAD = 2          # 기존 파일 SHA 조회(GET) + 업로드(PUT)
+API_CALLS_PER_DELETE = 1          # 삭제 (SHA는 파일 목록에서 알고 있음)
+LISTING_CALLS = 1                 # 시작할 때 저장소 파일 목록 조회
+CONTENT_WRITES_PER_MINUTE = 80    # GitHub 보조 제한 (커밋을 만드는 요청)
+CONTENT_WRITES_PER_HOUR = 500
+DEFAULT_REQUEST_SECONDS = 0.5     # 응답 시간 측정값이 없을 때 요청 1회 예상 시간
+
+
+def encoded_size(size):
+    """base64로 보낼 때의 크기"""
+    return 4 * math.ceil(size / 3)
+
+
+class SyncPlan:
+    """동기화 예정 내용 + 비용 추정"""
+    def __init__(self):
+        self.adds = []            # (파일명, 크기)
+        self.updates = []         # (파일명, 크기)
+        self.deletes = []         # 파일명
+        self.renames = []         # (이전 파일명, 새 파일명, 크기) - 실제로는 추가 + 삭제로 처리
+        self.remote_changed = []  # 마지막 동기화 이후 GitHub에서 바뀐 파일 (업데이트하면 덮어씀)
+        self.unchanged = 0
+        self.api_calls = 0
+        self.commits = 0
+        self.upload_bytes = 0
+        self.estimated_seconds = 0.0
+        self.rate_limit = None    # {"limit", "remaining", "reset"} (오프라인이면 None)
+        self.warnings = []
+
+    @property
+    def is_empty(self):
+        return not (self.adds or self.updates or self.deletes or self.renames)
+
+    def to_dict(self):
+        return {
+            "adds": [{"path": name, "size": size} for name, size in self.adds],
+            "updates": [{"path": name, "size": size} for name, size in self.updates],
+            "deletes": list(self.deletes),
+            "renames": [{"from": old, "to": new, "size": size} for old, new, size in self.renames],
+            "remote_changed": list(self.remote_changed),
+            "unchanged": self.unchanged,
+            "api_calls": self.api_calls,
+            "commits": self.commits,
+            "upload_bytes": self.upload_bytes,
+            "estimated_seconds": round(self.estimated_seconds, 1),
+            "rate_limit": self.rate_limit,
+            "warnings": list(self.warnings),
+        }
+
+
+def build_plan(local, remote, recorded=None, rate_limit=None, request_seconds=None,
+               upload_interval=None, delete_interval=0):
+    """로컬 스캔 / 동기화 기록 / GitHub 목록 비교
+
+    local: {파일명: (blob sha, 크기)}, remote: {파일명: sha}, recorded: 마지막 동기화 때의 GitHub SHA
+    upload_interval: 크기 → 업로드 후 대기 시간, delete_interval: 삭제 후 대기 시간
+    """
+    plan = SyncPlan()
+    plan.rate_limit = rate_limit
+
+    deleted = {name: sha for name, sha in remote.items() if name not in local}
+    for name in sorted(local):
+        sha, size = local[name]
+        remote_sha = remote.get(name)
+        if remote_sha is None:
+            plan.adds.append((name, size))
+        elif remote_sha != sha:
+            plan.updates.append((name, size))
+            if recorded is not None and recorded.get(name) not in (None, remote_sha):
+                plan.remote_changed.append(name)
+        else:
+            plan.unchanged += 1
+
+    # 내용이 같은 삭제 + 추가는 이름 변경으로 표시
+    by_sha = {}
+    for name, sha in deleted.items():
+        by_sha.setdefault(sha, []).append(name)
+    adds = []
+    for name, size in plan.adds:
+        candidates = by_sha.get(local[name][0])
+        if candidates:
+            old_name = candidates.pop(0)
+            del deleted[old_name]
+            plan.renames.append((old_name, name, size))
+        else:
+            adds.append((name, size))
+    plan.adds = adds
+    plan.deletes = sorted(deleted)
+
+    # 비용 추정 (이름 변경은 추가 1 + 삭제 1)
+    uploads = [size for _, size in plan.adds + plan.updates] + [size for _, _, size in plan.renames]
+    delete_count = len(plan.deletes) + len(plan.renames)
+    plan.commits = len(uploads) + delete_count
+    plan.api_calls = LISTING_CALLS + len(uploads) * API_CALLS_PER_UPLOAD + delete_count * API_CALLS_PER_DELETE
+    plan.upload_bytes = sum(encoded_size(size) for size in uploads)
+
+    request_seconds = request_seconds or DEFAULT_REQUEST_SECONDS
+    seconds = plan.api_calls * request_seconds
+    seconds += sum(upload_interval(size) if upload_interval else 0 for size in uploads)
+    seconds += delete_count * delete_interval
+
+    # GitHub 보조 제한: 분당/시간당 커밋 수
+    if plan.commits > CONTENT_WRITES_PER_MINUTE:
+        seconds = max(seconds, plan.commits / CONTENT_WRITES_PER_MINUTE * 60)
+    if plan.commits > CONTENT_WRITES_PER_HOUR:
+        seconds = max(seconds, (plan.commits - 1) // CONTENT_WRITES_PER_HOUR * 3600)
+        plan.warnings.append(f"커밋 {plan.commits}개는 시간당 권장 한도({CONTENT_WRITES_PER_HOUR}개)를 넘습니다.")
+
+    # 기본 호출 한도가 부족하면 초기화될 때까지 대기
+    if rate_limit and plan.api_calls > rate_limit["remaining"]:
+        shortage = plan.api_calls - rate_limit["remaining"]
+        windows = math.ceil(shortage / max(rate_limit["limit"], 1))
+        wait = max(rate_limit["reset"] - time.time(), 0) + (windows - 1) * 3600
+        seconds += wait
+        plan.warnings.append(f"남은 API 한도({rate_limit['remaining']}회)가 부족해 한도 초기화를 기다려야 합니다.")
+
+    if plan.remote_changed:
+        plan.warnings.append(f"마지막 동기화 이후 GitHub에서 바뀐 파일 {len(plan.remote_changed)}개를 덮어씁니다.")
+
+    plan.estimated_seconds = seconds
+    return plan
@@ -0,0 +1,293 @@
+# tracing.py - 업로드 단계별 소요 시간 기록 (span → JSONL 파일 + 단계별 요약)
+#
+#   .env 또는 환경변수에 TRACE_FILE=upload_trace.jsonl 을 넣으면 기록 시작
+#   python tracing.py upload_trace.jsonl      기록 파일(교체된 파일 포함)로 단계별 요약 출력
+#
+# 꺼져 있으면 span()은 미리 만든 빈 객체를 돌려주기만 하므로 비용이 거의 없습니다.
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+import upload_log
+
+log = upload_log.get_logger(__name__)
+
+TRACE_MAX_BYTES = 10 * 1024 * 1024  # 기록 파일 1개 최대 크기 (넘으면 .1, .2 ... 로 교체)
+TRACE_BACKUPS = 3
+SAMPLES_PER_SPAN = 2048             # 단계별 백분위 계산용으로 보관할 최근 소요 시간 수
+
+_enabled = False
+_tracer = None
+_local = threading.local()
+_ids = iter(range(1, sys.maxsize))  # next()는 GIL 안에서 원자적
+
+
+class _NoopSpan:
+    """기록이 꺼져 있을 때 쓰는 빈 span (모든 호출이 공유)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """단계 1개 (with 블록) - 끝나면 소요 시간을 기록기로 보냄"""
+    __slots__ = ("name", "attrs", "span_id", "parent_id", "started_ns", "wall")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(_ids)
+        self.parent_id = None
+        self.started_ns = 0
+        self.wall = 0.0
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent_id = stack[-1].span_id if stack else None
+        stack.append(self)
+        self.wall = time.time()
+        self.started_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self.started_ns
+        stack = _local.stack
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        tracer = _tracer
+        if tracer is not None:
+            tracer.record(self, duration_ns)
+        return False
+
+    def set(self, **attrs):
+        """진행 중에 알게 된 값 추가 (상태 코드, 크기 등)"""
+        self.attrs.update(attrs)
+
+
+def span(name, **attrs):
+    """with span("upload.put", path=...): ... 형태로 단계 소요 시간 기록"""
+    if not _enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+class SpanStats:
+    """단계 1개의 누적 통계"""
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "errors", "samples", "_next")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.errors = 0
+        self.samples = []
+        self._next = 0
+
+    def add(self, duration_ns, error=False):
+        self.count += 1
+        self.total_ns += duration_ns
+        self.min_ns = duration_ns if self.min_ns is None else min(self.min_ns, duration_ns)
+        self.max_ns = max(self.max_ns, duration_ns)
+        if error:
+            self.errors += 1
+        if len(self.samples) < SAMPLES_PER_SPAN:
+            self.samples.append(duration_ns)
+        else:  # 오래된 값부터 덮어쓰기 (최근 값 기준 백분위)
+            self.samples[self._next] = duration_ns
+            self._next = (self._next + 1) % SAMPLES_PER_SPAN
+
+    def to_dict(self):
+        ordered = sorted(self.samples)
+
+        def pct(fraction):
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] / 1e6, 3)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3),
+            "min_ms": round(self.min_ns / 1e6, 3),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_ns / 1e6, 3),
+        }
+
+
+class Tracer:
+    """span 기록을 쓰기 쓰레드로 넘겨 파일에 기록 (업로드 경로는 파일 I/O를 기다리지 않음)"""
+    def __init__(self, path, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.stats = {}  # 단계 이름 → SpanStats (쓰기 쓰레드만 수정)
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def record(self, span_obj, duration_ns):
+        self._queue.put((span_obj, duration_ns, threading.current_thread().name))
+
+    def flush(self, timeout=5):
+        """지금까지의 기록을 파일에 쓸 때까지 대기"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def summary(self):
+        with self._stats_lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self._open()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                if self._file:
+                    self._file.flush()
+                item.set()
+                continue
+
+            span_obj, duration_ns, thread_name = item
+            with self._stats_lock:
+                stats = self.stats.get(span_obj.name)
+                if stats is None:
+                    stats = self.stats[span_obj.name] = SpanStats()
+                stats.add(duration_ns, "error" in span_obj.attrs)
+
+            record = {"name": span_obj.name, "ts": round(span_obj.wall, 6), "ms": round(duration_ns / 1e6, 3),
+                      "id": span_obj.span_id, "parent": span_obj.parent_id, "thread": thread_name}
+            if span_obj.attrs:
+                record["attrs"] = span_obj.attrs
+            try:
+                if self._file is None:
+                    self._open()
+                self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                if self.max_bytes and self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                log.warning(f"⚠️ 추적 기록 쓰기 실패: {e}")
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def enable(path, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS):
+    """기록 시작 (이미 켜져 있으면 그대로)"""
+    global _enabled, _tracer
+    if _tracer is not None:
+        return _tracer
+    _tracer = Tracer(path, max_bytes=max_bytes, backups=backups)
+    _enabled = True
+    log.info(f"🧭 단계별 소요 시간 기록: {path}")
+    return _tracer
+
+
+def is_enabled():
+    return _enabled
+
+
+def summary():
+    """단계별 요약 {이름: {"count", "mean_ms", "p50_ms", "p95_ms", ...}} (꺼져 있으면 {})"""
+    return _tracer.summary() if _tracer else {}
+
+
+def write_summary(path=None):
+    """요약을 JSON으로 저장 (기본: 기록 파일 이름 + .summary.json)"""
+    if _tracer is None:
+        return None
+    _tracer.flush()
+    path = path or f"{_tracer.path}.summary.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary(), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def disable():
+    """기록 중지 (남은 기록을 쓰고 요약 저장)"""
+    global _enabled, _tracer
+    if _tracer is None:
+        return
+    _enabled = False
+    try:
+        write_summary()
+    except OSError as e:
+        log.warning(f"⚠️ 추적 요약 저장 실패: {e}")
+    _tracer.close()
+    _tracer = None
+
+
+atexit.register(disable)
+
+
+def summarize_files(path, backups=TRACE_BACKUPS):
+    """기록 파일(교체된 파일 포함)을 읽어서 단계별 요약"""
+    stats = {}
+    for candidate in [f"{path}.{index}" for index in range(backups, 0, -1)] + [path]:
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                entry = stats.get(record["name"])
+                if entry is None:
+                    entry = stats[record["name"]] = SpanStats()
+                entry.add(int(record["ms"] * 1e6), "error" in record.get("attrs", {}))
+    return {name: entry.to_dict() for name, entry in sorted(stats.items())}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("사용법: python tracing.py 기록파일.jsonl")
+        sys.exit(2)
+    result = summarize_files(sys.argv[1])
+    if not result:
+        print("ℹ️ 기록이 없습니다.")
+        sys.exit(1)
+    print(f"{'단계':<24}{'횟수':>8}{'평균(ms)':>12}{'p50':>10}{'p95':>10}{'최대':>10}{'합계(s)':>10}")
+    for name, entry in result.items():
+        print(f"{name:<24}{entry['count']:>8}{entry['mean_ms']:>12.2f}{entry['p50_ms']:>10.2f}"
+              f"{entry['p95_ms']:>10.2f}{entry['max_ms']:>10.2f}{entry['total_ms'] / 1000:>10.2f}")
@@ -0,0 +1,205 @@
+# upload_cli.py - Tk 없이 쓰는 명령줄 도구 (cron / systemd 타이머용)
+#
+#   python upload_cli.py sync --once [--profile 이름] [--full]   증분 동기화 1회 후 종료
+#   python upload_cli.py watch [--profile 이름 | --all]          실시간 감시 (--all: 모든 프로필 데몬)
+#   python upload_cli.py status [--profile 이름]                 실행 중인 업로더 상태
+#   python upload_cli.py plan [--profile 이름] [--offline]       동기화 예정 내용 + 비용 추정 (쓰기 없음)
+import os
+import sys
+import json
+import time
+import argparse
+import upload_log
+
+log = upload_log.get_logger("cli")
+
+# 종료 코드
+EXIT_OK = 0            # 성공 (또는 할 일 없음)
+EXIT_FAILED = 1        # 일부 작업 실패
+EXIT_CONFIG = 2        # 설정 오류
+EXIT_LOCKED = 3        # 같은 프로필 업로더가 이미 실행 중
+EXIT_NOT_RUNNING = 4   # status: 실행 중인 업로더 없음
+
+
+def profile_env_path(profile):
+    """프로필 이름 → 설정 파일 경로 (없으면 현재 .env)"""
+    return f".env_{profile}" if profile else ".env"
+
+
+def engine_overrides(args):
+    """명령줄 옵션 → 엔진 설정 덮어쓰기 값 (.env/환경변수보다 우선)"""
+    overrides = {
+        "trace_file": getattr(args, "trace", None),
+        "log_format": getattr(args, "log_format", None),
+        "log_level": getattr(args, "log_level", None),
+    }
+    return {field: value for field, value in overrides.items() if value is not None}
+
+
+def create_engine(profile, overrides=None):
+    from main_upload import UploadEngine
+    env_path = profile_env_path(profile)
+    if profile and not os.path.exists(env_path):
+        log.error(f"❌ 프로필 파일을 찾을 수 없습니다: {env_path}")
+        return None
+    return UploadEngine(env_path=env_path, profile_name=profile, overrides=overrides)
+
+
+def start_error_code(engine):
+    from main_upload import START_ERROR_LOCKED
+    return EXIT_LOCKED if engine.start_error == START_ERROR_LOCKED else EXIT_CONFIG
+
+
+def cmd_sync(args):
+    if not args.once:
+        return cmd_watch(args)
+
+    engine = create_engine(args.profile, engine_overrides(args))
+    if engine is None:
+        return EXIT_CONFIG
+    started = time.perf_counter()
+    failed = engine.sync_once(full=args.full)
+    if failed is None:
+        return start_error_code(engine)
+    log.info(f"⏱️ 동기화 {time.perf_counter() - started:.2f}초, 실패 {failed}건")
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cmd_watch(args):
+    if args.all:
+        from upload_daemon import UploadDaemon
+        runner = UploadDaemon(overrides=engine_overrides(args))
+        if not runner.start():
+            return EXIT_CONFIG
+    else:
+        runner = create_engine(args.profile, engine_overrides(args))
+        if runner is None:
+            return EXIT_CONFIG
+        if not runner.run():
+            return start_error_code(runner)
+
+    log.info("(Ctrl+C를 눌러서 종료)")
+    try:
+        runner.wait_until_stopped()  # 이벤트가 올 때만 깨어남 (주기적 확인 없음)
+    except KeyboardInterrupt:
+        log.info("\n🛑 종료합니다...")
+    runner.stop()
+    return EXIT_OK
+
+
+def cmd_status(args):
+    from env_generate import EnvGenerator
+    from instance_registry import find_instance, send_command
+    from sync_manifest import SyncManifest
+
+    if args.profile:
+        profiles = [args.profile]
+    else:
+        profiles = EnvGenerator().get_all_profiles() + ['default']
+
+    running = 0
+    for profile in profiles:
+        instance = find_instance(profile)
+        manifest = SyncManifest(profile).load()
+        last_sync = (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(manifest.synced_at))
+                     if manifest.synced_at else "-")
+        if not instance:
+            if args.profile or manifest.synced_at:
+                print(f"⏹️ {profile:<15} 중지됨 (마지막 동기화: {last_sync})")
+            continue
+
+        running += 1
+        reply = send_command(instance['control'], "status") if instance.get('control') else None
+        status = (reply or {}).get("status") or {}
+        print(f"▶️ {profile:<15} PID {instance.get('pid')} | 상태: {status.get('state', '?')} | "
+              f"대기 {status.get('queue_depth', '?')}건 | 동시 {status.get('window', '?')} | 깨어남 {status.get('wakeups_per_minute', '?')}회/분 | "
+              f"저장소: {status.get('repo') or '-'} | "
+              f"마지막 동기화: {last_sync}")
+        if args.json:
+            print(json.dumps(status, ensure_ascii=False, indent=2))
+
+    if not running:
+        print("ℹ️ 실행 중인 업로더가 없습니다.")
+        return EXIT_NOT_RUNNING
+    return EXIT_OK
+
+
+def cmd_plan(args):
+    engine = create_engine(args.profile)
+    if engine is None:
+        return EXIT_CONFIG
+    plan = engine.plan_sync(offline=args.offline)
+    if plan is None:
+        return EXIT_CONFIG
+
+    if args.json:
+        print(json.dumps(plan.to_dict(), ensure_ascii=False, indent=2))
+        return EXIT_OK
+
+    print(f"📋 동기화 계획 ({engine.github_username}/{engine.repo_name})")
+    for name, size in plan.adds:
+        print(f"  ➕ 추가      {name} ({size:,} bytes)")
+    for name, size in plan.updates:
+        print(f"  🔄 업데이트  {name} ({size:,} bytes)")
+    for old_name, new_name, _ in plan.renames:
+        print(f"  ✏️ 이름 변경 {old_name} → {new_name}")
+    for name in plan.deletes:
+        print(f"  🗑️ 삭제      {name}")
+
+    print(f"📊 추가 {len(plan.adds)}개, 업데이트 {len(plan.updates)}개, 이름 변경 {len(plan.renames)}개, "
+          f"삭제 {len(plan.deletes)}개, 변경 없음 {plan.unchanged}개")
+    print(f"💰 API 호출 약 {plan.api_calls}회, 커밋 {plan.commits}개, "
+          f"전송 {plan.upload_bytes / 1024 / 1024:.2f}MB, 예상 시간 약 {plan.estimated_seconds / 60:.1f}분")
+    if plan.rate_limit:
+        reset = time.strftime('%H:%M', time.localtime(plan.rate_limit['reset']))
+        print(f"🔑 남은 API 한도: {plan.rate_limit['remaining']}/{plan.rate_limit['limit']}회 ({reset} 초기화)")
+    for warning in plan.warnings:
+        print(f"⚠️ {warning}")
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="GitHub 자동 업로드 명령줄 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="동기화 (--once: 1회 실행 후 종료)")
+    sync_parser.add_argument("--once", action="store_true", help="증분 동기화 1회 후 종료")
+    sync_parser.add_argument("--full", action="store_true", help="동기화 기록 대신 GitHub 파일 목록을 다시 조회")
+    sync_parser.set_defaults(func=cmd_sync, all=False)
+
+    watch_parser = subparsers.add_parser("watch", help="실시간 감시")
+    watch_parser.add_argument("--all", action="store_true", help="모든 프로필을 한 프로세스에서 실행")
+    watch_parser.set_defaults(func=cmd_watch)
+
+    status_parser = subparsers.add_parser("status", help="실행 중인 업로더 상태")
+    status_parser.add_argument("--json", action="store_true", help="상세 상태를 JSON으로 출력")
+    status_parser.set_defaults(func=cmd_status)
+
+    plan_parser = subparsers.add_parser("plan", help="동기화 예정 내용 출력 (GitHub에 쓰지 않음)")
+    plan_parser.add_argument("--offline", action="store_true", help="GitHub 조회 없이 동기화 기록만 사용")
+    plan_parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    plan_parser.set_defaults(func=cmd_plan)
+
+    for subparser in (sync_parser, watch_parser, status_parser, plan_parser):
+        subparser.add_argument("--profile", help="프로필 이름 (.env_이름 사용, 생략하면 .env)")
+    for subparser in (sync_parser, watch_parser):
+        subparser.add_argument("--trace", metavar="FILE", help="단계별 소요 시간을 JSONL 파일에 기록")
+        subparser.add_argument("--log-format", choices=("console", "json"), help="로그 출력 형식 (기본 console)")
+        subparser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), help="로그 레벨 (기본 INFO)")
+        subparser.add_argument("--max-upload-rate", metavar="RATE",
+                               help="이 프로세스 전체 업로드 속도 상한 (예: 500KB, 2MB, 0이면 제한 없음)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # --trace / --log-* 는 엔진에 덮어쓰기 값으로 전달 (engine_overrides), CLI 자체 출력도 바로 적용
+    if getattr(args, "log_format", None) or getattr(args, "log_level", None):
+        upload_log.configure(getattr(args, "log_level", None), getattr(args, "log_format", None))
+    if getattr(args, "max_upload_rate", None):  # 프로세스 전체 설정이라 프로필 .env에는 없음
+        os.environ["GLOBAL_UPLOAD_RATE_LIMIT"] = args.max_upload_rate
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# upload_daemon.py - 모든 프로필을 프로세스 1개에서 동시에 실행하는 데몬 모드
+import os
+import threading
+import metrics
+import upload_log
+from env_generate import EnvGenerator
+from github_client import CircuitBreaker
+from main_upload import UploadEngine, STATE_RUNNING, STATE_PAUSED, wait_interruptible
+from upload_history import HistoryWriter
+from upload_queue import RateBudget
+from upload_scheduler import DeadlineScheduler
+from watch_hub import WatchHub
+
+log = upload_log.get_logger("daemon")
+
+POOL_CONNECTIONS = 10  # 공용 HTTP 풀 (호스트 수)
+POOL_MAXSIZE = 20      # 호스트당 유지할 연결 수
+
+
+class SharedResources:
+    """프로필 엔진들이 함께 쓰는 자원: 감시 허브, HTTP 연결 풀, 토큰별 호출 예산, 업로드 기록, 서킷 브레이커, 스케줄러"""
+    def __init__(self):
+        self.watch_hub = WatchHub()
+        self.history = HistoryWriter()
+        self.scheduler = DeadlineScheduler()       # 모든 프로필의 예약 (프로필 간 실행 간격 보장)
+        self.state_changed = threading.Event()     # 프로필 엔진 상태 변경 → 데몬 대기 깨움
+        self.breaker = CircuitBreaker()  # 네트워크 장애는 모든 프로필에 같이 적용
+        self._adapter = None
+        self._sessions = {}  # 토큰 → 세션 (연결 풀은 모두 같은 어댑터 사용)
+        self._budgets = {}   # 토큰 → RateBudget
+        self._lock = threading.Lock()
+
+    def session_for(self, token):
+        """토큰별 인증 헤더를 가진 세션 (연결 풀은 공유)"""
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                if self._adapter is None:
+                    self._adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session = requests.Session()
+                session.mount("https://", self._adapter)
+                session.mount("http://", self._adapter)
+                session.headers["Authorization"] = f"token {token}"
+                self._sessions[token] = session
+            return session
+
+    def budget_for(self, token, name=""):
+        """토큰별 API 호출 예산 (같은 토큰을 쓰는 프로필끼리 번갈아 사용, name은 처음 만든 프로필)"""
+        with self._lock:
+            budget = self._budgets.get(token)
+            if budget is None:
+                budget = self._budgets[token] = RateBudget(name or "")
+            return budget
+
+    def close(self):
+        self.scheduler.stop()
+        self.watch_hub.stop()
+        self.history.close()
+        if self._adapter is not None:
+            self._adapter.close()
+        self._sessions = {}
+
+
+class UploadDaemon:
+    """profiles.json의 모든 프로필을 엔진 1개씩 만들어 한 프로세스에서 실행"""
+    def __init__(self, profiles=None, overrides=None):
+        self.env_generator = EnvGenerator()
+        self.profiles = profiles
+        self.overrides = overrides  # 모든 프로필 엔진에 적용할 설정 덮어쓰기 (명령줄 옵션)
+        self.shared = None
+        self.engines = {}  # 프로필 이름 → UploadEngine
+
+    def profile_env_path(self, profile_name):
+        return os.path.join(self.env_generator.project_root, f".env_{profile_name}")
+
+    def start(self):
+        """모든 프로필 엔진 시작 (시작된 엔진 수 반환)"""
+        profiles = self.profiles or self.env_generator.get_all_profiles()
+        if not profiles:
+            log.error("❌ 실행할 프로필이 없습니다. 환경설정에서 프로필을 먼저 만들어주세요.")
+            return 0
+
+        # 로그 설정은 프로세스 전체에 하나 (환경변수 + 명령줄 옵션, 프로필 .env의 LOG_*는 쓰지 않음)
+        overrides = self.overrides or {}
+        upload_log.configure(overrides.get("log_level"), overrides.get("log_format"), overrides.get("log_file"))
+        self.shared = SharedResources()
+        log.info(f"🚀 데몬 모드: {len(profiles)}개 프로필 시작")
+
+        for profile_name in profiles:
+            env_path = self.profile_env_path(profile_name)
+            if not os.path.exists(env_path):
+                log.warning(f"⚠️ '{profile_name}' 프로필 파일이 없어 건너뜁니다: {env_path}")
+                continue
+            log.info(f"\n🏷️ [{profile_name}]")
+            engine = UploadEngine(env_path=env_path, profile_name=profile_name, shared=self.shared,
+                                  overrides=self.overrides)
+            if engine.run():
+                self.engines[profile_name] = engine
+            else:
+                log.error(f"❌ '{profile_name}' 프로필을 시작하지 못했습니다.")
+
+        # 예약 업로드는 스케줄러 쓰레드 1개가 모든 프로필의 예약 시각까지 대기 (프로필 간 간격 유지)
+        self.shared.scheduler.start()
+
+        log.info(f"\n✅ {len(self.engines)}/{len(profiles)}개 프로필 실행 중")
+        return len(self.engines)
+
+    def wait_until_stopped(self):
+        """모든 프로필 엔진이 중지될 때까지 대기"""
+        while self.shared:
+            self.shared.state_changed.clear()
+            if not self.is_running():
+                break
+            wait_interruptible(self.shared.state_changed)
+
+    def is_running(self):
+        return any(engine.state in (STATE_RUNNING, STATE_PAUSED) for engine in self.engines.values())
+
+    def status(self):
+        """프로필별 엔진 상태"""
+        return {name: engine.status() for name, engine in self.engines.items()}
+
+    def stop(self):
+        for engine in self.engines.values():
+            engine.stop()
+        self.engines = {}
+        if self.shared:
+            self.shared.close()
+            self.shared = None
+        metrics.stop_server()
+        log.info("🛑 데몬이 중지되었습니다.")
+
+
+if __name__ == "__main__":
+    daemon = UploadDaemon()
+    if not daemon.start():
+        upload_log.flush()
+        input("⏸️ 아무 키나 눌러서 종료...")
+        exit(1)
+
+    log.info("(Ctrl+C를 눌러서 종료)")
+    try:
+        # 모든 프로필이 제어 소켓으로 중지되면 종료
+        daemon.wait_until_stopped()
+    except KeyboardInterrupt:
+        log.info("\n🛑 데몬을 종료합니다...")
+
+    daemon.stop()
+    log.info("👋 GitHub 자동 업로드 데몬이 종료되었습니다.")
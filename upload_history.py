@@ -0,0 +1,148 @@
+# upload_history.py - 업로드 기록 저장소 (SQLite, 일괄 쓰기 + 인덱스 조회)
+import time
+import sqlite3
+import threading
+import upload_log
+
+log = upload_log.get_logger(__name__)
+
+HISTORY_DB_FILE = "upload_history.db"
+FLUSH_INTERVAL = 2.0   # 기록을 모아서 쓰는 최대 대기 시간 (초)
+FLUSH_BATCH = 500      # 이만큼 쌓이면 바로 기록
+PAGE_SIZE = 200
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    profile TEXT NOT NULL,
+    action TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    commit_sha TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_uploads_ts ON uploads (ts);
+CREATE INDEX IF NOT EXISTS idx_uploads_path ON uploads (path, id);
+CREATE INDEX IF NOT EXISTS idx_uploads_profile ON uploads (profile, id);
+CREATE INDEX IF NOT EXISTS idx_uploads_status ON uploads (status, id);
+"""
+
+COLUMNS = ("id", "ts", "profile", "action", "path", "status", "bytes", "commit_sha", "message")
+
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")   # GUI와 업로더가 동시에 읽고 쓸 수 있게
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class HistoryWriter:
+    """업로더 쪽: 기록을 메모리에 모았다가 별도 쓰레드에서 한 번에 저장"""
+    def __init__(self, db_path=HISTORY_DB_FILE):
+        self.db_path = db_path
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def record(self, profile, action, path, status, byte_count=0, commit_sha=None, message=None):
+        """기록 1건 추가 (바로 반환)"""
+        row = (time.time(), profile, action, path, status, byte_count, commit_sha, message)
+        with self._cond:
+            self._pending.append(row)
+            if len(self._pending) == 1 or len(self._pending) >= FLUSH_BATCH:
+                self._cond.notify()
+
+    def _write_loop(self):
+        try:
+            conn = connect(self.db_path)
+        except sqlite3.Error as e:
+            log.warning(f"⚠️ 업로드 기록 DB를 열 수 없습니다: {e}")
+            return
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._closed and len(self._pending) < FLUSH_BATCH:
+                    # 조금 더 모아서 한 번에 쓰기
+                    self._cond.wait(FLUSH_INTERVAL)
+                rows, self._pending = self._pending, []
+                closed = self._closed
+
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO uploads (ts, profile, action, path, status, bytes, commit_sha, message) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                except sqlite3.Error as e:
+                    log.warning(f"⚠️ 업로드 기록 저장 실패 ({len(rows)}건): {e}")
+            if closed:
+                conn.close()
+                return
+
+    def close(self):
+        """남은 기록을 저장하고 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+
+
+class HistoryReader:
+    """GUI 쪽: 필터 + 키셋 페이지 조회 (id 기준, 최신순)"""
+    def __init__(self, db_path=HISTORY_DB_FILE):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+
+    def _where(self, profile=None, status=None, path_prefix=None, since=None):
+        clauses, params = [], []
+        if profile:
+            clauses.append("profile = ?")
+            params.append(profile)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if path_prefix:
+            # LIKE 대신 범위 조건으로 인덱스 사용
+            clauses.append("path >= ? AND path < ?")
+            params.extend([path_prefix, path_prefix + "\uffff"])
+        if since:
+            clauses.append("ts >= ?")
+            params.append(since)
+        return clauses, params
+
+    def page(self, before_id=None, after_id=None, limit=PAGE_SIZE, **filters):
+        """한 페이지 조회 (최신순). before_id: 더 오래된 쪽, after_id: 더 최신 쪽"""
+        clauses, params = self._where(**filters)
+        order = "DESC"
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        elif after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+            order = "ASC"
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM uploads {where} ORDER BY id {order} LIMIT ?"
+        rows = self.conn.execute(sql, params + [limit]).fetchall()
+        if order == "ASC":
+            rows.reverse()
+        return rows
+
+    def approximate_total(self):
+        """전체 기록 수 (COUNT(*) 대신 최대 id 사용)"""
+        row = self.conn.execute("SELECT MAX(id) FROM uploads").fetchone()
+        return row[0] or 0
+
+    def close(self):
+        self.conn.close()
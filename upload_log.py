@@ -0,0 +1,178 @@
+# upload_log.py - 업로더 로그 (레벨 + 구조화 필드, 출력은 별도 쓰레드에서 처리)
+#
+#   LOG_LEVEL=DEBUG|INFO|WARNING|ERROR   (기본 INFO)
+#   LOG_FORMAT=console|json              console: 기존 이모티콘 메시지 그대로, json: 한 줄에 JSON 1개
+#   LOG_FILE=uploader.log.jsonl          지정하면 JSON 로그를 파일에도 기록 (크기별 교체)
+#
+# 환경변수, 명령줄 옵션, 단독 실행이면 프로필 .env로 설정합니다 (프로세스 전체 설정이라 데몬은 시작할 때 한 번만).
+# 로그를 남기는 쓰레드는 큐에 넣기만 하고 터미널/파일 쓰기는 QueueListener 쓰레드가 처리합니다
+# (출력 쓰레드는 import 시점이 아니라 첫 로그가 들어올 때 시작).
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+
+LOGGER_NAME = "uploader"
+LOG_QUEUE_SIZE = 10000            # 출력이 밀리면 이 이상은 버림 (업로드 경로를 막지 않음)
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+FORMAT_CONSOLE = "console"
+FORMAT_JSON = "json"
+
+_listener = None
+_queue_handler = None
+_settings = None
+_closed = False
+_lock = threading.RLock()
+
+
+def fields(**values):
+    """구조화 필드 → log.info(..., extra=fields(path=..., status=...))"""
+    return {"fields": values}
+
+
+class ConsoleFormatter(logging.Formatter):
+    """기존 print() 출력과 같은 모양 (메시지만)"""
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """{"ts", "level", "logger", "msg", "thread", ...필드} 한 줄"""
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage().strip(),
+            "thread": record.threadName,
+        }
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class StdoutHandler(logging.Handler):
+    """출력 시점의 sys.stdout에 기록 (GUI가 sys.stdout을 바꿔 끼워도 따라감)"""
+    def emit(self, record):
+        try:
+            stream = sys.stdout
+            if stream is None:
+                return
+            stream.write(self.format(record) + "\n")
+            stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버림 (버린 개수는 dropped)"""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        if _listener is None and not _closed:
+            configure()  # 설정 전에 남긴 첫 로그 → 환경변수 설정으로 출력 시작
+
+
+def _build_handlers(fmt, log_file):
+    console = StdoutHandler()
+    console.setFormatter(JsonFormatter() if fmt == FORMAT_JSON else ConsoleFormatter())
+    handlers = [console]
+    if log_file:
+        try:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        except OSError as e:
+            console.handle(logging.makeLogRecord({"msg": f"⚠️ 로그 파일을 열 수 없습니다 ({log_file}): {e}",
+                                                   "levelno": logging.WARNING, "levelname": "WARNING"}))
+    return handlers
+
+
+def _level(level):
+    return getattr(logging, (level or os.getenv("LOG_LEVEL") or "INFO").upper(), logging.INFO)
+
+
+def _install():
+    """로거에 큐 핸들러 연결 (출력 쓰레드는 시작하지 않음)"""
+    global _queue_handler
+    with _lock:
+        if _queue_handler is None:
+            logger = logging.getLogger(LOGGER_NAME)
+            logger.setLevel(_level(None))
+            logger.propagate = False
+            _queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+            logger.addHandler(_queue_handler)
+
+
+def configure(level=None, fmt=None, log_file=None):
+    """프로세스 전체 로그 출력 설정 (같은 설정이면 그대로, 다르면 출력 쓰레드를 새 설정으로 교체)
+
+    CLI/데몬 진입점이나 프로세스를 혼자 쓰는 엔진이 부릅니다 (데몬 안의 엔진은 부르지 않음).
+    """
+    global _listener, _settings
+    level = (level or os.getenv("LOG_LEVEL") or "INFO").upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT") or FORMAT_CONSOLE).lower()
+    log_file = log_file or os.getenv("LOG_FILE") or None
+    settings = (level, fmt, log_file)
+    _install()
+    with _lock:
+        if settings == _settings:
+            return
+        logging.getLogger(LOGGER_NAME).setLevel(_level(level))
+        if _listener is not None:
+            _listener.stop()  # 남은 로그를 모두 쓰고 종료
+            for handler in _listener.handlers:
+                handler.close()
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, *_build_handlers(fmt, log_file),
+                                                   respect_handler_level=True)
+        _listener.start()
+        _settings = settings
+
+
+def get_logger(name=None):
+    """uploader.<name> 로거 (출력 쓰레드는 첫 로그를 남길 때 시작)"""
+    _install()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def flush():
+    """지금까지 남긴 로그를 모두 출력할 때까지 대기"""
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+
+def shutdown():
+    global _listener, _settings, _closed
+    with _lock:
+        _closed = True
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+            _settings = None
+
+
+atexit.register(shutdown)
@@ -0,0 +1,396 @@
+# upload_queue.py - 작업 종류/파일 크기별 우선순위 업로드 큐
+import os
+import time
+import threading
+from collections import deque
+import upload_log
+
+log = upload_log.get_logger("queue")
+
+# 우선순위 등급 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0   # 실시간 생성/수정 (사용자가 방금 저장한 파일)
+PRIORITY_DELETE = 1        # 삭제
+PRIORITY_SMALL = 2         # 기존 파일 중 작은 파일
+PRIORITY_BACKFILL = 3      # 기존 파일 중 큰 파일 (초기 동기화)
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "실시간",
+    PRIORITY_DELETE: "삭제",
+    PRIORITY_SMALL: "작은 파일",
+    PRIORITY_BACKFILL: "백필",
+}
+
+SMALL_FILE_LIMIT = 256 * 1024  # 256KB 이하면 작은 파일로 취급
+
+# 기아 방지 설정
+AGING_SECONDS = 30        # 이 시간 이상 기다린 하위 작업은 바로 처리
+FAIRNESS_INTERVAL = 8     # 상위 작업을 연속 N개 처리하면 하위 작업 1개 처리
+
+# 동시 요청 창 (AIMD: 쓰기가 성공하면 조금씩 늘리고, 요청 제한/지연 급증이면 절반으로)
+WINDOW_MIN = 1
+WINDOW_MAX = 8               # 엔진별 작업 쓰레드 수 = 창의 최대 크기
+WINDOW_START = 1
+DECREASE_COOLDOWN = 2.0      # 한 번 줄인 뒤 이 시간 동안 오는 혼잡 신호는 같은 원인으로 봄 (초)
+LATENCY_SPIKE_FACTOR = 3.0   # 평균 쓰기 응답 시간의 N배를 넘으면 지연 급증
+LATENCY_SPIKE_MIN = 2.0      # 이보다 빠른 응답은 급증으로 보지 않음 (초)
+LATENCY_MIN_SAMPLES = 5      # 평균을 믿기 전에 필요한 응답 수
+LATENCY_SMOOTHING = 0.2      # 평균 응답 시간 갱신 비율 (지수 이동 평균)
+
+# 쓰기 속도 (2차 요청 제한 응답을 받은 뒤에만 분당 쓰기 수를 제한)
+WRITE_PACE_MIN = 10          # 최소 분당 쓰기 수
+WRITE_PACE_STEP = 5          # 제한 없이 1분 동안 쓰면 늘리는 분당 쓰기 수
+WRITE_PACE_RELEASE = 300     # 이 시간 동안 요청 제한 응답이 없으면 속도 제한 해제 (초)
+
+
+def format_pace(pace):
+    return "제한 없음" if pace is None else f"{int(pace)}회"
+
+
+def classify_upload(file_path, realtime=False):
+    """업로드 작업의 우선순위 등급 결정"""
+    if realtime:
+        return PRIORITY_INTERACTIVE
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = 0
+    return PRIORITY_SMALL if size <= SMALL_FILE_LIMIT else PRIORITY_BACKFILL
+
+
+class UploadBatch:
+    """여러 작업의 결과를 모아서 기다리기 (기존 파일/예약 업로드 요약용)"""
+    def __init__(self, total):
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        if total == 0:
+            self._finished.set()
+
+    def record(self, success):
+        with self._lock:
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            if self.succeeded + self.failed >= self.total:
+                self._finished.set()
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+
+class UploadTask:
+    """큐에 들어가는 단일 작업 (upload / delete)"""
+    def __init__(self, action, path, priority, sha=None, batch=None):
+        self.action = action
+        self.path = path
+        self.priority = priority
+        self.sha = sha
+        self.batches = [batch] if batch else []
+        self.enqueued_at = time.monotonic()  # 처음 큐에 들어온 시각 (기아 방지용)
+        self.updated_at = self.enqueued_at   # 마지막으로 합쳐진 시각
+        self.cancelled = False
+        self.coalesced = False               # 대기 중이던 같은 경로 작업을 합쳤는지
+
+    def finish(self, success):
+        """작업 결과를 연결된 배치들에 기록"""
+        for batch in self.batches:
+            batch.record(success)
+
+
+class UploadQueue:
+    """우선순위 등급별 FIFO + 기아 방지 업로드 큐
+
+    같은 경로에 대한 작업이 대기 중이면 새 작업으로 합쳐서(coalesce)
+    한 번만 업로드하고, 더 높은 우선순위를 유지합니다.
+    작업 쓰레드가 여러 개여도 같은 경로 작업은 동시에 처리하지 않습니다 (done() 후 다음 작업).
+    """
+    def __init__(self, aging_seconds=AGING_SECONDS, fairness_interval=FAIRNESS_INTERVAL):
+        self.aging_seconds = aging_seconds
+        self.fairness_interval = fairness_interval
+        self._queues = {p: deque() for p in PRIORITY_NAMES}
+        self._pending = {}  # path -> UploadTask
+        self._active = set()  # 처리 중인 경로
+        self._cond = threading.Condition()
+        self._closed = False
+        self._paused = False
+        self._since_low = 0  # 하위 작업 없이 연속 처리한 상위 작업 수
+
+    def put(self, action, path, priority, sha=None, batch=None):
+        """작업 추가 (같은 경로 작업이 대기 중이면 합치기)"""
+        with self._cond:
+            old = self._pending.get(path)
+            task = UploadTask(action, path, priority, sha=sha, batch=batch)
+            if old is not None:
+                old.cancelled = True
+                task.priority = min(priority, old.priority)
+                task.batches = old.batches + task.batches
+                task.enqueued_at = old.enqueued_at
+                task.coalesced = True
+            self._pending[path] = task
+            self._queues[task.priority].append(task)
+            self._cond.notify()
+            return task
+
+    def get(self, timeout=None):
+        """다음 작업 꺼내기 (없으면 대기, 닫히면 None)"""
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                if self._closed:
+                    return None
+                task = None if self._paused else self._pop_next()
+                if task is not None:
+                    self._active.add(task.path)
+                    return task
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+
+    def done(self, task):
+        """작업 처리 끝 → 같은 경로의 다음 작업 허용"""
+        with self._cond:
+            self._active.discard(task.path)
+            self._cond.notify_all()
+
+    def _head(self, priority):
+        """처리 중이 아닌 경로의 첫 작업 (앞쪽의 취소된 작업은 버림)"""
+        queue = self._queues[priority]
+        while queue and queue[0].cancelled:
+            queue.popleft()
+        for task in queue:
+            if not task.cancelled and task.path not in self._active:
+                return task
+        return None
+
+    def _pop_next(self):
+        heads = {p: self._head(p) for p in self._queues}
+        available = [p for p in sorted(heads) if heads[p] is not None]
+        if not available:
+            return None
+
+        chosen = available[0]
+        lower = available[1:]
+        if lower:
+            # 오래 기다린 하위 작업이 있거나 상위 작업만 연속으로 처리했으면 하위 작업 처리
+            oldest = min(lower, key=lambda p: heads[p].enqueued_at)
+            waited = time.monotonic() - heads[oldest].enqueued_at
+            if waited >= self.aging_seconds or self._since_low >= self.fairness_interval:
+                chosen = oldest
+
+        if chosen == available[-1]:
+            self._since_low = 0
+        else:
+            self._since_low += 1
+
+        task = heads[chosen]
+        self._queues[chosen].remove(task)
+        if self._pending.get(task.path) is task:
+            del self._pending[task.path]
+        return task
+
+    def qsize(self):
+        with self._cond:
+            return len(self._pending)
+
+    def oldest_age(self):
+        """가장 오래 기다린 대기 작업의 대기 시간 (초, 없으면 0)"""
+        with self._cond:
+            if not self._pending:
+                return 0.0
+            return time.monotonic() - min(task.enqueued_at for task in self._pending.values())
+
+    def stats(self):
+        """등급별 대기 작업 수"""
+        with self._cond:
+            counts = {p: 0 for p in self._queues}
+            for task in self._pending.values():
+                counts[task.priority] += 1
+            return counts
+
+    def pause(self):
+        """작업 꺼내기 일시정지 (put은 계속 가능)"""
+        with self._cond:
+            self._paused = True
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def close(self):
+        """큐 종료 (남은 작업은 실패 처리하고 대기 중인 get() 깨우기)"""
+        with self._cond:
+            self._closed = True
+            for task in self._pending.values():
+                task.finish(False)
+            self._pending.clear()
+            for queue in self._queues.values():
+                queue.clear()
+            self._cond.notify_all()
+
+
+class RateBudget:
+    """토큰 1개의 API 호출 예산 (여러 프로필이 나눠 씀)
+
+    요청은 우선순위 등급별 도착 순서대로 시작하므로 같은 등급끼리는 프로필 간에 번갈아 가며(라운드 로빈) 처리됩니다.
+    동시에 처리하는 작업 수는 AIMD 창으로 정합니다: 쓰기가 성공할 때마다 1/창만큼 늘리고(창 크기만큼 성공하면 +1),
+    403/429 요청 제한, 남용 감지 응답, 응답 지연 급증이 오면 절반으로 줄입니다.
+    작업 시작 간격은 평소에는 두지 않고, 요청 제한 응답을 받으면 Retry-After만큼 쉰 뒤 직전 1분 동안의
+    쓰기 수의 절반으로 분당 쓰기 수를 제한합니다 (성공하면 조금씩 늘리고, 한동안 제한이 없으면 해제).
+    """
+    def __init__(self, name="", start=WINDOW_START, minimum=WINDOW_MIN, maximum=WINDOW_MAX):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = float(start)
+        self.in_flight = 0
+        self.last_change = None      # 마지막 창 변경 이유
+        self._cond = threading.Condition()
+        self._waiting = []           # 기다리는 요청 (우선순위 등급, 도착 순번)
+        self._next_ticket = 0
+        self.write_pace = None       # 분당 쓰기 수 제한 (None이면 제한 없음)
+        self._free_at = 0.0          # 다음 작업을 시작할 수 있는 시각 (Retry-After, 쓰기 속도)
+        self._starts = deque()       # 최근 1분 동안 작업을 시작한 시각
+        self._paced_at = None        # 마지막으로 쓰기 속도를 줄인 시각
+        self._decreased_at = None
+        self._latency = None         # 평균 쓰기 응답 시간 (초)
+        self._samples = 0
+
+    @property
+    def limit(self):
+        """지금 동시에 처리할 수 있는 작업 수"""
+        return max(self.minimum, min(self.maximum, int(self.window)))
+
+    def acquire(self, stop_event=None, priority=PRIORITY_INTERACTIVE):
+        """차례가 오고 창에 자리가 나고 요청 제한 대기가 끝날 때까지 대기 (중지되면 False)
+
+        priority: 작업 등급 (실시간 작업이 먼저)
+        """
+        with self._cond:
+            waiter = (priority, self._next_ticket)
+            self._next_ticket += 1
+            self._waiting.append(waiter)
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    self._waiting.remove(waiter)
+                    self._cond.notify_all()
+                    return False
+                if min(self._waiting) == waiter and self.in_flight < self.limit:
+                    break
+                self._cond.wait()
+            self._waiting.remove(waiter)
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self._free_at)
+            if self.write_pace:
+                self._free_at = start + 60.0 / self.write_pace
+            self._starts.append(start)
+            while self._starts and self._starts[0] < now - 60:
+                self._starts.popleft()
+            self._cond.notify_all()  # 창에 자리가 남았으면 다음 차례도 바로 진행
+        delay = start - time.monotonic()
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    self.release()
+                    return False
+            else:
+                time.sleep(delay)
+        return True
+
+    def release(self):
+        """작업 완료 → 창에 자리 반환"""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def wake(self):
+        """기다리는 요청들이 중지 여부를 다시 확인하도록 깨움"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def record_success(self, seconds):
+        """쓰기 요청 성공 (응답 시간 포함) → 창 증가, 응답 시간이 평소보다 크게 늘었으면 감소"""
+        with self._cond:
+            spike = (self._samples >= LATENCY_MIN_SAMPLES and seconds > LATENCY_SPIKE_MIN
+                     and seconds > self._latency * LATENCY_SPIKE_FACTOR)
+            if spike:
+                self._decrease(f"응답 지연 급증 {seconds:.1f}초, 평소 {self._latency:.1f}초")
+            else:
+                old = self.limit
+                self.window = min(float(self.maximum), self.window + 1 / self.window)
+                if self.limit != old:
+                    self._changed(old, "쓰기 성공")
+                if self.write_pace:
+                    self._relax_pace()
+                self._cond.notify_all()
+            self._latency = seconds if self._latency is None else (
+                self._latency + (seconds - self._latency) * LATENCY_SMOOTHING)
+            self._samples += 1
+
+    def record_throttle(self, reason, retry_after=None, limit_writes=False):
+        """요청 제한 응답 → 창 절반, retry_after초 동안 새 작업 시작 안 함
+
+        limit_writes: 2차 요청 제한/429처럼 쓰기 횟수 때문에 막힌 경우 분당 쓰기 수도 제한
+        """
+        with self._cond:
+            if retry_after:
+                self._free_at = max(self._free_at, time.monotonic() + retry_after)
+                reason += f", {retry_after:.0f}초 대기"
+            if limit_writes:
+                self._slow_pace(reason)
+            self._decrease(reason)
+
+    def _slow_pace(self, reason):
+        """분당 쓰기 수를 직전 1분 동안의 쓰기 수(이미 제한 중이면 그 값)의 절반으로"""
+        now = time.monotonic()
+        if self._paced_at is not None and now - self._paced_at < DECREASE_COOLDOWN:
+            return
+        self._paced_at = now
+        recent = sum(1 for started in self._starts if started >= now - 60)
+        if self.write_pace:
+            recent = min(recent, self.write_pace)
+        old = self.write_pace
+        self.write_pace = max(float(WRITE_PACE_MIN), recent / 2)
+        self._pace_changed(old, reason)
+
+    def _relax_pace(self):
+        """쓰기 성공 → 분당 쓰기 수 증가 (1분에 WRITE_PACE_STEP), 한동안 제한 응답이 없으면 해제"""
+        old = self.write_pace
+        if time.monotonic() - self._paced_at >= WRITE_PACE_RELEASE:
+            self.write_pace = None
+            self._pace_changed(old, f"{WRITE_PACE_RELEASE}초 동안 요청 제한 없음")
+            return
+        self.write_pace += WRITE_PACE_STEP / self.write_pace
+        if int(self.write_pace) // WRITE_PACE_STEP != int(old) // WRITE_PACE_STEP:
+            self._pace_changed(old, "쓰기 성공")
+
+    def _pace_changed(self, old, reason):
+        self.last_change = reason
+        icon = "📉" if self.write_pace and (old is None or self.write_pace < old) else "📈"
+        owner = f"[{self.name}] " if self.name else ""
+        log.info(f"{icon} {owner}분당 쓰기 수 {format_pace(old)} → {format_pace(self.write_pace)} ({reason})",
+                 extra=upload_log.fields(budget=self.name, write_pace=self.write_pace, reason=reason))
+
+    def _decrease(self, reason):
+        now = time.monotonic()
+        if self._decreased_at is not None and now - self._decreased_at < DECREASE_COOLDOWN:
+            return  # 같은 혼잡으로 이미 줄임 (이미 보낸 요청들의 응답)
+        self._decreased_at = now
+        old = self.limit
+        self.window = max(float(self.minimum), self.window / 2)
+        self._changed(old, reason)
+
+    def _changed(self, old, reason):
+        self.last_change = reason
+        icon = "📈" if self.limit > old else "📉"
+        owner = f"[{self.name}] " if self.name else ""
+        log.info(f"{icon} {owner}동시 요청 창 {old} → {self.limit} ({reason})",
+                 extra=upload_log.fields(budget=self.name, window=self.limit, previous=old, reason=reason))
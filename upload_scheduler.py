@@ -0,0 +1,248 @@
+# upload_scheduler.py - 마감 시각 기반 예약 실행 (cron 표현식, 프로필당 여러 예약, 놓친 예약 따라잡기)
+#
+#   SCHEDULE_CRON=30 14 * * 1-5; 0 9 * * 6,0     ';'로 여러 예약 (분 시 일 월 요일)
+#   SCHEDULE_CRON=@daily                         @hourly @daily @weekly @monthly @yearly
+#
+# SCHEDULE_CRON이 없으면 기존 SCHEDULE_HOUR / SCHEDULE_MINUTE / REPEAT_OPTION 값을 cron으로 바꿔서 사용합니다.
+# 스케줄러 쓰레드는 가장 가까운 예약 시각까지 잠들고, 절전 등으로 예약 시각을 지나쳤으면
+# 깨어나자마자 1번만 실행합니다. 같은 스케줄러의 예약들은 SCHEDULE_MIN_GAP초 이상 간격을 두고 시작합니다.
+import time
+import zlib
+import threading
+from datetime import datetime, timedelta
+import metrics
+import upload_log
+
+log = upload_log.get_logger("scheduler")
+
+SCHEDULE_SPREAD_SECONDS = 60  # 프로필별 고정 지연 범위 (같은 시각 예약이 같은 초에 몰리지 않게)
+SCHEDULE_MIN_GAP = 10         # 예약 실행 사이 최소 간격 (초)
+MAX_SLEEP_SECONDS = 900       # 절전 중에는 대기 시계가 멈추므로 깨어난 뒤 이 시간 안에 예약 확인
+SLEEP_DETECT_SECONDS = 30     # 대기 중 벽시계가 이만큼 더 흘렀으면 절전에서 깨어난 것으로 판단
+LATE_NOTICE_SECONDS = 60      # 예약 시각보다 이만큼 늦게 실행되면 알림
+SEARCH_YEARS = 5              # 다음 실행 시각을 찾는 최대 범위
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+MONTH_NAMES = {name: index + 1 for index, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+DAY_NAMES = {name: index for index, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# 기존 반복 옵션 → 요일 필드
+REPEAT_DAYS = {"daily": "*", "weekdays": "1-5", "weekends": "0,6"}
+
+
+def _parse_field(text, low, high, names=None):
+    """cron 필드 1개 → 허용 값 집합"""
+    values = set()
+    for item in text.lower().split(","):
+        part, _, step_text = item.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"간격은 1 이상이어야 합니다: {item}")
+        if part == "*":
+            start, end = low, high
+        else:
+            first, dash, last = part.partition("-")
+            start = _parse_value(first, names)
+            end = _parse_value(last, names) if dash else (high if step_text else start)
+            if names is DAY_NAMES and dash and end == 0 < start:
+                end = 7  # sat-sun 처럼 일요일로 끝나는 범위
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValueError(f"범위를 벗어난 값입니다: {item} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _parse_value(text, names):
+    if names and text in names:
+        return names[text]
+    if not text.isdigit():
+        raise ValueError(f"숫자가 아닙니다: {text}")
+    return int(text)
+
+
+class CronExpression:
+    """cron 표현식 1개 (분 시 일 월 요일, 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행)"""
+    def __init__(self, text):
+        self.text = text.strip()
+        fields = CRON_ALIASES.get(self.text.lower(), self.text).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드(분 시 일 월 요일)여야 합니다: '{self.text}'")
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12, MONTH_NAMES)
+        weekdays = _parse_field(fields[4], 0, 7, DAY_NAMES)
+        self.weekdays = {day % 7 for day in weekdays}  # 7도 일요일
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+        if self.next_after(datetime.now()) is None:
+            raise ValueError(f"실행되는 날짜가 없습니다: '{self.text}'")
+
+    def __repr__(self):
+        return f"CronExpression({self.text!r})"
+
+    def matches_day(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """moment 이후(같은 분 제외) 첫 실행 시각, 없으면 None"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * SEARCH_YEARS)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self.matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        return None
+
+
+def parse_schedule(text):
+    """';'로 구분한 cron 표현식들 → [CronExpression] (잘못되면 ValueError)"""
+    expressions = [CronExpression(part) for part in text.split(";") if part.strip()]
+    if not expressions:
+        raise ValueError("예약이 비어 있습니다.")
+    return expressions
+
+
+def legacy_cron(hour, minute, repeat_option):
+    """기존 설정(시/분/반복) → cron 표현식"""
+    return f"{int(minute)} {int(hour)} * * {REPEAT_DAYS.get(repeat_option, '*')}"
+
+
+def spread_offset(key, spread=SCHEDULE_SPREAD_SECONDS):
+    """프로필 이름별 고정 지연 (0 ~ spread-1초, 실행할 때마다 같음)"""
+    return zlib.crc32(str(key).encode("utf-8")) % spread if spread else 0
+
+
+class ScheduledJob:
+    """예약 1개 (프로필 1개의 cron 표현식들 + 실행 함수)"""
+    def __init__(self, key, expressions, callback, offset=0):
+        self.key = key
+        self.expressions = expressions
+        self.callback = callback
+        self.offset = offset
+        self.deadline = self.next_deadline(time.time())
+        self.last_run = None
+
+    def next_deadline(self, after):
+        """after(epoch) 이후 첫 실행 시각 (epoch, 고정 지연 포함)"""
+        base = datetime.fromtimestamp(after - self.offset)
+        times = [when for when in (expr.next_after(base) for expr in self.expressions) if when is not None]
+        return min(times).timestamp() + self.offset if times else None
+
+    def missed_runs(self, now):
+        """현재 마감 시각부터 now까지 지나간 예약 횟수"""
+        count, deadline = 0, self.deadline
+        while deadline is not None and deadline <= now and count < 10000:
+            count += 1
+            deadline = self.next_deadline(deadline)
+        return count
+
+
+class DeadlineScheduler:
+    """가장 가까운 예약 시각까지 잠드는 스케줄러 쓰레드 (주기적 확인 없음)
+
+    예약이 추가/변경/삭제되거나 중지되면 바로 깨어나 다음 시각을 다시 계산합니다.
+    """
+    def __init__(self, min_gap=SCHEDULE_MIN_GAP):
+        self.min_gap = min_gap
+        self._jobs = {}  # 키(프로필) → ScheduledJob
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._last_fire = 0.0
+
+    def set_job(self, key, expressions, callback, offset=0):
+        """예약 등록/교체 → ScheduledJob"""
+        job = ScheduledJob(key, expressions, callback, offset)
+        with self._cond:
+            self._jobs[key] = job
+            self._cond.notify()
+        return job
+
+    def remove_job(self, key):
+        with self._cond:
+            if self._jobs.pop(key, None) is not None:
+                self._cond.notify()
+
+    def next_run(self, key):
+        """다음 실행 시각 (epoch, 예약이 없으면 None)"""
+        job = self._jobs.get(key)
+        return job.deadline if job else None
+
+    def start(self):
+        with self._cond:
+            self._closed = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._cond.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=3)
+
+    def _next_due(self, now):
+        """(실행할 예약 또는 None, 다음에 깨어날 시각 또는 None)"""
+        jobs = [job for job in self._jobs.values() if job.deadline is not None]
+        if not jobs:
+            return None, None
+        job = min(jobs, key=lambda item: item.deadline)
+        ready_at = max(job.deadline, self._last_fire + self.min_gap)
+        return (job, None) if ready_at <= now else (None, ready_at)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.time()
+                    job, wake_at = self._next_due(now)
+                    if job is not None:
+                        break
+                    timeout = None if wake_at is None else min(wake_at - now, MAX_SLEEP_SECONDS)
+                    wall, mono = time.time(), time.monotonic()
+                    self._cond.wait(timeout)
+                    metrics.wakeup("scheduler")
+                    slept = (time.time() - wall) - (time.monotonic() - mono)
+                    if slept > SLEEP_DETECT_SECONDS:
+                        log.info(f"💤 절전에서 깨어났습니다 (약 {slept / 60:.0f}분). 놓친 예약을 확인합니다.")
+
+                missed = job.missed_runs(now)
+                late = now - job.deadline
+                job.last_run = now
+                job.deadline = job.next_deadline(now)
+                self._last_fire = now
+
+            if missed > 1:
+                log.info(f"⏰ [{job.key}] 놓친 예약 {missed}회 → 지금 1번만 실행합니다.")
+            elif late > LATE_NOTICE_SECONDS:
+                log.info(f"⏰ [{job.key}] 예약 시각보다 {late / 60:.0f}분 늦게 실행합니다.")
+            try:
+                job.callback()
+            except Exception as e:
+                log.error(f"❌ [{job.key}] 예약 작업 오류: {e}")
@@ -0,0 +1,200 @@
+# upload_throttle.py - 업로드 대역폭 제한 (바이트 단위 토큰 버킷, 시간대별 속도)
+#
+#   UPLOAD_RATE_LIMIT=500KB                            프로필 .env: 이 프로필의 업로드 속도 상한 (초당)
+#   UPLOAD_RATE_SCHEDULE=22:00-07:00=0; 09:00-18:00=200KB   시간대별 속도 (0/unlimited = 제한 없음)
+#   UPLOAD_RATE_BYPASS_INTERACTIVE=true                실시간 수정한 작은 파일은 제한 없이 업로드 (기본 true)
+#   GLOBAL_UPLOAD_RATE_LIMIT=1MB                       환경변수: 프로세스 전체(모든 프로필 합계) 상한
+#   GLOBAL_UPLOAD_RATE_SCHEDULE=...                    환경변수: 전체 상한의 시간대별 속도
+#
+# 단위: B, KB(=1024B), MB, GB (뒤의 /s는 생략 가능). 시간대에 맞는 규칙이 없으면 기본 상한을 씁니다.
+# 업로드 요청 본문을 나눠 보내면서 조각마다 버킷에서 바이트를 꺼내므로, 큰 파일도 일정한 속도로 전송됩니다.
+import io
+import os
+import time
+import threading
+from datetime import datetime
+import upload_log
+
+log = upload_log.get_logger("throttle")
+
+BURST_SECONDS = 1.0        # 쉬었다가 한 번에 보낼 수 있는 양 (초당 속도 × N초)
+MIN_BURST_BYTES = 64 * 1024
+UNLIMITED = ("", "0", "none", "off", "unlimited", "무제한")
+UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "kib": 1024,
+         "m": 1024 ** 2, "mb": 1024 ** 2, "mib": 1024 ** 2, "g": 1024 ** 3, "gb": 1024 ** 3, "gib": 1024 ** 3}
+
+
+class UploadCancelled(OSError):
+    """속도 제한으로 기다리는 중에 엔진이 중지됨 (요청은 연결 오류로 끝남)"""
+
+
+def parse_rate(text):
+    """'500KB', '2MB/s', '0' → 초당 바이트 (제한 없음이면 None, 잘못되면 ValueError)"""
+    value = (text or "").strip().lower().replace(" ", "")
+    if value.endswith("/s"):
+        value = value[:-2]
+    if value in UNLIMITED:
+        return None
+    number = value.rstrip("kmgib")
+    unit = value[len(number):]
+    try:
+        rate = float(number) * UNITS[unit]
+    except (KeyError, ValueError):
+        raise ValueError(f"속도 형식이 올바르지 않습니다: '{text}' (예: 500KB, 2MB)")
+    if rate < 0:
+        raise ValueError(f"속도는 0 이상이어야 합니다: '{text}'")
+    return rate or None
+
+
+def _parse_clock(text):
+    hour, _, minute = text.strip().partition(":")
+    hour, minute = int(hour), int(minute or 0)
+    if not (0 <= hour <= 24 and 0 <= minute < 60) or hour * 60 + minute > 24 * 60:
+        raise ValueError(f"시각이 올바르지 않습니다: '{text}'")
+    return hour * 60 + minute
+
+
+def parse_rate_schedule(text):
+    """'22:00-07:00=0; 09:00-18:00=200KB' → [(시작 분, 끝 분, 초당 바이트 또는 None)]"""
+    rules = []
+    for part in (text or "").split(";"):
+        if not part.strip():
+            continue
+        span, equals, rate_text = part.partition("=")
+        start_text, dash, end_text = span.partition("-")
+        if not equals or not dash:
+            raise ValueError(f"시간대 형식이 올바르지 않습니다: '{part.strip()}' (예: 22:00-07:00=0)")
+        rules.append((_parse_clock(start_text), _parse_clock(end_text), parse_rate(rate_text)))
+    return rules
+
+
+def format_rate(rate):
+    if rate is None:
+        return "제한 없음"
+    if rate >= 1024 ** 2:
+        return f"{rate / 1024 ** 2:.1f}MB/s"
+    return f"{rate / 1024:.0f}KB/s"
+
+
+class TokenBucket:
+    """초당 바이트 수 제한 (시간대별 속도 포함, 여러 쓰레드가 함께 사용)
+
+    reserve(n)은 n바이트를 미리 꺼내고 기다려야 할 시간을 돌려줍니다 (잔고가 음수가 될 수 있음).
+    """
+    def __init__(self, name, rate=None, schedule=None):
+        self.name = name
+        self.base_rate = rate
+        self.schedule = schedule or []
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self._rate = None
+        self._checked_minute = None
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return self.base_rate is not None or bool(self.schedule)
+
+    def configure(self, rate=None, schedule=None):
+        with self._lock:
+            self.base_rate = rate
+            self.schedule = schedule or []
+            self._checked_minute = None
+
+    def rate_at(self, moment):
+        """moment 시각의 속도 상한 (초당 바이트, 제한 없음이면 None)"""
+        minute = moment.hour * 60 + moment.minute
+        for start, end, rate in self.schedule:
+            inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+            if inside:
+                return rate
+        return self.base_rate
+
+    def current_rate(self):
+        with self._lock:
+            return self._current_rate()
+
+    def _current_rate(self):
+        """시간대 규칙은 분이 바뀔 때만 다시 확인"""
+        minute = int(time.time() // 60)
+        if minute != self._checked_minute:
+            self._checked_minute = minute
+            rate = self.rate_at(datetime.now())
+            if rate != self._rate:
+                log.info(f"🚦 [{self.name}] 업로드 속도 상한: {format_rate(rate)}",
+                         extra=upload_log.fields(bucket=self.name, bytes_per_sec=rate))
+                if rate is not None:
+                    # 제한이 새로 생기면 버킷을 가득 채운 상태로 시작
+                    self._tokens = self._burst(rate) if self._rate is None else min(self._tokens, self._burst(rate))
+                    self._updated = time.monotonic()
+                self._rate = rate
+        return self._rate
+
+    @staticmethod
+    def _burst(rate):
+        return max(rate * BURST_SECONDS, MIN_BURST_BYTES)
+
+    def reserve(self, amount):
+        """amount바이트 사용 → 기다려야 할 시간 (초, 제한 없음이면 0)"""
+        with self._lock:
+            rate = self._current_rate()
+            now = time.monotonic()
+            if rate is None:
+                self._updated = now
+                return 0.0
+            self._tokens = min(self._tokens + (now - self._updated) * rate, self._burst(rate))
+            self._updated = now
+            self._tokens -= amount
+            return -self._tokens / rate if self._tokens < 0 else 0.0
+
+
+# 프로세스 전체 상한 (데몬이면 모든 프로필 합계)
+GLOBAL_BUCKET = TokenBucket("전체")
+_global_settings = None
+
+
+def configure_global(rate_text=None, schedule_text=None):
+    """전체 상한 설정 (GLOBAL_UPLOAD_RATE_LIMIT / GLOBAL_UPLOAD_RATE_SCHEDULE 환경변수) → 성공 여부"""
+    global _global_settings
+    rate_text = rate_text if rate_text is not None else os.getenv("GLOBAL_UPLOAD_RATE_LIMIT")
+    schedule_text = schedule_text if schedule_text is not None else os.getenv("GLOBAL_UPLOAD_RATE_SCHEDULE")
+    if (rate_text, schedule_text) == _global_settings:
+        return True
+    try:
+        GLOBAL_BUCKET.configure(parse_rate(rate_text), parse_rate_schedule(schedule_text))
+    except ValueError as e:
+        log.error(f"❌ 전체 업로드 속도 설정이 올바르지 않습니다: {e}")
+        return False
+    _global_settings = (rate_text, schedule_text)
+    return True
+
+
+class ThrottledBody(io.BytesIO):
+    """요청 본문 (읽을 때마다 버킷에서 바이트를 꺼내고 속도에 맞춰 대기)
+
+    BytesIO라서 requests가 길이를 알고 Content-Length로 나눠 보냅니다.
+    """
+    def __init__(self, data, buckets, stop_event=None):
+        super().__init__(data)
+        self.buckets = buckets
+        self.stop_event = stop_event
+        self.waited = 0.0  # 속도 제한으로 기다린 시간 (응답 시간 계산에서 뺌)
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        if chunk:
+            delay = max(bucket.reserve(len(chunk)) for bucket in self.buckets)
+            if delay > 0:
+                self.waited += delay
+                if self.stop_event is not None:
+                    if self.stop_event.wait(delay):
+                        raise UploadCancelled("업로드가 중지되었습니다.")
+                else:
+                    time.sleep(delay)
+        return chunk
+
+
+def request_body(data, buckets, stop_event=None):
+    """속도 제한이 있으면 ThrottledBody, 없으면 그대로"""
+    buckets = [bucket for bucket in buckets if bucket.configured]
+    return ThrottledBody(data, buckets, stop_event) if buckets else data
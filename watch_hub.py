@@ -0,0 +1,77 @@
+# watch_hub.py - watchdog 옵저버 1개를 여러 엔진이 나눠 쓰는 감시 허브
+import os
+import threading
+import metrics
+import upload_log
+
+log = upload_log.get_logger(__name__)
+
+
+class _Route:
+    """폴더 1개의 이벤트를 등록된 핸들러들에게 전달"""
+    def __init__(self):
+        self.watch = None
+        self.handlers = []
+
+    def dispatch(self, event):
+        metrics.wakeup("fs")
+        for handler in list(self.handlers):
+            try:
+                handler.dispatch(event)
+            except Exception as e:
+                log.warning(f"⚠️ 파일 이벤트 처리 오류: {e}", exc_info=True)
+
+
+class WatchHub:
+    """폴더별 watch는 1개만 만들고 이벤트를 핸들러들에게 나눠줌
+
+    같은 폴더를 여러 프로필이 감시하거나(설정 폴더 등) 한 엔진이 감시 폴더를
+    바꿔도 다른 핸들러의 watch에는 영향을 주지 않습니다.
+    """
+    def __init__(self):
+        self._observer = None
+        self._routes = {}  # 폴더 절대 경로 → _Route
+        self._lock = threading.Lock()
+
+    def start(self):
+        """옵저버 시작 (이미 실행 중이면 그대로)"""
+        with self._lock:
+            if self._observer is None:
+                from watchdog.observers import Observer
+                self._observer = Observer()
+                self._observer.start()
+
+    def add(self, path, handler):
+        """폴더에 핸들러 등록 → remove()에 넘길 키 반환"""
+        path = os.path.abspath(path)
+        with self._lock:
+            route = self._routes.get(path)
+            if route is None:
+                route = _Route()
+                route.watch = self._observer.schedule(route, path, recursive=False)
+                self._routes[path] = route
+            route.handlers.append(handler)
+        return (path, handler)
+
+    def remove(self, key):
+        """등록한 핸들러 해제 (마지막 핸들러면 watch도 해제)"""
+        path, handler = key
+        with self._lock:
+            route = self._routes.get(path)
+            if route is None or handler not in route.handlers:
+                return
+            route.handlers.remove(handler)
+            if not route.handlers:
+                del self._routes[path]
+                try:
+                    self._observer.unschedule(route.watch)
+                except (KeyError, OSError):
+                    pass
+
+    def stop(self):
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self._routes = {}
+        if observer is not None:
+            observer.stop()
+            observer.join()